@@ -32,6 +32,7 @@ class CollectionConfig(AnalysisConfig):
         super().__init__(config)
 
         self._purge = False
+        self._virtual = False
         self._dsets = None
         self._file_prefixes = None
         self._ec = None
@@ -79,6 +80,34 @@ class CollectionConfig(AnalysisConfig):
         self._purge = self.get('purge_chunks', self._purge)
         return self._purge
 
+    @property
+    def virtual(self):
+        """Get the flag to collect datasets as HDF5 virtual datasets that
+        read from the chunk files in place. Default is False which copies
+        the data into the collected file.
+
+        Returns
+        -------
+        virtual : bool
+            Flag to collect virtual datasets. Chunk files are neither
+            purged nor moved if this is True.
+        """
+        self._virtual = self.get('virtual', self._virtual)
+        return self._virtual
+
+    @property
+    def max_workers(self):
+        """Get the number of parallel source file readers from the
+        execution control block. Default is 1 which collects in serial.
+
+        Returns
+        -------
+        max_workers : int | None
+            Number of parallel source file readers, None uses all
+            available.
+        """
+        return self.execution_control.get('max_workers', 1)
+
     @property
     def dsets(self):
         """Get dset names to collect.
@@ -36,6 +36,7 @@ class RepProfilesConfig(AnalysisConfig):
         self._default_err_method = 'rmse'
         self._default_weight = 'gid_counts'
         self._default_n_profiles = 1
+        self._default_max_region_mem = 1.0
 
     @property
     def gen_fpath(self):
@@ -120,6 +121,12 @@ class RepProfilesConfig(AnalysisConfig):
         """Get the number of representative profiles to save."""
         return self.get('n_profiles', self._default_n_profiles)
 
+    @property
+    def max_region_mem(self):
+        """Get the maximum memory in GB for the error temporaries of a single
+        region in serial, or for each streamed time block in parallel."""
+        return self.get('max_region_mem', self._default_max_region_mem)
+
     @property
     def weight(self):
         """Get the reV supply curve column to use for a weighted average in
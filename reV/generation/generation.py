@@ -44,22 +44,24 @@ class Gen:
 
     # Mapping of reV generation outputs to scale factors and units.
     # Type is scalar or array and corresponds to the SAM single-site output
+    # Chunks are either None, a chunk tuple, or an Outputs access pattern
+    # ("site", "time", "full") used to auto-tune the chunk shape
     OUT_ATTRS = {'other': {'scale_factor': 1, 'units': 'unknown',
                            'dtype': 'float32', 'chunks': None},
                  'cf_mean': {'scale_factor': 1000, 'units': 'unitless',
                              'dtype': 'uint16', 'chunks': None,
                              'type': 'scalar'},
                  'cf_profile': {'scale_factor': 1000, 'units': 'unitless',
-                                'dtype': 'uint16', 'chunks': (None, 100),
+                                'dtype': 'uint16', 'chunks': 'site',
                                 'type': 'array'},
                  'dni': {'scale_factor': 1, 'units': 'W/m2',
-                         'dtype': 'uint16', 'chunks': (None, 100),
+                         'dtype': 'uint16', 'chunks': 'site',
                          'type': 'array'},
                  'dhi': {'scale_factor': 1, 'units': 'W/m2',
-                         'dtype': 'uint16', 'chunks': (None, 100),
+                         'dtype': 'uint16', 'chunks': 'site',
                          'type': 'array'},
                  'ghi': {'scale_factor': 1, 'units': 'W/m2',
-                         'dtype': 'uint16', 'chunks': (None, 100),
+                         'dtype': 'uint16', 'chunks': 'site',
                          'type': 'array'},
                  'dni_mean': {'scale_factor': 1000, 'units': 'kWh/m2/day',
                               'dtype': 'uint16', 'chunks': None,
@@ -71,22 +73,22 @@ class Gen:
                               'dtype': 'uint16', 'chunks': None,
                               'type': 'scalar'},
                  'air_temperature': {'scale_factor': 10, 'units': 'Celsius',
-                                     'dtype': 'int16', 'chunks': (None, 100),
+                                     'dtype': 'int16', 'chunks': 'site',
                                      'type': 'array'},
                  'surface_albedo': {'scale_factor': 100, 'units': 'unitless',
-                                    'dtype': 'uint8', 'chunks': (None, 100),
+                                    'dtype': 'uint8', 'chunks': 'site',
                                     'type': 'array'},
                  'wind_speed': {'scale_factor': 100, 'units': 'm/s',
-                                'dtype': 'uint16', 'chunks': (None, 100),
+                                'dtype': 'uint16', 'chunks': 'site',
                                 'type': 'array'},
                  'windspeed': {'scale_factor': 100, 'units': 'm/s',
-                               'dtype': 'uint16', 'chunks': (None, 100),
+                               'dtype': 'uint16', 'chunks': 'site',
                                'type': 'array'},
                  'temperature': {'scale_factor': 100, 'units': 'Celsius',
-                                 'dtype': 'int16', 'chunks': (None, 100),
+                                 'dtype': 'int16', 'chunks': 'site',
                                  'type': 'array'},
                  'pressure': {'scale_factor': 10, 'units': 'atm',
-                              'dtype': 'uint16', 'chunks': (None, 100),
+                              'dtype': 'uint16', 'chunks': 'site',
                               'type': 'array'},
                  'ws_mean': {'scale_factor': 1000, 'units': 'm/s',
                              'dtype': 'uint16', 'chunks': None,
@@ -98,16 +100,16 @@ class Gen:
                                   'dtype': 'float32', 'chunks': None,
                                   'type': 'scalar'},
                  'gen_profile': {'scale_factor': 1, 'units': 'kW',
-                                 'dtype': 'float32', 'chunks': (None, 100),
+                                 'dtype': 'float32', 'chunks': 'site',
                                  'type': 'array'},
                  'ac': {'scale_factor': 1, 'units': 'kW',
-                        'dtype': 'float32', 'chunks': (None, 100),
+                        'dtype': 'float32', 'chunks': 'site',
                         'type': 'array'},
                  'dc': {'scale_factor': 1, 'units': 'kW',
-                        'dtype': 'float32', 'chunks': (None, 100),
+                        'dtype': 'float32', 'chunks': 'site',
                         'type': 'array'},
                  'poa': {'scale_factor': 1, 'units': 'W/m2',
-                         'dtype': 'float32', 'chunks': (None, 100),
+                         'dtype': 'float32', 'chunks': 'site',
                          'type': 'array'},
                  'ppa_price': {'scale_factor': 1, 'units': 'dol/MWh',
                                'dtype': 'float32', 'chunks': None,
@@ -1219,7 +1221,7 @@ class Gen:
             # check to see if we have exceeded the current output chunk.
             # If so, flush data to disk and reset the output initialization
             if i + 1 > self._out_n_sites:
-                self.flush()
+                self.flush(inplace=True)
                 global_site_index = self.site_index(site_gid)
                 self._init_out_arrays(index_0=global_site_index)
                 i = self.site_index(site_gid, out_index=True)
@@ -1268,13 +1270,21 @@ class Gen:
 
         return output_index
 
-    def flush(self):
+    def flush(self, inplace=False):
         """Flush generation data in self.out attribute to disk in .h5 format.
 
         The data to be flushed is accessed from the instance attribute
         "self.out". The disk target is based on the instance attributes
         "self._fpath". Data is not flushed if _fpath is None or if .out is
         empty.
+
+        Parameters
+        ----------
+        inplace : bool
+            Flag to allow float output arrays to be scaled in place while
+            writing. The arrays in self.out are garbage after the flush if
+            True, so this should only be set when they are re-initialized
+            right after.
         """
 
         # handle output file request if file is specified and .out is not empty
@@ -1292,10 +1302,12 @@ class Gen:
                 for dset, arr in self._out.items():
                     if len(arr.shape) == 1:
                         # write array of scalars
-                        f[dset, islice] = arr
+                        ds_slice = (islice, )
                     else:
                         # write 2D array of profiles
-                        f[dset, :, islice] = arr
+                        ds_slice = (slice(None), islice)
+
+                    f._set_ds_array(dset, arr, ds_slice, inplace=inplace)
 
             logger.debug('Flushed generation output successfully to disk.')
 
@@ -90,6 +90,8 @@ def from_config(ctx, config_file, verbose):
     ctx.obj['DSETS'] = config.dsets
     ctx.obj['PROJECT_POINTS'] = config.project_points
     ctx.obj['PURGE_CHUNKS'] = config.purge_chunks
+    ctx.obj['MAX_WORKERS'] = config.max_workers
+    ctx.obj['VIRTUAL'] = config.virtual
     ctx.obj['VERBOSE'] = verbose
 
     for file_prefix in config.file_prefixes:
@@ -120,6 +122,27 @@ def from_config(ctx, config_file, verbose):
                        verbose=verbose)
 
 
+@main.command()
+@click.option('--h5_file', '-f', required=True,
+              type=click.Path(exists=True),
+              help='Collected h5 file with virtual datasets to materialize.')
+@click.option('--dsets', '-ds', type=STRLIST, default=None,
+              help='Virtual datasets to materialize. Default is all.')
+@click.option('--log_dir', '-ld', type=STR, default='./logs',
+              help='Directory to put log files.')
+@click.option('-v', '--verbose', is_flag=True,
+              help='Flag to turn on debug logging.')
+@click.pass_context
+def materialize(ctx, h5_file, dsets, log_dir, verbose):
+    """Copy virtual datasets into the collected file."""
+    name = ctx.obj['NAME']
+    verbose = any([verbose, ctx.obj['VERBOSE']])
+    init_mult(name, log_dir, modules=[__name__, 'reV.handlers.collection'],
+              verbose=verbose)
+
+    Collector.materialize(h5_file, dsets=dsets)
+
+
 @main.group()
 @click.option('--h5_file', '-f', required=True, type=click.Path(),
               help='H5 file to be collected into.')
@@ -136,11 +159,17 @@ def from_config(ctx, config_file, verbose):
               help='Directory to put log files.')
 @click.option('-p', '--purge_chunks', is_flag=True,
               help='Flag to delete chunked files after collection.')
+@click.option('--max_workers', '-mw', type=INT, default=1,
+              help='Number of parallel source file readers. 1 collects in '
+              'serial, None uses all available. Default is 1.')
+@click.option('-vds', '--virtual', is_flag=True,
+              help='Flag to collect datasets as HDF5 virtual datasets that '
+              'read from the chunked files in place.')
 @click.option('-v', '--verbose', is_flag=True,
               help='Flag to turn on debug logging.')
 @click.pass_context
 def direct(ctx, h5_file, h5_dir, project_points, dsets, file_prefix,
-           log_dir, purge_chunks, verbose):
+           log_dir, purge_chunks, max_workers, virtual, verbose):
     """Main entry point for collection with context passing."""
     ctx.obj['H5_FILE'] = h5_file
     ctx.obj['H5_DIR'] = h5_dir
@@ -149,6 +178,8 @@ def direct(ctx, h5_file, h5_dir, project_points, dsets, file_prefix,
     ctx.obj['FILE_PREFIX'] = file_prefix
     ctx.obj['LOG_DIR'] = log_dir
     ctx.obj['PURGE_CHUNKS'] = purge_chunks
+    ctx.obj['MAX_WORKERS'] = max_workers
+    ctx.obj['VIRTUAL'] = virtual
     ctx.obj['VERBOSE'] = verbose
 
 
@@ -167,6 +198,8 @@ def collect(ctx, verbose):
     file_prefix = ctx.obj['FILE_PREFIX']
     log_dir = ctx.obj['LOG_DIR']
     purge_chunks = ctx.obj['PURGE_CHUNKS']
+    max_workers = ctx.obj['MAX_WORKERS']
+    virtual = ctx.obj['VIRTUAL']
     verbose = any([verbose, ctx.obj['VERBOSE']])
 
     # initialize loggers for multiple modules
@@ -182,15 +215,14 @@ def collect(ctx, verbose):
                 .format(dsets, name, h5_dir, h5_file))
     t0 = time.time()
 
-    Collector.collect(h5_file, h5_dir, project_points, dsets[0],
-                      file_prefix=file_prefix)
-
-    if len(dsets) > 1:
-        for dset_name in dsets[1:]:
-            Collector.add_dataset(h5_file, h5_dir, dset_name,
-                                  file_prefix=file_prefix)
+    Collector.collect(h5_file, h5_dir, project_points, list(dsets),
+                      file_prefix=file_prefix, max_workers=max_workers,
+                      virtual=virtual)
 
-    if purge_chunks:
+    if virtual:
+        logger.info('Chunked files are left in place in {} for the virtual '
+                    'datasets in {}'.format(h5_dir, h5_file))
+    elif purge_chunks:
         Collector.purge_chunks(h5_file, h5_dir, project_points,
                                file_prefix=file_prefix)
     else:
@@ -210,7 +242,8 @@ def collect(ctx, verbose):
 
 def get_node_cmd(name, h5_file, h5_dir, project_points, dsets,
                  file_prefix=None, log_dir='./logs/',
-                 purge_chunks=False, verbose=False):
+                 purge_chunks=False, max_workers=1, virtual=False,
+                 verbose=False):
     """Make a reV collection local CLI call string.
 
     Parameters
@@ -232,6 +265,12 @@ def get_node_cmd(name, h5_file, h5_dir, project_points, dsets,
         Log directory.
     purge_chunks : bool
         Flag to delete the chunked files after collection.
+    max_workers : int | None
+        Number of parallel source file readers. 1 collects in serial, None
+        uses all available. Default is 1.
+    virtual : bool
+        Flag to collect datasets as HDF5 virtual datasets that read from the
+        chunked files in place.
     verbose : bool
         Flag to turn on DEBUG logging
 
@@ -249,11 +288,15 @@ def get_node_cmd(name, h5_file, h5_dir, project_points, dsets,
             '-ds {}'.format(SLURM.s(dsets)),
             '-fp {}'.format(SLURM.s(file_prefix)),
             '-ld {}'.format(SLURM.s(log_dir)),
+            '-mw {}'.format(SLURM.s(max_workers)),
             ]
 
     if purge_chunks:
         args.append('-p')
 
+    if virtual:
+        args.append('-vds')
+
     if verbose:
         args.append('-v')
 
@@ -297,6 +340,8 @@ def collect_slurm(ctx, alloc, memory, walltime, feature, conda_env, module,
     dsets = ctx.obj['DSETS']
     file_prefix = ctx.obj['FILE_PREFIX']
     purge_chunks = ctx.obj['PURGE_CHUNKS']
+    max_workers = ctx.obj['MAX_WORKERS']
+    virtual = ctx.obj['VIRTUAL']
     verbose = any([verbose, ctx.obj['VERBOSE']])
 
     slurm_manager = ctx.obj.get('SLURM_MANAGER', None)
@@ -306,7 +351,8 @@ def collect_slurm(ctx, alloc, memory, walltime, feature, conda_env, module,
 
     cmd = get_node_cmd(name, h5_file, h5_dir, project_points, dsets,
                        file_prefix=file_prefix, log_dir=log_dir,
-                       purge_chunks=purge_chunks, verbose=verbose)
+                       purge_chunks=purge_chunks, max_workers=max_workers,
+                       virtual=virtual, verbose=verbose)
 
     status = Status.retrieve_job_status(os.path.dirname(h5_file), 'collect',
                                         name, hardware='eagle',
@@ -2,6 +2,8 @@
 """
 Base class to handle collection of profiles and means across multiple .h5 files
 """
+from concurrent.futures import FIRST_COMPLETED, wait
+import h5py
 import logging
 import numpy as np
 import os
@@ -17,6 +19,7 @@ from reV.utilities.exceptions import (CollectionRuntimeError,
                                       CollectionValueError,
                                       CollectionWarning)
 
+from rex.utilities.execution import SpawnProcessPool
 from rex.utilities.loggers import log_mem
 
 logger = logging.getLogger(__name__)
@@ -28,7 +31,7 @@ class DatasetCollector:
     output file.
     """
     def __init__(self, h5_file, source_files, gids, dset_in, dset_out=None,
-                 mem_util_lim=0.7):
+                 mem_util_lim=0.7, gid_plan=None):
         """
         Parameters
         ----------
@@ -45,10 +48,15 @@ class DatasetCollector:
         mem_util_lim : float
             Memory utilization limit (fractional). This sets how many sites
             will be collected at a time.
+        gid_plan : dict | None
+            Pre-computed output site positions for every source file from
+            DatasetCollector.get_gid_plan(). None will compute the plan when
+            it is first needed.
         """
         self._h5_file = h5_file
         self._source_files = source_files
         self._gids = gids
+        self._gid_plan = gid_plan
 
         self._dset_in = dset_in
         if dset_out is None:
@@ -155,94 +163,283 @@ class DatasetCollector:
         return attrs, axis, site_mem_req
 
     @staticmethod
-    def _get_gid_slice(gids_out, source_gids, fn_source):
-        """Find the site slice that the chunked set of source gids belongs to.
+    def _get_out_locs(gids_out, source_gids, order=None):
+        """Get the output site positions of a set of source gids.
 
         Parameters
         ----------
-        gids_out : list
-            List of resource GIDS in the final output meta data f_out
-        source_gids : list
-            List of resource GIDS in one chunk of source data.
-        fn_source : str
-            Source filename for warning printout.
+        gids_out : np.ndarray | list
+            List of resource GIDS in the final output meta data.
+        source_gids : np.ndarray | list
+            List of resource GIDS in one source file.
+        order : np.ndarray | None
+            Pre-computed argsort of gids_out, None will sort gids_out.
+
+        Returns
+        -------
+        out_locs : np.ndarray
+            Position of every source gid in gids_out, -1 for source gids that
+            are not to be collected.
+        """
+        gids_out = np.asarray(gids_out)
+        source_gids = np.asarray(source_gids)
+        if not len(gids_out):
+            return np.full(len(source_gids), -1, dtype=np.int64)
+
+        if order is None:
+            order = np.argsort(gids_out, kind='stable')
+
+        sorted_gids = gids_out[order]
+
+        locs = np.searchsorted(sorted_gids, source_gids)
+        locs = np.minimum(locs, len(sorted_gids) - 1)
+        found = sorted_gids[locs] == source_gids
+        out_locs = np.where(found, order[locs], -1)
+
+        return out_locs
+
+    @classmethod
+    def get_gid_plan(cls, gids_out, source_files):
+        """Map the sites of every source file to their output site positions.
+        This only has to be done once for all datasets being collected.
+
+        Parameters
+        ----------
+        gids_out : np.ndarray | list
+            List of resource GIDS in the final output meta data.
+        source_files : list
+            List of source filepaths.
+
+        Returns
+        -------
+        gid_plan : dict
+            Dictionary mapping each source filepath to an array with the
+            output position of every source site (-1 if not collected).
+        """
+        gids_out = np.asarray(gids_out)
+        order = np.argsort(gids_out, kind='stable')
+        gid_plan = {}
+        for fp in source_files:
+            with Outputs(fp, mode='r') as f_source:
+                source_gids = f_source.get_meta_arr('gid')
+
+            gid_plan[fp] = cls._get_out_locs(gids_out, source_gids,
+                                             order=order)
+
+        return gid_plan
+
+    @property
+    def gid_plan(self):
+        """Get the output site positions for every source file.
+
+        Returns
+        -------
+        dict
+        """
+        if self._gid_plan is None:
+            self._gid_plan = self.get_gid_plan(self._gids,
+                                               self._source_files)
+
+        return self._gid_plan
+
+    def _get_source_slices(self, fp_source):
+        """Split the sites from a source file into slices based on memory req.
+
+        Parameters
+        ----------
+        fp_source : str
+            Source filepath
+
+        Returns
+        -------
+        source_slices : list
+            List of site slices in the source file to collect.
+        """
+        n_sites = len(self.gid_plan[fp_source])
+        source_slices = self._split_sites(n_sites, self._site_mem_req,
+                                          self._mem_avail,
+                                          label=self._dset_in)
+
+        return source_slices
+
+    @classmethod
+    def _split_sites(cls, n_sites, site_mem_req, mem_avail, label=None):
+        """Split a number of sites into the fewest slices that fit in memory.
+
+        Parameters
+        ----------
+        n_sites : int
+            Number of sites in one source file.
+        site_mem_req : float
+            Memory requirement in bytes to collect a single site.
+        mem_avail : float
+            Memory in bytes available to collect a single chunk.
+        label : str | None
+            Dataset label for logging.
+
+        Returns
+        -------
+        source_slices : list
+            List of site slices to collect.
+        """
+        chunks = cls._split_gids(np.arange(n_sites), site_mem_req, mem_avail,
+                                 label=label)
+        source_slices = [slice(chunk[0], chunk[-1] + 1) for chunk in chunks
+                         if len(chunk)]
+
+        return source_slices
+
+    @staticmethod
+    def _split_gids(all_source_gids, site_mem_req, mem_avail, label=None):
+        """Split source gids into the fewest chunks that fit in memory.
+
+        Parameters
+        ----------
+        all_source_gids : np.ndarray
+            All source gids to be collected from one source file.
+        site_mem_req : float
+            Memory requirement in bytes to collect a single site.
+        mem_avail : float
+            Memory in bytes available to collect a single chunk.
+        label : str | None
+            Dataset label for logging.
 
         Returns
         -------
-        site_slice : slice | np.ndarray
-            Slice in the final output file to write data to from source gids.
-            If gids in destination file are non-sequential, a boolean array of
-            indexes is returned and a warning is printed.
+        source_gid_chunks : list
+            List of source gid chunks to collect.
         """
+        mem_req = (len(all_source_gids) * site_mem_req)
+
+        if mem_req > mem_avail:
+            chunk_size = int(mem_avail // site_mem_req)
+            if chunk_size < 1:
+                msg = ('Memory available to collect dataset "{}" ({} bytes) '
+                       'is less than the memory required to collect a '
+                       'single site ({} bytes). Collecting one site at a '
+                       'time.'.format(label, mem_avail, site_mem_req))
+                logger.warning(msg)
+                warn(msg, CollectionWarning)
+                chunk_size = 1
+
+            n = int(np.ceil(len(all_source_gids) / chunk_size))
+            source_gid_chunks = np.array_split(all_source_gids, n)
+            new_mem_req = (len(source_gid_chunks[0]) * site_mem_req)
+            logger.debug('Collecting dataset "{}" in {} chunks with '
+                         'an estimated {} bytes in each chunk '
+                         '(mem avail limit is {} bytes).'
+                         .format(label, n, new_mem_req, mem_avail))
+        else:
+            source_gid_chunks = [all_source_gids]
+
+        return source_gid_chunks
+
+    def _get_chunk_slices(self, source_slice, fp_source):
+        """Get the output slice and source mask for one chunk of source sites.
+
+        Parameters
+        ----------
+        source_slice : slice
+            Site slice in the source file to read from.
+        fp_source : str
+            Source filepath
 
-        locs = np.where(np.isin(gids_out, source_gids))[0]
-        if not any(locs):
-            e = ('DatasetCollector could not locate source gids in '
-                 'output gids. \n\t Source gids: {} \n\t Output gids: {}'
-                 .format(source_gids, gids_out))
+        Returns
+        -------
+        out_slice : slice | np.ndarray
+            Site slice in the output file to write to. If gids in the
+            destination file are non-sequential, a boolean array of indexes
+            is returned and a warning is printed.
+        source_indexer : np.ndarray
+            Boolean mask on the source slice of the gids to be collected.
+        """
+        out_locs = self.gid_plan[fp_source][source_slice]
+        source_indexer = out_locs >= 0
+        out_locs = out_locs[source_indexer]
+
+        if not len(out_locs):
+            e = ('DatasetCollector could not locate source sites {} from '
+                 '"{}" in output gids: {}'
+                 .format(source_slice, os.path.basename(fp_source),
+                         self._gids))
             logger.error(e)
             raise CollectionRuntimeError(e)
-        sequential_locs = np.arange(locs.min(), locs.max() + 1)
 
-        if not len(locs) == len(sequential_locs):
+        if (out_locs[-1] - out_locs[0] + 1 == len(out_locs)
+                and np.all(np.diff(out_locs) == 1)):
+            out_slice = slice(out_locs[0], out_locs[-1] + 1)
+        else:
             w = ('GID indices for source file "{}" are not '
-                 'sequential in destination file!'.format(fn_source))
+                 'sequential in destination file!'
+                 .format(os.path.basename(fp_source)))
             logger.warning(w)
             warn(w, CollectionWarning)
-            site_slice = np.isin(gids_out, source_gids)
-        else:
-            site_slice = slice(locs.min(), locs.max() + 1)
+            out_slice = np.zeros(len(self._gids), dtype=bool)
+            out_slice[out_locs] = True
 
-        return site_slice
+        return out_slice, source_indexer
 
-    def _get_source_gid_chunks(self, f_source):
-        """Split the gids from the f_source into chunks based on memory req.
+    @staticmethod
+    def _read_chunk(f_source, dset_in, axis, source_slice, source_indexer):
+        """Read one chunk of source data.
 
         Parameters
         ----------
         f_source : reV.handlers.outputs.Output
             Source file handler
+        dset_in : str
+            Dataset to read.
+        axis : int
+            Axis size (1 is 1D array, 2 is 2D array)
+        source_slice : slice
+            Site slice in the source file to read from.
+        source_indexer : np.ndarray
+            Boolean mask on the source slice of the gids to be collected.
 
         Returns
         -------
-        all_source_gids : list
-            List of all source gids to be collected
-        source_gid_chunks : list
-            List of source gid chunks to collect.
+        data : np.ndarray
+            Source data for the gids to be collected.
         """
+        if axis == 1:
+            data = f_source[dset_in, source_slice]
+            if not all(source_indexer):
+                data = data[source_indexer]
 
-        all_source_gids = f_source.get_meta_arr('gid')
-        mem_req = (len(all_source_gids) * self._site_mem_req)
+        elif axis == 2:
+            data = f_source[dset_in, :, source_slice]
+            if not all(source_indexer):
+                data = data[:, source_indexer]
 
-        if mem_req > self._mem_avail:
-            n = 2
-            while True:
-                source_gid_chunks = np.array_split(all_source_gids, n)
-                new_mem_req = (len(source_gid_chunks[0]) * self._site_mem_req)
-                if new_mem_req > self._mem_avail:
-                    n += 1
-                else:
-                    logger.debug('Collecting dataset "{}" in {} chunks with '
-                                 'an estimated {} bytes in each chunk '
-                                 '(mem avail limit is {} bytes).'
-                                 .format(self._dset_in, n, new_mem_req,
-                                         self._mem_avail))
-                    break
-        else:
-            source_gid_chunks = [all_source_gids]
+        return data
+
+    def _write_chunk(self, f_out, out_slice, data):
+        """Write one chunk of data to the output file.
+
+        Parameters
+        ----------
+        f_out : reV.handlers.outputs.Output
+            Output file handler
+        out_slice : slice | np.ndarray
+            Site slice in the output file to write to.
+        data : np.ndarray
+            Collected data. This is scaled in place and is garbage after the
+            write.
+        """
+        if self._axis == 1:
+            ds_slice = (out_slice, )
+        elif self._axis == 2:
+            ds_slice = (slice(None), out_slice)
 
-        return all_source_gids, source_gid_chunks
+        f_out._set_ds_array(self._dset_out, data, ds_slice, inplace=True)
 
-    def _collect_chunk(self, all_source_gids, source_gids, f_out,
-                       f_source, fp_source):
-        """Collect one set of source gids from f_source to f_out.
+    def _collect_chunk(self, source_slice, f_out, f_source, fp_source):
+        """Collect one slice of source sites from f_source to f_out.
 
         Parameters
         ----------
-        all_source_gids : list
-            List of all source gids to be collected
-        source_gids : np.ndarray | list
-            Source gids to be collected
+        source_slice : slice
+            Site slice in the source file to be collected
         f_out : reV.handlers.outputs.Output
             Output file handler
         f_source : reV.handlers.outputs.Output
@@ -250,13 +447,8 @@ class DatasetCollector:
         fp_source : str
             Source filepath
         """
-        out_slice = self._get_gid_slice(self._gids, source_gids,
-                                        os.path.basename(fp_source))
-
-        source_i0 = np.where(all_source_gids == np.min(source_gids))[0][0]
-        source_i1 = np.where(all_source_gids == np.max(source_gids))[0][0]
-        source_slice = slice(source_i0, source_i1 + 1)
-        source_indexer = np.isin(source_gids, self._gids)
+        out_slice, source_indexer = self._get_chunk_slices(source_slice,
+                                                           fp_source)
 
         logger.debug('\t- Running low mem collection of "{}" for '
                      'output site {} from source site {} and file : {}'
@@ -264,17 +456,9 @@ class DatasetCollector:
                              os.path.basename(fp_source)))
 
         try:
-            if self._axis == 1:
-                data = f_source[self._dset_in, source_slice]
-                if not all(source_indexer):
-                    data = data[source_indexer]
-                f_out[self._dset_out, out_slice] = data
-
-            elif self._axis == 2:
-                data = f_source[self._dset_in, :, source_slice]
-                if not all(source_indexer):
-                    data = data[:, source_indexer]
-                f_out[self._dset_out, :, out_slice] = data
+            data = self._read_chunk(f_source, self._dset_in, self._axis,
+                                    source_slice, source_indexer)
+            self._write_chunk(f_out, out_slice, data)
 
         except Exception as e:
             logger.exception('Failed to collect source file {}. '
@@ -287,19 +471,15 @@ class DatasetCollector:
         with Outputs(self._h5_file, mode='a') as f_out:
             for fp in self._source_files:
                 with Outputs(fp, mode='r') as f_source:
-
-                    x = self._get_source_gid_chunks(f_source)
-                    all_source_gids, source_gid_chunks = x
-
-                    for source_gids in source_gid_chunks:
-                        self._collect_chunk(all_source_gids, source_gids,
-                                            f_out, f_source, fp)
+                    for source_slice in self._get_source_slices(fp):
+                        self._collect_chunk(source_slice, f_out, f_source,
+                                            fp)
 
                 log_mem(logger, log_level='DEBUG')
 
     @classmethod
     def collect_dset(cls, h5_file, source_files, gids, dset_in, dset_out=None,
-                     mem_util_lim=0.7):
+                     mem_util_lim=0.7, gid_plan=None):
         """Collect a single dataset from a list of source files into a final
         output file.
 
@@ -318,11 +498,306 @@ class DatasetCollector:
         mem_util_lim : float
             Memory utilization limit (fractional). This sets how many sites
             will be collected at a time.
+        gid_plan : dict | None
+            Pre-computed output site positions for every source file from
+            DatasetCollector.get_gid_plan(). None will compute the plan.
         """
         dc = cls(h5_file, source_files, gids, dset_in, dset_out=dset_out,
-                 mem_util_lim=mem_util_lim)
+                 mem_util_lim=mem_util_lim, gid_plan=gid_plan)
         dc._collect()
 
+    @staticmethod
+    def _get_virtual_runs(out_locs):
+        """Get the contiguous runs of sites that map a source file into the
+        output file.
+
+        Parameters
+        ----------
+        out_locs : np.ndarray
+            Output site position of every source site, -1 for source sites
+            that are not to be collected.
+
+        Returns
+        -------
+        runs : list
+            List of (source_slice, out_slice) tuples. Source sites that are
+            not to be collected are skipped.
+        """
+        mask = out_locs >= 0
+        source_locs = np.where(mask)[0]
+        out_locs = out_locs[mask]
+        if not len(source_locs):
+            return []
+
+        breaks = ((np.diff(source_locs) != 1) | (np.diff(out_locs) != 1))
+        breaks = np.where(breaks)[0] + 1
+        starts = np.concatenate(([0], breaks))
+        stops = np.concatenate((breaks, [len(source_locs)]))
+
+        runs = [(slice(source_locs[i0], source_locs[i1 - 1] + 1),
+                 slice(out_locs[i0], out_locs[i1 - 1] + 1))
+                for i0, i1 in zip(starts, stops)]
+
+        return runs
+
+    @classmethod
+    def collect_virtual(cls, h5_file, source_files, gids, dset_in,
+                        dset_out=None, gid_plan=None):
+        """Collect a single dataset as an HDF5 virtual dataset that maps the
+        site range of each source file into the final output file without
+        copying any data.
+
+        Parameters
+        ----------
+        h5_file : str
+            Path to h5_file into which dataset is to be collected
+        source_files : list
+            List of source filepaths. These must not be moved or removed
+            while the virtual dataset is in use.
+        gids : list
+            list of gids to be collected
+        dset_in : str
+            Dataset to collect
+        dset_out : str
+            Dataset into which collected data is to be written
+        gid_plan : dict | None
+            Pre-computed output site positions for every source file from
+            DatasetCollector.get_gid_plan(). None will compute the plan.
+        """
+        if dset_out is None:
+            dset_out = dset_in
+
+        if gid_plan is None:
+            gid_plan = cls.get_gid_plan(gids, source_files)
+
+        with Outputs(source_files[0], mode='r') as f:
+            _, dtype, _ = f.get_dset_properties(dset_in)
+            attrs = f.get_attrs(dset_in)
+            axis = len(f[dset_in].shape)
+
+        with Outputs(h5_file, mode='r') as f:
+            if axis == 1:
+                dset_shape = (len(f),)
+            elif axis == 2 and 'time_index' in f.datasets:
+                dset_shape = f.shape
+            elif axis == 2:
+                m = ("'time_index' must be combined before profiles can be "
+                     "combined.")
+                logger.error(m)
+                raise CollectionRuntimeError(m)
+            else:
+                m = ('Cannot collect dset "{}" with axis {}'
+                     .format(dset_in, axis))
+                logger.error(m)
+                raise CollectionRuntimeError(m)
+
+            if dset_out in f.datasets:
+                m = ('Cannot create virtual dataset "{}", it already exists '
+                     'in {}'.format(dset_out, h5_file))
+                logger.error(m)
+                raise CollectionRuntimeError(m)
+
+        layout = h5py.VirtualLayout(shape=dset_shape, dtype=dtype)
+        for fp in source_files:
+            with Outputs(fp, mode='r') as f_source:
+                source_shape, _, _ = f_source.get_dset_properties(dset_in)
+
+            vsource = h5py.VirtualSource(os.path.abspath(fp), dset_in,
+                                         shape=source_shape)
+            runs = cls._get_virtual_runs(gid_plan[fp])
+            for source_slice, out_slice in runs:
+                if axis == 1:
+                    layout[out_slice] = vsource[source_slice]
+                else:
+                    layout[:, out_slice] = vsource[:, source_slice]
+
+            logger.debug('\t- Mapped "{}" from {} in {} contiguous site '
+                         'ranges'.format(dset_in, os.path.basename(fp),
+                                         len(runs)))
+
+        with Outputs(h5_file, mode='a') as f:
+            ds = f.h5.create_virtual_dataset(dset_out, layout)
+            for key, value in attrs.items():
+                ds.attrs[key] = value
+
+    @classmethod
+    def _read_source_chunk(cls, fp_source, dsets, source_slice,
+                           source_indexer):
+        """Read one chunk of several datasets from a source file.
+
+        Parameters
+        ----------
+        fp_source : str
+            Source filepath
+        dsets : list
+            List of (dset_in, axis) tuples to read.
+        source_slice : slice
+            Site slice in the source file to read from.
+        source_indexer : np.ndarray
+            Boolean mask on the source slice of the gids to be collected.
+
+        Returns
+        -------
+        data : list
+            List of source data arrays corresponding to dsets.
+        """
+        try:
+            with Outputs(fp_source, mode='r') as f_source:
+                data = [cls._read_chunk(f_source, dset_in, axis,
+                                        source_slice, source_indexer)
+                        for dset_in, axis in dsets]
+        except Exception as e:
+            logger.exception('Failed to collect source file {}. '
+                             'Raised the following exception:\n{}'
+                             .format(os.path.basename(fp_source), e))
+            raise e
+
+        return data
+
+    @classmethod
+    def _get_source_tasks(cls, collectors, source_files, mem_avail):
+        """Get the chunked read tasks for every source file.
+
+        Parameters
+        ----------
+        collectors : list
+            List of DatasetCollector objects, one per dataset.
+        source_files : list
+            List of source filepaths.
+        mem_avail : float
+            Memory in bytes available to a single chunk of all datasets.
+
+        Returns
+        -------
+        tasks : list
+            List of (fp_source, out_slice, source_slice, source_indexer)
+            tuples.
+        """
+        site_mem_req = sum(dc._site_mem_req for dc in collectors)
+        label = [dc._dset_in for dc in collectors]
+        dc = collectors[0]
+        tasks = []
+        for fp in source_files:
+            source_slices = cls._split_sites(len(dc.gid_plan[fp]),
+                                             site_mem_req, mem_avail,
+                                             label=label)
+            for source_slice in source_slices:
+                out_slice, source_indexer = dc._get_chunk_slices(source_slice,
+                                                                 fp)
+                tasks.append((fp, out_slice, source_slice, source_indexer))
+
+        return tasks
+
+    @classmethod
+    def collect_dsets(cls, h5_file, source_files, gids, dsets_in,
+                      dsets_out=None, mem_util_lim=0.7, max_workers=None,
+                      gid_plan=None):
+        """Collect several datasets in a single pass over the source files
+        with parallel readers feeding a single writer.
+
+        Parameters
+        ----------
+        h5_file : str
+            Path to h5_file into which datasets are to be collected
+        source_files : list
+            List of source filepaths.
+        gids : list
+            list of gids to be collected
+        dsets_in : list
+            Datasets to collect
+        dsets_out : list | None
+            Datasets into which collected data is to be written, None will
+            use dsets_in.
+        mem_util_lim : float
+            Memory utilization limit (fractional). This bounds the memory of
+            all source chunks in flight at once.
+        max_workers : int | None
+            Number of parallel source file readers. 1 will read in serial,
+            None will use all available.
+        gid_plan : dict | None
+            Pre-computed output site positions for every source file from
+            DatasetCollector.get_gid_plan(). None will compute the plan.
+        """
+        if dsets_out is None:
+            dsets_out = dsets_in
+
+        if gid_plan is None:
+            gid_plan = cls.get_gid_plan(gids, source_files)
+
+        collectors = [cls(h5_file, source_files, gids, dset_in,
+                          dset_out=dset_out, mem_util_lim=mem_util_lim,
+                          gid_plan=gid_plan)
+                      for dset_in, dset_out in zip(dsets_in, dsets_out)]
+        dsets = [(dc._dset_in, dc._axis) for dc in collectors]
+
+        if max_workers is None:
+            max_workers = os.cpu_count()
+
+        n_slots = 1 if max_workers == 1 else 2 * max_workers
+        mem_avail = collectors[0]._mem_avail / n_slots
+        tasks = cls._get_source_tasks(collectors, source_files, mem_avail)
+        logger.info('Collecting {} datasets from {} source files in {} '
+                    'chunks with {} workers.'
+                    .format(len(dsets), len(source_files), len(tasks),
+                            max_workers))
+
+        def _write(out_slice, data):
+            """Write one chunk of every dataset to the output file."""
+            for dc, arr in zip(collectors, data):
+                dc._write_chunk(f_out, out_slice, arr)
+
+        with Outputs(h5_file, mode='a') as f_out:
+            if max_workers == 1:
+                for fp, out_slice, source_slice, source_indexer in tasks:
+                    _write(out_slice, cls._read_source_chunk(
+                        fp, dsets, source_slice, source_indexer))
+                    log_mem(logger, log_level='DEBUG')
+
+            else:
+                loggers = [__name__, 'reV']
+                with SpawnProcessPool(max_workers=max_workers,
+                                      loggers=loggers) as exe:
+                    futures = {}
+                    n_complete = 0
+                    for fp, out_slice, source_slice, source_indexer in tasks:
+                        future = exe.submit(cls._read_source_chunk, fp, dsets,
+                                            source_slice, source_indexer)
+                        futures[future] = out_slice
+                        while len(futures) >= n_slots:
+                            n_complete += cls._write_completed(futures,
+                                                               _write)
+
+                    while futures:
+                        n_complete += cls._write_completed(futures, _write)
+
+                    logger.debug('Collected {} source chunks.'
+                                 .format(n_complete))
+
+    @staticmethod
+    def _write_completed(futures, write):
+        """Wait for source chunk reads to complete and write them.
+
+        Parameters
+        ----------
+        futures : dict
+            Pending source chunk futures mapped to their output site slice.
+            Completed futures are removed.
+        write : callable
+            Function to write a completed chunk: write(out_slice, data)
+
+        Returns
+        -------
+        n : int
+            Number of source chunks written.
+        """
+        done, _ = wait(futures, return_when=FIRST_COMPLETED)
+        for future in done:
+            write(futures.pop(future), future.result())
+
+        log_mem(logger, log_level='DEBUG')
+
+        return len(done)
+
 
 class Collector:
     """
@@ -361,6 +836,7 @@ class Collector:
         else:
             self._gids = self.parse_gids_from_files(self._h5_files)
 
+        self._gid_plan = None
         self.combine_meta()
 
     @staticmethod
@@ -506,6 +982,22 @@ class Collector:
         """
         return self._gids
 
+    @property
+    def gid_plan(self):
+        """
+        Output site positions for every source file, computed once and
+        shared by all datasets being collected.
+
+        Returns
+        -------
+        dict
+        """
+        if self._gid_plan is None:
+            self._gid_plan = DatasetCollector.get_gid_plan(self.gids,
+                                                           self.h5_files)
+
+        return self._gid_plan
+
     def combine_time_index(self):
         """
         Extract time_index, None if not present in .h5 files
@@ -562,9 +1054,52 @@ class Collector:
 
         return meta
 
+    @staticmethod
+    def get_virtual_dsets(h5_file):
+        """Get the datasets in h5_file that are HDF5 virtual datasets.
+
+        Parameters
+        ----------
+        h5_file : str
+            Path to collected .h5 file.
+
+        Returns
+        -------
+        virtual_dsets : list
+            List of virtual dataset names that still depend on their source
+            files.
+        """
+        with Outputs(h5_file, mode='r') as f:
+            virtual_dsets = [d for d in f.datasets if f.h5[d].is_virtual]
+
+        return virtual_dsets
+
+    def _check_virtual(self, action):
+        """Check that no collected datasets still depend on the chunked files.
+
+        Parameters
+        ----------
+        action : str
+            Action to be taken on the chunked files for warning printout.
+
+        Returns
+        -------
+        ok : bool
+            True if the chunked files can be modified.
+        """
+        virtual_dsets = self.get_virtual_dsets(self._h5_out)
+        if any(virtual_dsets):
+            w = ('Not {} chunked output files. These dsets are virtual and '
+                 'still read from the chunked files: {}'
+                 .format(action, virtual_dsets))
+            warn(w, CollectionWarning)
+            logger.warning(w)
+
+        return not any(virtual_dsets)
+
     def _purge_chunks(self):
         """Remove the chunked files (after collection). Will not delete files
-        if any datasets were not collected."""
+        if any datasets were not collected or are virtual."""
 
         with Outputs(self._h5_out, mode='r') as out:
             dsets_collected = out.datasets
@@ -578,7 +1113,7 @@ class Collector:
                  'have not been collected: {}'.format(missing))
             warn(w, CollectionWarning)
             logger.warning(w)
-        else:
+        elif self._check_virtual('purging'):
             for fpath in self.h5_files:
                 os.remove(fpath)
 
@@ -591,7 +1126,7 @@ class Collector:
             Sub directory name to move chunks to. None to not move files.
         """
 
-        if sub_dir is not None:
+        if sub_dir is not None and self._check_virtual('moving'):
             for fpath in self.h5_files:
                 base_dir, fn = os.path.split(fpath)
                 new_dir = os.path.join(base_dir, sub_dir)
@@ -627,7 +1162,8 @@ class Collector:
 
     @classmethod
     def collect(cls, h5_file, h5_dir, project_points, dset_name, dset_out=None,
-                file_prefix=None, mem_util_lim=0.7):
+                file_prefix=None, mem_util_lim=0.7, max_workers=1,
+                virtual=False):
         """
         Collect dataset from h5_dir to h5_file
 
@@ -641,16 +1177,26 @@ class Collector:
             Project points that correspond to the full collection of points
             contained in the .h5 files to be collected. None if points list is
             to be ignored (collect all data in h5_files)
-        dset_name : str
-            Dataset to be collected. If source shape is 2D, time index will be
-            collected.
-        dset_out : str
-            Dataset to collect means into
+        dset_name : str | list
+            Dataset(s) to be collected. If any source shape is 2D, time index
+            will be collected. Multiple datasets are collected in a single
+            pass over the source files.
+        dset_out : str | list
+            Dataset(s) to collect means into
         file_prefix : str
             .h5 file prefix, if None collect all files on h5_dir
         mem_util_lim : float
             Memory utilization limit (fractional). This sets how many sites
             will be collected at a time.
+        max_workers : int | None
+            Number of parallel source file readers feeding the single output
+            file writer. 1 will collect in serial, None will use all
+            available.
+        virtual : bool
+            Flag to collect datasets as HDF5 virtual datasets that map the
+            source files into h5_file without copying any data. The source
+            files must then be left in place until the collected file is
+            materialized (see Collector.materialize).
         """
         if file_prefix is None:
             h5_files = "*.h5"
@@ -664,14 +1210,43 @@ class Collector:
                   clobber=True)
         logger.debug("\t- 'meta' collected")
 
-        dset_shape = clt.get_dset_shape(dset_name)
-        if len(dset_shape) > 1:
+        dset_names = dset_name
+        if isinstance(dset_names, str):
+            dset_names = [dset_names]
+
+        dset_shapes = [clt.get_dset_shape(dset) for dset in dset_names]
+        if any(len(shape) > 1 for shape in dset_shapes):
             clt.combine_time_index()
             logger.debug("\t- 'time_index' collected")
 
-        DatasetCollector.collect_dset(clt._h5_out, clt.h5_files, clt.gids,
-                                      dset_name, dset_out=dset_out,
-                                      mem_util_lim=mem_util_lim)
+        if virtual:
+            dsets_out = dset_out
+            if dsets_out is None:
+                dsets_out = dset_names
+            elif isinstance(dsets_out, str):
+                dsets_out = [dsets_out]
+
+            for dset, dset_out in zip(dset_names, dsets_out):
+                DatasetCollector.collect_virtual(clt._h5_out, clt.h5_files,
+                                                 clt.gids, dset,
+                                                 dset_out=dset_out,
+                                                 gid_plan=clt.gid_plan)
+        elif isinstance(dset_name, str) and max_workers == 1:
+            DatasetCollector.collect_dset(clt._h5_out, clt.h5_files, clt.gids,
+                                          dset_name, dset_out=dset_out,
+                                          mem_util_lim=mem_util_lim,
+                                          gid_plan=clt.gid_plan)
+        else:
+            dsets_out = dset_out
+            if isinstance(dsets_out, str):
+                dsets_out = [dsets_out]
+
+            DatasetCollector.collect_dsets(clt._h5_out, clt.h5_files,
+                                           clt.gids, dset_names,
+                                           dsets_out=dsets_out,
+                                           mem_util_lim=mem_util_lim,
+                                           max_workers=max_workers,
+                                           gid_plan=clt.gid_plan)
 
         logger.debug("\t- Collection of '{}' complete".format(dset_name))
 
@@ -723,7 +1298,8 @@ class Collector:
 
         DatasetCollector.collect_dset(clt._h5_out, clt.h5_files, clt.gids,
                                       dset_name, dset_out=dset_out,
-                                      mem_util_lim=mem_util_lim)
+                                      mem_util_lim=mem_util_lim,
+                                      gid_plan=clt.gid_plan)
 
         logger.debug("\t- Collection of '{}' complete".format(dset_name))
 
@@ -732,6 +1308,61 @@ class Collector:
         logger.debug('\t- Collection took {:.4f} minutes'
                      .format(tt))
 
+    @staticmethod
+    def materialize(h5_file, dsets=None, mem_util_lim=0.7):
+        """
+        Replace virtual datasets in a collected h5_file with physical copies
+        so that the source files are no longer required.
+
+        Parameters
+        ----------
+        h5_file : str
+            Path to collected .h5 file with virtual datasets.
+        dsets : list | None
+            Virtual datasets to materialize, None will materialize all.
+        mem_util_lim : float
+            Memory utilization limit (fractional). This sets how many sites
+            will be copied at a time.
+        """
+        virtual_dsets = Collector.get_virtual_dsets(h5_file)
+        if dsets is not None:
+            virtual_dsets = [d for d in virtual_dsets if d in dsets]
+
+        mem_avail = mem_util_lim * psutil.virtual_memory().total
+        ts = time.time()
+        with Outputs(h5_file, mode='a') as f:
+            for dset in virtual_dsets:
+                ds = f.h5[dset]
+                source = ds.virtual_sources()[0]
+                with Outputs(source.file_name, mode='r') as f_source:
+                    _, _, chunks = f_source.get_dset_properties(
+                        source.dset_name)
+
+                attrs = dict(ds.attrs)
+                dset_tmp = '{}_materialize'.format(dset)
+                f._create_dset(dset_tmp, ds.shape, ds.dtype, chunks=chunks,
+                               attrs=attrs)
+
+                site_mem_req = DatasetCollector._get_site_mem_req(ds.shape,
+                                                                  ds.dtype)
+                site_chunks = DatasetCollector._split_gids(
+                    np.arange(ds.shape[-1]), site_mem_req, mem_avail,
+                    label=dset)
+                for sites in site_chunks:
+                    site_slice = slice(sites[0], sites[-1] + 1)
+                    f.h5[dset_tmp][..., site_slice] = ds[..., site_slice]
+
+                del f.h5[dset]
+                f.h5.move(dset_tmp, dset)
+                logger.debug('\t- Materialized virtual dataset "{}"'
+                             .format(dset))
+                log_mem(logger, log_level='DEBUG')
+
+        tt = (time.time() - ts) / 60
+        logger.info('Materialized {} virtual datasets in {}'
+                    .format(len(virtual_dsets), h5_file))
+        logger.debug('\t- Materialization took {:.4f} minutes'.format(tt))
+
     @classmethod
     def purge_chunks(cls, h5_file, h5_dir, project_points, file_prefix=None):
         """
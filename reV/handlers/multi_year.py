@@ -5,10 +5,9 @@ Classes to collect reV outputs from multiple annual files.
 import logging
 import numpy as np
 import os
-import pandas as pd
 
 from reV.handlers.outputs import Outputs
-from reV.utilities.exceptions import HandlerRuntimeError
+from reV.utilities.exceptions import HandlerRuntimeError, HandlerValueError
 
 from rex.utilities.utilities import parse_year
 
@@ -24,6 +23,17 @@ class MultiYear(Outputs):
     - compute multi-year coefficient of variations
 
     """
+    # Max size in bytes of the site blocks used to stream datasets that
+    # can not be copied natively by HDF5
+    COPY_BLOCK_SIZE = 1e9
+
+    # Max size in bytes of the float64 working arrays held in memory for
+    # each site block of the multi-year statistics
+    STATS_BLOCK_SIZE = 1e9
+
+    # Multi-year statistics in addition to "p##" exceedance probabilities
+    STATS = ('means', 'stdev', 'cv', 'min', 'max')
+
     def __init__(self, h5_file, group=None, unscale=True, mode='r',
                  str_decode=True):
         """
@@ -86,7 +96,62 @@ class MultiYear(Outputs):
             self._create_dset(dset_out, time_index.shape, time_index.dtype,
                               data=time_index)
 
-    def _copy_dset(self, source_h5, dset, meta=None):
+    @staticmethod
+    def _get_coords(h5):
+        """
+        Read only the site coordinates from the meta data of an open .h5 file
+
+        Parameters
+        ----------
+        h5 : h5py.File | h5py.Group
+            Open .h5 file or group containing meta data
+
+        Returns
+        -------
+        coords : ndarray
+            (n_sites, 2) array of latitude and longitude
+        """
+        meta = h5['meta']
+        coords = np.column_stack((meta['latitude'], meta['longitude']))
+
+        return coords
+
+    def _copy_dset_blocks(self, ds_in, dset_out):
+        """
+        Stream a dataset that HDF5 can not copy natively (e.g. a virtual
+        dataset) into the multiyear .h5 in chunk-aligned site blocks without
+        unscaling.
+
+        Parameters
+        ----------
+        ds_in : h5py.Dataset
+            Source dataset
+        dset_out : str
+            Output dataset name
+        """
+        chunks = ds_in.chunks
+        if chunks is None:
+            # virtual datasets have no chunks of their own
+            chunks = self.get_chunks(ds_in.shape, ds_in.dtype, access='site')
+
+        ds_out = self.h5.create_dataset(dset_out, shape=ds_in.shape,
+                                        dtype=ds_in.dtype, chunks=chunks)
+        for key, value in ds_in.attrs.items():
+            ds_out.attrs[key] = value
+
+        n_sites = ds_in.shape[-1]
+        site_chunk = chunks[-1]
+        site_bytes = ds_in.dtype.itemsize
+        if len(ds_in.shape) > 1:
+            site_bytes *= ds_in.shape[0]
+
+        n_chunks = int(self.COPY_BLOCK_SIZE // (site_bytes * site_chunk))
+        step = max(1, n_chunks) * site_chunk
+        for i in range(0, n_sites, step):
+            site_slice = slice(i, i + step)
+            ds_out[..., site_slice] = ds_in[..., site_slice]
+
+    def _copy_dset(self, source_h5, dset, coords=None):
         """
         Copy dset_in from source_h5 to multiyear .h5
 
@@ -96,26 +161,24 @@ class MultiYear(Outputs):
             Path to source .h5 file to copy data from
         dset : str
             Dataset to copy
-        meta : pandas.DataFrame
-            If provided confirm that source meta matches given meta
+        coords : ndarray
+            If provided confirm that source meta coordinates match the given
+            (n_sites, 2) array of latitude and longitude
         """
         dset_out = self._create_dset_name(source_h5, dset)
         if dset_out not in self.datasets:
             logger.debug("- Collecting {} from {}"
                          .format(dset, os.path.basename(source_h5)))
             with Outputs(source_h5, unscale=False, mode='r') as f_in:
-                if meta is not None:
-                    cols = ['latitude', 'longitude']
-                    source_meta = f_in.meta
-                    if not meta[cols].equals(source_meta[cols]):
+                if coords is not None:
+                    if not np.array_equal(coords, self._get_coords(f_in.h5)):
                         raise HandlerRuntimeError('Coordinates do not match')
 
-                _, ds_dtype, ds_chunks = f_in.get_dset_properties(dset)
-                ds_attrs = f_in.get_attrs(dset=dset)
-                ds_data = f_in[dset]
-
-            self._create_dset(dset_out, ds_data.shape, ds_dtype,
-                              chunks=ds_chunks, attrs=ds_attrs, data=ds_data)
+                ds_in = f_in.h5[dset]
+                if ds_in.is_virtual:
+                    self._copy_dset_blocks(ds_in, dset_out)
+                else:
+                    f_in.h5.copy(ds_in, self.h5, name=dset_out)
 
     def collect(self, source_files, dset, profiles=False):
         """
@@ -133,19 +196,35 @@ class MultiYear(Outputs):
             If True also collect time_index
         """
         with Outputs(source_files[0], mode='r') as f_in:
-            meta = f_in.h5['meta'][...]
+            if 'meta' not in self.datasets:
+                logger.debug("Copying meta")
+                f_in.h5.copy(f_in.h5['meta'], self.h5, name='meta')
 
-        if 'meta' not in self.datasets:
-            logger.debug("Copying meta")
-            self._create_dset('meta', meta.shape, meta.dtype,
-                              data=meta)
+            coords = self._get_coords(f_in.h5)
 
-        meta = pd.DataFrame(meta)
-        for year_h5 in source_files:
+        for i, year_h5 in enumerate(source_files):
             if profiles:
                 self._copy_time_index(year_h5)
 
-            self._copy_dset(year_h5, dset, meta=meta)
+            self._copy_dset(year_h5, dset, coords=coords if i else None)
+
+    @staticmethod
+    def _is_stat(name):
+        """
+        Check if a dataset name suffix is a multi-year statistic
+
+        Parameters
+        ----------
+        name : str
+            Dataset name suffix, e.g. "means", "stdev", or "p90"
+
+        Returns
+        -------
+        bool
+        """
+        is_quantile = name.startswith('p') and name[1:].isdigit()
+
+        return name in MultiYear.STATS or is_quantile
 
     def _get_source_dsets(self, dset_out):
         """
@@ -163,65 +242,160 @@ class MultiYear(Outputs):
         """
         dset = os.path.basename(dset_out).split("-")[0]
         logger.debug('-- source_dset root = {}'.format(dset))
-        my_dset = ["{}-{}".format(dset, val) for val in ['means', 'stdev']]
         source_dsets = [ds for ds in self.datasets if dset in ds
-                        and ds not in my_dset]
+                        and not self._is_stat(ds.split('-')[-1])]
         if dset_out in source_dsets:
             source_dsets.remove(dset_out)
 
         return source_dsets
 
-    def _update_dset(self, dset_out, dset_data):
+    def _init_stat_dset(self, dset_out, source_dset):
         """
-        Update dataset, create if needed
+        Create a multi-year statistic dataset with the layout of its source
+        dataset if it does not exist yet
 
         Parameters
         ----------
         dset_out : str
-            Dataset name
-        dset_data : ndarray
-            Dataset data to write to disc
+            Multi-year statistic dataset name
+        source_dset : str
+            Annual dataset to take shape, dtype, chunks and attrs from
         """
         if dset_out in self.datasets:
             logger.debug("- Updating {}".format(dset_out))
-            self[dset_out] = dset_data
         else:
             logger.debug("- Creating {}".format(dset_out))
-            source_dset = self._get_source_dsets(dset_out)[0]
-            _, ds_dtype, ds_chunks = self.get_dset_properties(source_dset)
-            ds_attrs = self.get_attrs(dset=source_dset)
-            self._add_dset(dset_out, dset_data, ds_dtype,
-                           chunks=ds_chunks, attrs=ds_attrs)
-
-    def _compute_means(self, dset_out):
+            ds_in = self.h5[source_dset]
+            dtype = ds_in.dtype
+            attrs = dict(ds_in.attrs)
+            if dset_out.endswith('-cv'):
+                dtype = np.float32
+                attrs = {k: v for k, v in attrs.items()
+                         if k not in ('scale_factor', 'units')}
+
+            ds_out = self.h5.create_dataset(dset_out, shape=ds_in.shape,
+                                            dtype=dtype, chunks=ds_in.chunks)
+            for key, value in attrs.items():
+                ds_out.attrs[key] = value
+
+    def _get_site_step(self, shape, n_arrays):
         """
-        Compute multi-year means for given dataset
+        Get the number of sites to compute statistics for at a time
 
         Parameters
         ----------
-        dset_out : str
-            Multi-year means dataset name
+        shape : tuple
+            Shape of the annual datasets
+        n_arrays : int
+            Number of site block arrays held in memory at once
 
         Returns
         -------
-        my_means : ndarray
-            Array of multi-year means
+        step : int
+            Number of sites per block
         """
-        source_dsets = self._get_source_dsets(dset_out)
-        logger.debug('\t- Computing {} from {}'.format(dset_out, source_dsets))
+        site_bytes = np.dtype(np.float64).itemsize * n_arrays
+        if len(shape) > 1:
+            site_bytes *= shape[0]
 
-        my_means = np.zeros(len(self), dtype='float32')
+        step = max(1, int(self.STATS_BLOCK_SIZE // site_bytes))
+
+        return step
+
+    def compute_stats(self, dset, stats=('means', 'stdev')):
+        """
+        Compute multi-year statistics for a dataset in one read pass over
+        the annual datasets, streamed in site blocks. Means and standard
+        deviations are accumulated with Welford's algorithm. Profiles (2D
+        datasets) produce statistics for every timestep and site.
+
+        Parameters
+        ----------
+        dset : str
+            Dataset of interest
+        stats : list | tuple
+            Statistics to compute. Options are "means", "stdev", "cv",
+            "min", "max", and exceedance probabilities like "p50" or "p90"
+            (the value exceeded in 90% of years). Each is written to
+            "{dset}-{stat}".
+        """
+        for stat in stats:
+            if not self._is_stat(stat):
+                msg = ('Cannot compute multi-year statistic "{}", options '
+                       'are {} or "p##"'.format(stat, self.STATS))
+                logger.error(msg)
+                raise HandlerValueError(msg)
+
+        source_dsets = self._get_source_dsets(dset)
+        logger.debug('\t- Computing {} of {} from {}'
+                     .format(stats, dset, source_dsets))
+        shape = self.h5[source_dsets[0]].shape
         for ds in source_dsets:
-            if self.h5[ds].shape == my_means.shape:
-                my_means += self[ds]
-            else:
+            if self.h5[ds].shape != shape:
                 raise HandlerRuntimeError("{} shape {} should be {}"
                                           .format(ds, self.h5[ds].shape,
-                                                  my_means.shape))
-        my_means /= len(source_dsets)
-        self._update_dset(dset_out, my_means)
-
-        return my_means
+                                                  shape))
+
+        dsets_out = {stat: "{}-{}".format(dset, stat) for stat in stats}
+        for dset_out in dsets_out.values():
+            self._init_stat_dset(dset_out, source_dsets[0])
+
+        quantiles = {stat: 100 - int(stat[1:]) for stat in stats
+                     if stat.startswith('p')}
+        n_years = len(source_dsets)
+        # means, m2, mins, maxs, stdev, cv and the annual read and its cast
+        n_arrays = 8
+        if quantiles:
+            n_arrays += n_years + len(quantiles)
+
+        step = self._get_site_step(shape, n_arrays)
+        for i in range(0, shape[-1], step):
+            site_slice = slice(i, i + step)
+            if len(shape) > 1:
+                site_slice = (slice(None), site_slice)
+            else:
+                site_slice = (site_slice, )
+
+            years = None
+            for n, ds in enumerate(source_dsets, start=1):
+                arr = self[(ds, ) + site_slice]
+                if quantiles:
+                    if years is None:
+                        years = np.empty((n_years, ) + arr.shape,
+                                         dtype=np.float64)
+
+                    years[n - 1] = arr
+                    arr = years[n - 1]
+                else:
+                    arr = arr.astype(np.float64)
+
+                if n == 1:
+                    means = arr.copy()
+                    m2 = np.zeros(arr.shape, dtype=np.float64)
+                    mins = arr.copy()
+                    maxs = arr.copy()
+                else:
+                    delta = arr - means
+                    means += delta / n
+                    m2 += delta * (arr - means)
+                    np.minimum(mins, arr, out=mins)
+                    np.maximum(maxs, arr, out=maxs)
+
+            stdev = np.sqrt(m2 / n_years)
+            out = {'means': means, 'stdev': stdev, 'min': mins, 'max': maxs}
+            if 'cv' in stats:
+                out['cv'] = stdev / means
+
+            if quantiles:
+                # years is partially sorted in place, so every exceedance
+                # probability is taken in a single call
+                q_arrs = np.percentile(years, list(quantiles.values()),
+                                       axis=0, overwrite_input=True)
+                out.update(zip(quantiles, q_arrs))
+
+            for stat, dset_out in dsets_out.items():
+                self._set_ds_array(dset_out, out[stat].astype(np.float32),
+                                   site_slice, inplace=True)
 
     def means(self, dset):
         """
@@ -238,47 +412,10 @@ class MultiYear(Outputs):
             Array of multi-year means for dataset of interest
         """
         my_dset = "{}-means".format(dset)
-        if my_dset in self.datasets:
-            my_means = self[my_dset]
-        else:
-            my_means = self._compute_means(my_dset)
-
-        return my_means
-
-    def _compute_stdev(self, dset_out, means=None):
-        """
-        Compute multi-year standard deviation for given dataset
-
-        Parameters
-        ----------
-        dset_out : str
-            Multi-year stdev dataset name
-        means : ndarray
-            Array of pre-computed means
+        if my_dset not in self.datasets:
+            self.compute_stats(dset, stats=('means', ))
 
-        Returns
-        -------
-        my_stdev : ndarray
-            Array of multi-year standard deviations
-        """
-        if means is None:
-            means = self._compute_means("{}-means".format(dset_out))
-
-        source_dsets = self._get_source_dsets(dset_out)
-
-        my_stdev = np.zeros(means.shape, dtype='float32')
-        for ds in source_dsets:
-            if self.h5[ds].shape == my_stdev.shape:
-                my_stdev += (self[ds] - means)**2
-            else:
-                raise HandlerRuntimeError("{} shape {} should be {}"
-                                          .format(ds, self.h5[ds].shape,
-                                                  my_stdev.shape))
-
-        my_stdev = np.sqrt(my_stdev / len(source_dsets))
-        self._update_dset(dset_out, my_stdev)
-
-        return my_stdev
+        return self[my_dset]
 
     def stdev(self, dset):
         """
@@ -295,13 +432,14 @@ class MultiYear(Outputs):
             Array of multi-year standard deviation for dataset of interest
         """
         my_dset = "{}-stdev".format(dset)
-        if my_dset in self.datasets:
-            my_stdev = self[my_dset]
-        else:
-            my_means = self.means(dset)
-            my_stdev = self._compute_stdev(my_dset, means=my_means)
+        if my_dset not in self.datasets:
+            stats = ('stdev', )
+            if "{}-means".format(dset) not in self.datasets:
+                stats = ('means', 'stdev')
+
+            self.compute_stats(dset, stats=stats)
 
-        return my_stdev
+        return self[my_dset]
 
     def CV(self, dset):
         """
@@ -349,7 +487,8 @@ class MultiYear(Outputs):
         return len(shape) == 2
 
     @classmethod
-    def collect_means(cls, my_file, source_files, dset, group=None):
+    def collect_means(cls, my_file, source_files, dset, group=None,
+                      stats=('means', 'stdev')):
         """
         Collect and compute multi-year means for given dataset
 
@@ -363,17 +502,19 @@ class MultiYear(Outputs):
             Dataset to collect
         group : str
             Group to collect datasets into
+        stats : list | tuple
+            Multi-year statistics to compute, see MultiYear.compute_stats
         """
         logger.info('Collecting {} into {} '
-                    'and computing multi-year means and standard deviations.'
-                    .format(dset, my_file))
+                    'and computing multi-year {}.'
+                    .format(dset, my_file, stats))
         with cls(my_file, mode='a', group=group) as my:
             my.collect(source_files, dset)
-            means = my._compute_means("{}-means".format(dset))
-            my._compute_stdev("{}-stdev".format(dset), means=means)
+            my.compute_stats(dset, stats=stats)
 
     @classmethod
-    def collect_profiles(cls, my_file, source_files, dset, group=None):
+    def collect_profiles(cls, my_file, source_files, dset, group=None,
+                         stats=None):
         """
         Collect multi-year profiles associated with given dataset
 
@@ -387,7 +528,13 @@ class MultiYear(Outputs):
             Profiles dataset to collect
         group : str
             Group to collect datasets into
+        stats : list | tuple | None
+            Optional multi-year statistics to compute for every timestep and
+            site, e.g. ('means', 'p50', 'p90'). The annual profiles must all
+            have the same number of timesteps. See MultiYear.compute_stats
         """
         logger.info('Collecting {} into {}'.format(dset, my_file))
         with cls(my_file, mode='a', group=group) as my:
             my.collect(source_files, dset, profiles=True)
+            if stats:
+                my.compute_stats(dset, stats=stats)
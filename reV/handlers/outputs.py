@@ -24,6 +24,21 @@ class Outputs(Resource):
     """
     Base class to handle reV output data in .h5 format
     """
+    # Target size in bytes of auto-tuned dataset chunks
+    CHUNK_SIZE = 2e6
+
+    # Dataset access patterns that auto-tuned chunks can be optimized for:
+    # - site: full timeseries for a few sites at a time (profiles by site)
+    # - time: blocks of timesteps for all sites at a time
+    # - full: whole dataset reads, e.g. full 1D arrays
+    ACCESS_PATTERNS = ('site', 'time', 'full')
+
+    # Built-in HDF5 filters (h5py.create_dataset kwargs) by compression name
+    COMPRESSION = {None: {},
+                   'gzip': {'compression': 'gzip', 'compression_opts': 4,
+                            'shuffle': True},
+                   'lzf': {'compression': 'lzf', 'shuffle': True}}
+
     def __init__(self, h5_file, unscale=True, mode='r', str_decode=True,
                  group=None):
         """
@@ -49,6 +64,7 @@ class Outputs(Resource):
         self._time_index = None
         self._str_decode = str_decode
         self._group = self._check_group(group)
+        self._write_buffers = {}
 
         if self.writable:
             self.set_version_attr()
@@ -90,6 +106,13 @@ class Outputs(Resource):
             else:
                 self._set_ds_array(ds, arr, ds_slice)
 
+    def close(self):
+        """
+        Release the scaled write buffers and close h5 instance
+        """
+        self._write_buffers.clear()
+        super().close()
+
     def set_version_attr(self):
         """Set the version attribute to the h5 file."""
         self.h5.attrs['version'] = __version__
@@ -343,7 +366,8 @@ class Outputs(Resource):
                 self.h5['meta'].attrs[key] = config
 
     @staticmethod
-    def _check_data_dtype(data, dtype, scale_factor=1):
+    def _check_data_dtype(data, dtype, scale_factor=1, out=None,
+                          inplace=False):
         """
         Check data dtype and scale if needed
 
@@ -355,6 +379,12 @@ class Outputs(Resource):
             dtype of data on disc
         scale_factor : int
             Scale factor to scale data to integer (if needed)
+        out : ndarray | None
+            Optional pre-allocated array with the shape of data and dtype to
+            write the scaled data into.
+        inplace : bool
+            Flag to allow data to be scaled in place if it is a float array.
+            data is garbage after the call if True.
 
         Returns
         -------
@@ -367,16 +397,88 @@ class Outputs(Resource):
                 raise HandlerRuntimeError("A scale_factor is needed to"
                                           "scale data to {}.".format(dtype))
 
-            # apply scale factor and dtype
-            data = np.multiply(data, scale_factor)
+            # apply scale factor and dtype with at most one float temporary
+            if inplace and np.issubdtype(data.dtype, np.floating):
+                np.multiply(data, scale_factor, out=data)
+            else:
+                data = np.asarray(np.multiply(data, scale_factor))
+
             if np.issubdtype(dtype, np.integer):
-                data = np.round(data)
+                if np.issubdtype(data.dtype, np.floating):
+                    np.rint(data, out=data)
+                else:
+                    data = np.round(data)
 
-            data = data.astype(dtype)
+            if out is None:
+                data = data.astype(dtype)
+            else:
+                np.copyto(out, data, casting='unsafe')
+                data = out
 
         return data
 
-    def _set_ds_array(self, ds_name, arr, ds_slice):
+    def _get_write_buffer(self, dtype, shape):
+        """
+        Get a reusable write buffer for scaled data. Buffers are kept until
+        the file handler is closed and only grow when a larger one is needed.
+
+        Parameters
+        ----------
+        dtype : str | np.dtype
+            Buffer dtype
+        shape : tuple
+            Buffer shape
+
+        Returns
+        -------
+        buffer : ndarray
+            Uninitialized C-contiguous array of shape and dtype
+        """
+        dtype = np.dtype(dtype)
+        n = int(np.prod(shape))
+        buffer = self._write_buffers.get(dtype)
+        if buffer is None or buffer.size < n:
+            buffer = np.empty(n, dtype=dtype)
+            self._write_buffers[dtype] = buffer
+
+        return buffer[:n].reshape(shape)
+
+    @staticmethod
+    def _is_direct_slice(ds_slice, ds_shape, arr_shape):
+        """
+        Check if an array can be written with h5py write_direct, i.e. the
+        dataset selection is a simple slab with exactly the array shape.
+
+        Parameters
+        ----------
+        ds_slice : tuple
+            Dataset slicing that corresponds to the array
+        ds_shape : tuple
+            Dataset shape
+        arr_shape : tuple
+            Array shape
+
+        Returns
+        -------
+        bool
+        """
+        if not isinstance(ds_slice, tuple):
+            ds_slice = (ds_slice, )
+
+        if len(ds_slice) > len(ds_shape):
+            return False
+
+        sel_shape = []
+        for i, n in enumerate(ds_shape):
+            s = ds_slice[i] if i < len(ds_slice) else slice(None)
+            if not isinstance(s, slice) or s.step not in (None, 1):
+                return False
+
+            sel_shape.append(len(range(*s.indices(n))))
+
+        return tuple(sel_shape) == tuple(arr_shape)
+
+    def _set_ds_array(self, ds_name, arr, ds_slice, inplace=False):
         """
         Write ds to disk
 
@@ -388,27 +490,126 @@ class Outputs(Resource):
             Dataset data array
         ds_slice : tuple
             Dataset slicing that corresponds to arr
+        inplace : bool
+            Flag to allow a float arr to be scaled in place. arr is garbage
+            after the call if True.
         """
         if ds_name not in self.datasets:
             msg = '{} must be initialized!'.format(ds_name)
             raise HandlerRuntimeError(msg)
 
-        dtype = self.h5[ds_name].dtype
+        ds = self.h5[ds_name]
         scale_factor = self.get_scale(ds_name)
         ds_slice = parse_slice(ds_slice)
-        self.h5[ds_name][ds_slice] = self._check_data_dtype(arr, dtype,
-                                                            scale_factor)
 
-    def _check_chunks(self, chunks, data=None):
+        arr = np.asarray(arr)
+        out = None
+        if not np.issubdtype(arr.dtype, ds.dtype):
+            out = self._get_write_buffer(ds.dtype, arr.shape)
+
+        arr = self._check_data_dtype(arr, ds.dtype, scale_factor, out=out,
+                                     inplace=inplace)
+
+        direct = (arr.flags['C_CONTIGUOUS']
+                  and self._is_direct_slice(ds_slice, ds.shape, arr.shape))
+        if direct:
+            ds.write_direct(arr, dest_sel=ds_slice)
+        else:
+            ds[ds_slice] = arr
+
+    @classmethod
+    def get_chunks(cls, shape, dtype, access='site', chunk_size=None):
+        """
+        Get auto-tuned chunks for a dataset based on its shape, dtype and
+        declared access pattern
+
+        Parameters
+        ----------
+        shape : tuple
+            Dataset shape, (n_sites, ) or (n_time, n_sites)
+        dtype : str | np.dtype
+            Dataset numpy dtype
+        access : str
+            Access pattern to optimize chunks for, one of
+            Outputs.ACCESS_PATTERNS: "site" (full timeseries for a few
+            sites), "time" (blocks of timesteps for all sites) or "full"
+            (balanced chunks for whole dataset reads)
+        chunk_size : float | None
+            Target chunk size in bytes, None will use Outputs.CHUNK_SIZE
+
+        Returns
+        -------
+        chunks : tuple
+            Dataset chunk shape
+        """
+        if access not in cls.ACCESS_PATTERNS:
+            msg = ('Cannot auto-tune chunks for access pattern "{}", '
+                   'options are: {}'.format(access, cls.ACCESS_PATTERNS))
+            logger.error(msg)
+            raise HandlerValueError(msg)
+
+        if chunk_size is None:
+            chunk_size = cls.CHUNK_SIZE
+
+        n_items = int(max(1, chunk_size // np.dtype(dtype).itemsize))
+        if len(shape) == 1:
+            return (int(max(1, min(shape[0], n_items))), )
+
+        n_time, n_sites = shape
+        if access == 'site':
+            chunk_0 = min(n_time, n_items)
+            chunk_1 = n_items // chunk_0
+        elif access == 'time':
+            chunk_1 = min(n_sites, n_items)
+            chunk_0 = n_items // chunk_1
+        else:
+            chunk_0 = min(n_time, int(np.sqrt(n_items)))
+            chunk_1 = n_items // chunk_0
+
+        chunks = (int(max(1, min(n_time, chunk_0))),
+                  int(max(1, min(n_sites, chunk_1))))
+
+        return chunks
+
+    @classmethod
+    def get_filters(cls, compression=None):
+        """
+        Get the HDF5 filter kwargs for a built-in compression policy
+
+        Parameters
+        ----------
+        compression : str | None
+            Compression filter, one of the Outputs.COMPRESSION keys: None,
+            "gzip" or "lzf". Compressed datasets are byte-shuffled.
+
+        Returns
+        -------
+        filters : dict
+            h5py.create_dataset filter kwargs
+        """
+        if compression not in cls.COMPRESSION:
+            msg = ('Cannot compress with "{}", options are: {}'
+                   .format(compression, list(cls.COMPRESSION)))
+            logger.error(msg)
+            raise HandlerValueError(msg)
+
+        return cls.COMPRESSION[compression].copy()
+
+    def _check_chunks(self, chunks, data=None, shape=None, dtype=None):
         """
         Convert dataset chunk size into valid tuple based on variable array
         shape
         Parameters
         ----------
-        chunks : tuple
-            Desired dataset chunk size
+        chunks : tuple | str
+            Desired dataset chunk size or an access pattern to auto-tune the
+            chunks for (see Outputs.get_chunks)
         data : ndarray
             Dataset array being chunked
+        shape : tuple
+            Dataset shape, used if data is None. Defaults to self.shape
+        dtype : str | np.dtype
+            Dataset dtype, required to auto-tune chunks
 
         Returns
         -------
@@ -418,27 +619,30 @@ class Outputs(Resource):
         if chunks is not None:
             if data is not None:
                 shape = data.shape
-            else:
+            elif shape is None:
                 shape = self.shape
 
-            if chunks[0] is None:
-                chunk_0 = shape[0]
-            else:
-                chunk_0 = np.min((shape[0], chunks[0]))
+            if isinstance(chunks, str):
+                if dtype is None:
+                    dtype = data.dtype
 
-            if chunks[1] is None:
-                chunk_1 = shape[1]
-            else:
-                chunk_1 = np.min((shape[1], chunks[1]))
+                return self.get_chunks(shape, dtype, access=chunks)
 
-            ds_chunks = (chunk_0, chunk_1)
+            ds_chunks = []
+            for i, chunk in enumerate(chunks):
+                if chunk is None:
+                    ds_chunks.append(shape[i])
+                else:
+                    ds_chunks.append(np.min((shape[i], chunk)))
+
+            ds_chunks = tuple(ds_chunks)
         else:
             ds_chunks = None
 
         return ds_chunks
 
     def _create_dset(self, ds_name, shape, dtype, chunks=None, attrs=None,
-                     data=None, replace=True):
+                     data=None, replace=True, compression=None):
         """
         Initialize dataset
 
@@ -450,14 +654,18 @@ class Outputs(Resource):
             Dataset shape
         dtype : str
             Dataset numpy dtype
-        chunks : tuple
-            Dataset chunk size
+        chunks : tuple | str
+            Dataset chunk size or an access pattern ("site", "time", "full")
+            to auto-tune the chunks for
         attrs : dict
             Dataset attributes
         data : ndarray
             Dataset data array
         replace : bool
             If previous dataset exists with the same name, it will be replaced.
+        compression : str | None
+            Compression filter ("gzip" or "lzf"), None for no compression.
+            Compressed datasets without chunks get "full" access chunks.
         """
         if self.writable:
             if ds_name in self.datasets and replace:
@@ -474,9 +682,14 @@ class Outputs(Resource):
                     raise HandlerRuntimeError(e)
 
             if ds_name not in self.datasets:
-                chunks = self._check_chunks(chunks, data=data)
+                filters = self.get_filters(compression)
+                if filters and chunks is None:
+                    chunks = 'full'
+
+                chunks = self._check_chunks(chunks, data=data, shape=shape,
+                                            dtype=dtype)
                 ds = self.h5.create_dataset(ds_name, shape=shape, dtype=dtype,
-                                            chunks=chunks)
+                                            chunks=chunks, **filters)
 
             if attrs is not None:
                 for key, value in attrs.items():
@@ -514,7 +727,8 @@ class Outputs(Resource):
                 raise HandlerRuntimeError("'meta' and 'time_index' have not "
                                           "been loaded")
 
-    def _add_dset(self, dset_name, data, dtype, chunks=None, attrs=None):
+    def _add_dset(self, dset_name, data, dtype, chunks=None, attrs=None,
+                  compression=None):
         """
         Write dataset to disk. Dataset it created in .h5 file and data is
         scaled if needed.
@@ -527,10 +741,13 @@ class Outputs(Resource):
             Data to be added to h5 file.
         dtype : str
             Intended dataset datatype after scaling.
-        chunks : tuple
-            Chunk size for capacity factor means dataset.
+        chunks : tuple | str
+            Chunk size for capacity factor means dataset or an access pattern
+            to auto-tune the chunks for.
         attrs : dict
             Attributes to be set. May include 'scale_factor'.
+        compression : str | None
+            Compression filter ("gzip" or "lzf"), None for no compression.
         """
         self._check_dset_shape(data)
 
@@ -542,7 +759,8 @@ class Outputs(Resource):
         data = self._check_data_dtype(data, dtype, scale_factor=scale_factor)
 
         self._create_dset(dset_name, data.shape, dtype,
-                          chunks=chunks, attrs=attrs, data=data)
+                          chunks=chunks, attrs=attrs, data=data,
+                          compression=compression)
 
     def update_dset(self, dset, dset_array, dset_slice=None):
         """
@@ -567,7 +785,8 @@ class Outputs(Resource):
         if not np.array_equal(arr, dset_array):
             self._set_ds_array(dset, dset_array, dset_slice)
 
-    def write_dataset(self, dset_name, data, dtype, chunks=None, attrs=None):
+    def write_dataset(self, dset_name, data, dtype, chunks=None, attrs=None,
+                      compression=None):
         """
         Write dataset to disk. Dataset it created in .h5 file and data is
         scaled if needed.
@@ -580,17 +799,22 @@ class Outputs(Resource):
             Data to be added to h5 file.
         dtype : str
             Intended dataset datatype after scaling.
-        chunks : tuple
-            Chunk size for capacity factor means dataset.
+        chunks : tuple | str
+            Chunk size for capacity factor means dataset or an access pattern
+            to auto-tune the chunks for.
         attrs : dict
             Attributes to be set. May include 'scale_factor'.
+        compression : str | None
+            Compression filter ("gzip" or "lzf"), None for no compression.
         """
-        self._add_dset(dset_name, data, dtype, chunks=chunks, attrs=attrs)
+        self._add_dset(dset_name, data, dtype, chunks=chunks, attrs=attrs,
+                       compression=compression)
 
     @classmethod
     def write_profiles(cls, h5_file, meta, time_index, dset_name, profiles,
-                       attrs, dtype, SAM_configs=None, chunks=(None, 100),
-                       unscale=True, mode='w-', str_decode=True, group=None):
+                       attrs, dtype, SAM_configs=None, chunks='site',
+                       unscale=True, mode='w-', str_decode=True, group=None,
+                       compression=None):
         """
         Write profiles to disk
 
@@ -612,8 +836,9 @@ class Outputs(Resource):
             Intended dataset datatype after scaling.
         SAM_configs : dict
             Dictionary of SAM configuration JSONs used to compute cf profiles
-        chunks : tuple
-            Chunk size for profiles dataset
+        chunks : tuple | str
+            Chunk size for profiles dataset or an access pattern to auto-tune
+            the chunks for
         unscale : bool
             Boolean flag to automatically unscale variables on extraction
         mode : str
@@ -623,6 +848,8 @@ class Outputs(Resource):
             strings. Setting this to False will speed up the meta data read.
         group : str
             Group within .h5 resource file to open
+        compression : str | None
+            Compression filter ("gzip" or "lzf"), None for no compression.
         """
         logger.info("Saving profiles ({}) to {}".format(dset_name, h5_file))
         if profiles.shape != (len(time_index), len(meta)):
@@ -646,7 +873,7 @@ class Outputs(Resource):
 
             # Write dset to disk
             f._add_dset(dset_name, profiles, dtype,
-                        chunks=chunks, attrs=attrs)
+                        chunks=chunks, attrs=attrs, compression=compression)
             logger.debug("\t- '{}' saved to disc".format(dset_name))
 
         tt = (time.time() - ts) / 60
@@ -657,7 +884,7 @@ class Outputs(Resource):
     @classmethod
     def write_means(cls, h5_file, meta, dset_name, means, attrs, dtype,
                     SAM_configs=None, chunks=None, unscale=True, mode='w-',
-                    str_decode=True, group=None):
+                    str_decode=True, group=None, compression=None):
         """
         Write means array to disk
 
@@ -677,8 +904,9 @@ class Outputs(Resource):
             Intended dataset datatype after scaling.
         SAM_configs : dict
             Dictionary of SAM configuration JSONs used to compute cf means
-        chunks : tuple
-            Chunk size for capacity factor means dataset
+        chunks : tuple | str
+            Chunk size for capacity factor means dataset or an access pattern
+            to auto-tune the chunks for
         unscale : bool
             Boolean flag to automatically unscale variables on extraction
         mode : str
@@ -688,6 +916,8 @@ class Outputs(Resource):
             strings. Setting this to False will speed up the meta data read.
         group : str
             Group within .h5 resource file to open
+        compression : str | None
+            Compression filter ("gzip" or "lzf"), None for no compression.
         """
         logger.info("Saving means ({}) to {}".format(dset_name, h5_file))
         if len(means) != len(meta):
@@ -709,7 +939,7 @@ class Outputs(Resource):
 
             # Write dset to disk
             f._add_dset(dset_name, means, dtype,
-                        chunks=chunks, attrs=attrs)
+                        chunks=chunks, attrs=attrs, compression=compression)
             logger.debug("\t- '{}' saved to disc".format(dset_name))
 
         tt = (time.time() - ts) / 60
@@ -720,7 +950,7 @@ class Outputs(Resource):
     @classmethod
     def add_dataset(cls, h5_file, dset_name, dset_data, attrs, dtype,
                     chunks=None, unscale=True, mode='a', str_decode=True,
-                    group=None):
+                    group=None, compression=None):
         """
         Add dataset to h5_file
 
@@ -736,6 +966,9 @@ class Outputs(Resource):
             Attributes to be set. May include 'scale_factor'.
         dtype : str
             Intended dataset datatype after scaling.
+        chunks : tuple | str
+            Chunk size for the dataset or an access pattern to auto-tune the
+            chunks for
         unscale : bool
             Boolean flag to automatically unscale variables on extraction
         mode : str
@@ -745,6 +978,8 @@ class Outputs(Resource):
             strings. Setting this to False will speed up the meta data read.
         group : str
             Group within .h5 resource file to open
+        compression : str | None
+            Compression filter ("gzip" or "lzf"), None for no compression.
         """
         logger.info("Adding {} to {}".format(dset_name, h5_file))
         ts = time.time()
@@ -752,7 +987,7 @@ class Outputs(Resource):
                   "group": group}
         with cls(h5_file, **kwargs) as f:
             f._add_dset(dset_name, dset_data, dtype,
-                        chunks=chunks, attrs=attrs)
+                        chunks=chunks, attrs=attrs, compression=compression)
 
         tt = (time.time() - ts) / 60
         logger.info('{} added'.format(dset_name))
@@ -762,7 +997,8 @@ class Outputs(Resource):
     @classmethod
     def init_h5(cls, h5_file, dsets, shapes, attrs, chunks, dtypes,
                 meta, time_index=None, configs=None, unscale=True, mode='w',
-                str_decode=True, group=None, run_attrs=None):
+                str_decode=True, group=None, run_attrs=None,
+                compression=None):
         """Init a full output file with the final intended shape without data.
 
         Parameters
@@ -777,7 +1013,8 @@ class Outputs(Resource):
         attrs : dict
             Dictionary of dataset attributes (keys correspond to dsets).
         chunks : dict
-            Dictionary of chunk tuples (keys correspond to dsets).
+            Dictionary of chunk tuples or access patterns to auto-tune the
+            chunks for (keys correspond to dsets).
         dtypes : dict
             dictionary of numpy datatypes (keys correspond to dsets).
         meta : pd.DataFrame
@@ -799,7 +1036,13 @@ class Outputs(Resource):
         run_attrs : dict | NoneType
             Runtime attributes (args, kwargs) to add as global (file)
             attributes
+        compression : str | dict | None
+            Compression filter ("gzip" or "lzf") for all dsets or a
+            dictionary of filters (keys correspond to dsets). None for no
+            compression.
         """
+        if not isinstance(compression, dict):
+            compression = {dset: compression for dset in dsets}
 
         logger.debug("Initializing output file: {}".format(h5_file))
         kwargs = {"unscale": unscale, "mode": mode, "str_decode": str_decode,
@@ -817,7 +1060,8 @@ class Outputs(Resource):
                 if dset not in ('meta', 'time_index'):
                     # initialize each dset to disk
                     f._create_dset(dset, shapes[dset], dtypes[dset],
-                                   chunks=chunks[dset], attrs=attrs[dset])
+                                   chunks=chunks[dset], attrs=attrs[dset],
+                                   compression=compression.get(dset))
 
             if configs is not None:
                 f.set_configs(configs)
@@ -2,6 +2,7 @@
 """
 Module to handle Supply Curve Transmission features
 """
+import h5py
 import json
 import logging
 import numpy as np
@@ -20,7 +21,28 @@ logger = logging.getLogger(__name__)
 class TransmissionFeatures:
     """
     Class to handle Supply Curve Transmission features
+
+    Features are stored as arrays indexed by feature position: gids, type
+    codes, and available capacities. Substations have a compressed sparse row
+    (CSR) adjacency to the positions of their transmission lines. Feature gids
+    are mapped to positions with a dense lookup array, or with a binary
+    search of the sorted gids when the gids are sparse.
+
+    Indexing a feature by gid returns a new read-only summary dict of the
+    feature. Changes to the dict are not applied to the features, use
+    connect() to update feature capacities.
     """
+
+    FEATURE_TYPES = ('transline', 'substation', 'loadcen', 'pcaloadcen')
+    FEATURE_COLUMNS = ('trans_line_gid', 'category', 'ac_cap', 'trans_gids',
+                       'avail_cap')
+    COLUMNAR_EXT = ('.parquet', '.pq', '.feather', '.h5')
+    TRANSLINE, SUBSTATION, LOADCEN, PCALOADCEN = range(4)
+
+    # Max ratio of the largest feature gid to the number of features for a
+    # dense gid lookup array, sparser gids are binary searched
+    DENSE_INDEX_RATIO = 4
+
     def __init__(self, trans_table, line_tie_in_cost=14000, line_cost=3667,
                  station_tie_in_cost=0, center_tie_in_cost=0,
                  sink_tie_in_cost=14000, available_capacity=0.1,
@@ -29,8 +51,8 @@ class TransmissionFeatures:
         Parameters
         ----------
         trans_table : str | pandas.DataFrame
-            Path to .csv or .json or DataFrame containing supply curve
-            transmission mapping
+            Path to .csv, .json, .parquet, .feather, or .h5 or DataFrame
+            containing supply curve transmission mapping
         line_tie_in_cost : float
             Cost of connecting to a transmission line in $/MW
         line_cost : float
@@ -69,12 +91,30 @@ class TransmissionFeatures:
         self._sink_tie_in_cost = sink_tie_in_cost
         self._available_capacity_frac = available_capacity
 
-        self._features = self._get_features(trans_table)
-        self._check_feature_dependencies()
+        features = self._get_features(trans_table)
+        self._gids = features['gid']
+        self._types = features['type']
+        self._type_names = features['type_names']
+        self._avail_cap = features['avail_cap']
+        self._has_lines = features['has_lines']
+        self._lines_ptr = np.zeros(len(self._gids) + 1, dtype=np.int64)
+        self._lines_ptr[1:] = np.cumsum(features['line_counts'])
+
+        self._index = None
+        self._order = None
+        self._sorted_gids = None
+        n_index = int(1 + self._gids.max())
+        if n_index <= self.DENSE_INDEX_RATIO * len(self._gids):
+            self._index = np.full(n_index, -1, dtype=np.int64)
+            self._index[self._gids] = np.arange(len(self._gids))
+        else:
+            self._order = np.argsort(self._gids, kind='stable')
+            self._sorted_gids = self._gids[self._order]
 
-        self._feature_gid_list = list(self._features.keys())
-        self._available_mask = np.ones(
-            (int(1 + max(list(self._features.keys()))), ), dtype=bool)
+        self._check_feature_dependencies(features['line_gids'])
+        self._lines = self._get_indices(features['line_gids'])
+
+        self._available_mask = np.ones(len(self._gids), dtype=bool)
 
         self._line_limited = line_limited
 
@@ -83,15 +123,87 @@ class TransmissionFeatures:
         return msg
 
     def __len__(self):
-        return len(self._features)
+        return len(self._gids)
 
     def __getitem__(self, gid):
-        if gid not in self._features:
+        i = self._get_index(gid)
+        feature = {'type': self._type_names[self._types[i]]}
+        if self._has_lines[i]:
+            feature['lines'] = self._gids[self._get_lines(i)].tolist()
+        else:
+            feature['avail_cap'] = self._get_avail_cap(i)
+
+        return feature
+
+    def _get_index(self, gid):
+        """Get the array position of a feature gid.
+
+        Parameters
+        ----------
+        gid : int
+            Feature gid
+
+        Returns
+        -------
+        i : int
+            Position of the feature in the feature arrays.
+        """
+        try:
+            i = -1
+            if gid == int(gid):
+                gid = int(gid)
+                if self._index is not None:
+                    if 0 <= gid < len(self._index):
+                        i = self._index[gid]
+                else:
+                    j = np.searchsorted(self._sorted_gids, gid)
+                    if (j < len(self._sorted_gids)
+                            and self._sorted_gids[j] == gid):
+                        i = self._order[j]
+        except (TypeError, ValueError):
+            i = -1
+
+        if i < 0:
             msg = "Invalid feature gid {}".format(gid)
             logger.error(msg)
             raise HandlerKeyError(msg)
 
-        return self._features[gid]
+        return i
+
+    def _get_lines(self, i):
+        """Get the positions of the transmission lines attached to a
+        substation.
+
+        Parameters
+        ----------
+        i : int
+            Position of the substation in the feature arrays.
+
+        Returns
+        -------
+        lines : np.ndarray
+            Positions of the attached transmission lines.
+        """
+        return self._lines[self._lines_ptr[i]:self._lines_ptr[i + 1]]
+
+    def _get_avail_cap(self, i):
+        """Get the stored available capacity of a feature.
+
+        Parameters
+        ----------
+        i : int
+            Position of the feature in the feature arrays.
+
+        Returns
+        -------
+        avail_cap : float | None
+            Available capacity, None if the feature capacity is unlimited.
+        """
+        avail_cap = self._avail_cap[i]
+        if np.isnan(avail_cap):
+            return None
+
+        return float(avail_cap)
 
     @staticmethod
     def _parse_dictionary(features):
@@ -127,7 +239,106 @@ class TransmissionFeatures:
         return features
 
     @staticmethod
-    def _parse_table(trans_table):
+    def _project_columns(names, columns=None):
+        """
+        Get the table columns to read from a columnar file.
+
+        Parameters
+        ----------
+        names : list
+            Column names available in the file
+        columns : list | tuple | callable | None
+            Columns to read if present in the file, or a callable that
+            returns True for the column names to read. None reads all
+            columns.
+
+        Returns
+        -------
+        names : list
+            Column names to read from the file, in file order
+        """
+        if columns is None:
+            names = list(names)
+        elif callable(columns):
+            names = [c for c in names if columns(c)]
+        else:
+            names = [c for c in names if c in columns]
+
+        return names
+
+    @staticmethod
+    def _read_h5_table(fpath, columns=None):
+        """
+        Read a table stored as one 1D dataset per column in the root of an
+        .h5 file. Byte string columns are decoded.
+
+        Parameters
+        ----------
+        fpath : str
+            Path to .h5 file containing the table columns
+        columns : list | tuple | callable | None
+            Columns to read if present in the file, see _project_columns()
+
+        Returns
+        -------
+        table : pandas.DataFrame
+            DataFrame of the requested table columns
+        """
+        table = {}
+        with h5py.File(fpath, 'r') as f:
+            names = TransmissionFeatures._project_columns(list(f), columns)
+            for name in names:
+                if isinstance(f[name], h5py.Dataset):
+                    values = f[name][...]
+                    if values.dtype.kind == 'S':
+                        values = np.char.decode(values, 'utf-8')
+                    elif values.dtype == np.dtype(object):
+                        values = np.array([v.decode('utf-8')
+                                           if isinstance(v, bytes) else v
+                                           for v in values], dtype=object)
+
+                    table[name] = values
+
+        return pd.DataFrame(table)
+
+    @staticmethod
+    def _read_columnar_table(fpath, columns=None):
+        """
+        Read a transmission table from a columnar .parquet, .feather, or .h5
+        file, only reading the requested columns from disk.
+
+        Parameters
+        ----------
+        fpath : str
+            Path to .parquet, .pq, .feather, or .h5 file
+        columns : list | tuple | callable | None
+            Columns to read if present in the file, see _project_columns()
+
+        Returns
+        -------
+        table : pandas.DataFrame
+            DataFrame of the requested table columns
+        """
+        if fpath.endswith('.h5'):
+            return TransmissionFeatures._read_h5_table(fpath, columns=columns)
+
+        if fpath.endswith('.feather'):
+            import pyarrow.ipc
+            names = pyarrow.ipc.open_file(fpath).schema.names
+        else:
+            import pyarrow.parquet
+            names = pyarrow.parquet.read_schema(fpath).names
+
+        columns = TransmissionFeatures._project_columns(names, columns)
+        if fpath.endswith('.feather'):
+            table = pd.read_feather(fpath, columns=columns)
+        else:
+            table = pd.read_parquet(fpath, columns=columns)
+
+        return table
+
+    @staticmethod
+    def _parse_table(trans_table, columns=None):
         """
         Extract features and their capacity from supply curve transmission
         mapping table
@@ -135,7 +346,11 @@ class TransmissionFeatures:
         Parameters
         ----------
         trans_table : str | pandas.DataFrame
-            Path to .csv or .json containing supply curve transmission mapping
+            Path to .csv, .json, .parquet, .feather, or .h5 containing supply
+            curve transmission mapping
+        columns : list | tuple | callable | None
+            Columns to read from columnar (.parquet, .feather, or .h5) files
+            if present, see _project_columns(). None reads all columns.
 
         Returns
         -------
@@ -143,13 +358,58 @@ class TransmissionFeatures:
             DataFrame of transmission features
         """
         try:
-            trans_table = parse_table(trans_table)
+            if (isinstance(trans_table, str)
+                    and trans_table.endswith(
+                        TransmissionFeatures.COLUMNAR_EXT)):
+                trans_table = TransmissionFeatures._read_columnar_table(
+                    trans_table, columns=columns)
+            else:
+                trans_table = parse_table(trans_table)
         except ValueError as ex:
             logger.error(ex)
             raise
 
         return trans_table
 
+    @classmethod
+    def _parse_types(cls, gids, names, strict=True):
+        """Convert feature type names to integer type codes.
+
+        Parameters
+        ----------
+        gids : np.ndarray
+            Feature gids.
+        names : np.ndarray
+            Lower case feature type names.
+        strict : bool
+            Flag to raise an error for unrecognized feature types. If False,
+            unrecognized types are given new type codes.
+
+        Returns
+        -------
+        types : np.ndarray
+            Integer type codes indexing type_names.
+        type_names : list
+            Feature type names. The first entries are FEATURE_TYPES.
+        """
+        type_names = list(cls.FEATURE_TYPES)
+        codes = pd.Series(names).map({k: i for i, k in enumerate(type_names)})
+        unknown = codes.isnull().values
+        if unknown.any() and strict:
+            i = np.where(unknown)[0][0]
+            msg = ('Cannot not recognize feature type "{}" '
+                   'for trans gid {}!'.format(names[i], gids[i]))
+            logger.error(msg)
+            raise HandlerKeyError(msg)
+
+        if unknown.any():
+            extra = sorted(set(names[unknown].astype(str)))
+            type_names += extra
+            codes = pd.Series(names.astype(str)).map(
+                {k: i for i, k in enumerate(type_names)})
+
+        return codes.values.astype(np.int8), type_names
+
     def _features_from_table(self, trans_table):
         """
         Extract features and their capacity from supply curve transmission
@@ -163,78 +423,114 @@ class TransmissionFeatures:
         Returns
         -------
         features : dict
-            Nested dictionary of features (lines, substations, loadcenters)
-            lines : {capacity}
-            substations : {lines}
-            loadcenters : {capacity}
+            Dictionary of feature arrays ordered by gid: "gid", "type" (codes
+            indexing "type_names"), "avail_cap" (NaN for substations and
+            unlimited capacity), "has_lines" (substations), "line_counts"
+            (number of lines attached to each feature) and "line_gids"
+            (flattened gids of the attached lines).
         """
 
-        features = {}
-
         cap_frac = self._available_capacity_frac
-        trans_features = trans_table.groupby('trans_line_gid').first()
-
-        for gid, feature in trans_features.iterrows():
-            name = feature['category'].lower()
-            feature_dict = {'type': name}
-
-            if name == 'transline':
-                feature_dict['avail_cap'] = feature['ac_cap'] * cap_frac
-
-            elif name == 'substation':
-                feature_dict['lines'] = json.loads(feature['trans_gids'])
-
-            elif name == 'loadcen':
-                feature_dict['avail_cap'] = feature['ac_cap'] * cap_frac
-
-            elif name == 'pcaloadcen':
-                feature_dict['avail_cap'] = None
-
-            else:
-                msg = ('Cannot not recognize feature type "{}" '
-                       'for trans gid {}!'.format(name, gid))
-                logger.error(msg)
-                raise HandlerKeyError(msg)
-
-            features[gid] = feature_dict
+        cols = [c for c in ('category', 'ac_cap', 'trans_gids')
+                if c in trans_table]
+        trans_features = trans_table.groupby('trans_line_gid')[cols].first()
+
+        gids = trans_features.index.values.astype(np.int64)
+        names = trans_features['category'].str.lower().values
+        types, type_names = self._parse_types(gids, names)
+
+        avail_cap = np.full(len(gids), np.nan)
+        mask = (types == self.TRANSLINE) | (types == self.LOADCEN)
+        if mask.any():
+            ac_cap = trans_features['ac_cap'].values[mask].astype(np.float64)
+            avail_cap[mask] = ac_cap * cap_frac
+
+        has_lines = types == self.SUBSTATION
+        lines = []
+        if has_lines.any():
+            trans_gids = trans_features['trans_gids'].values[has_lines]
+            lines = json.loads('[{}]'.format(','.join(trans_gids)))
+
+        line_counts = np.zeros(len(gids), dtype=np.int64)
+        line_counts[has_lines] = [len(line_gids) for line_gids in lines]
+        line_gids = np.array([gid for line_gids in lines for gid in line_gids],
+                             dtype=np.int64)
+
+        features = {'gid': gids, 'type': types, 'type_names': type_names,
+                    'avail_cap': avail_cap, 'has_lines': has_lines,
+                    'line_counts': line_counts, 'line_gids': line_gids}
 
         return features
 
     def _get_features(self, trans_table):
         """
-        Create transmission features dictionary either from supply curve
-        transmission mapping or from pre-created dictionary
+        Create transmission features arrays from supply curve transmission
+        mapping
 
         Parameters
         ----------
-        trans_table : str
-            Path to .csv or .json containing supply curve transmission mapping
+        trans_table : str | pandas.DataFrame
+            Path to .csv, .json, .parquet, .feather, or .h5 or DataFrame
+            containing supply curve transmission mapping
 
         Returns
         -------
         features : dict
-            Nested dictionary of features (lines, substations, loadcenters)
-            lines : {capacity}
-            substations : {lines}
-            loadcenters : {capacity}
+            Dictionary of feature arrays, see _features_from_table()
         """
 
-        trans_table = self._parse_table(trans_table)
+        trans_table = self._parse_table(trans_table,
+                                        columns=self.FEATURE_COLUMNS)
         features = self._features_from_table(trans_table)
 
         return features
 
-    def _check_feature_dependencies(self):
-        """Check features for dependencies that are missing and raise error."""
-        missing = {}
-        for gid, feature_dict in self._features.items():
-            for line_gid in feature_dict.get('lines', []):
-                if line_gid not in self._features:
-                    if gid not in missing:
-                        missing[gid] = []
-                    missing[gid].append(line_gid)
-
-        if any(missing):
+    def _get_indices(self, gids):
+        """Get the array positions of an array of feature gids.
+
+        Parameters
+        ----------
+        gids : np.ndarray
+            Feature gids
+
+        Returns
+        -------
+        indices : np.ndarray
+            Positions of the features in the feature arrays, -1 for gids
+            that are not features.
+        """
+        gids = np.asarray(gids, dtype=np.int64)
+        indices = np.full(gids.shape, -1, dtype=np.int64)
+        if self._index is not None:
+            valid = (gids >= 0) & (gids < len(self._index))
+            indices[valid] = self._index[gids[valid]]
+        elif len(gids):
+            j = np.searchsorted(self._sorted_gids, gids)
+            j = np.minimum(j, len(self._sorted_gids) - 1)
+            found = self._sorted_gids[j] == gids
+            indices[found] = self._order[j[found]]
+
+        return indices
+
+    def _check_feature_dependencies(self, line_gids):
+        """Check features for dependencies that are missing and raise error.
+
+        Parameters
+        ----------
+        line_gids : np.ndarray
+            Flattened gids of the lines attached to each feature, ordered by
+            the CSR line pointer.
+        """
+        valid = self._get_indices(line_gids) >= 0
+        if not valid.all():
+            owners = np.searchsorted(self._lines_ptr,
+                                     np.arange(len(line_gids)),
+                                     side='right') - 1
+            missing = {}
+            for j in np.where(~valid)[0]:
+                gid = int(self._gids[owners[j]])
+                missing.setdefault(gid, []).append(int(line_gids[j]))
+
             emsg = ('Transmission feature table has {} parent features that '
                     'depend on missing lines. Missing dependencies: {}'
                     .format(len(missing), missing))
@@ -267,15 +563,14 @@ class TransmissionFeatures:
 
         return cost
 
-    def _substation_capacity(self, line_gids):
+    def _substation_capacity(self, lines):
         """
         Get capacity of a substation from its tranmission lines
 
         Parameters
         ----------
-        line_gids : list
-            List of transmission line gids connected to the substation
-
+        lines : np.ndarray
+            Positions of the transmission lines connected to the substation
 
         Returns
         -------
@@ -283,7 +578,7 @@ class TransmissionFeatures:
             Substation available capacity
         """
 
-        line_caps = [self[gid]['avail_cap'] for gid in line_gids]
+        line_caps = self._avail_cap[lines].tolist()
         avail_cap = sum(line_caps) / 2
 
         if self._line_limited:
@@ -293,6 +588,27 @@ class TransmissionFeatures:
 
         return avail_cap
 
+    def _available_capacity(self, i):
+        """
+        Get available capacity for the feature at a given position
+
+        Parameters
+        ----------
+        i : int
+            Position of the feature in the feature arrays.
+
+        Returns
+        -------
+        avail_cap : float | None
+            Available capacity, None if the feature capacity is unlimited.
+        """
+        if self._has_lines[i]:
+            avail_cap = self._substation_capacity(self._get_lines(i))
+        else:
+            avail_cap = self._get_avail_cap(i)
+
+        return avail_cap
+
     def available_capacity(self, gid):
         """
         Get available capacity for given line
@@ -309,34 +625,20 @@ class TransmissionFeatures:
             default = 10%
         """
 
-        feature = self[gid]
+        return self._available_capacity(self._get_index(gid))
 
-        if 'avail_cap' in feature:
-            avail_cap = feature['avail_cap']
-
-        elif 'lines' in feature:
-            avail_cap = self._substation_capacity(feature['lines'])
-
-        else:
-            msg = ('Could not parse available capacity from feature: {}'
-                   .format(feature))
-            logger.error(msg)
-            raise HandlerRuntimeError(msg)
-
-        return avail_cap
-
-    def _update_availability(self, gid):
+    def _update_availability(self, i):
         """
         Check features available capacity, if its 0 update _available_mask
 
         Parameters
         ----------
-        gid : list
-            Feature gid to check
+        i : int
+            Position of the feature to check in the feature arrays.
         """
-        avail_cap = self.available_capacity(gid)
+        avail_cap = self._available_capacity(i)
         if avail_cap == 0:
-            self._available_mask[gid] = False
+            self._available_mask[i] = False
 
     def check_availability(self, gid):
         """
@@ -352,42 +654,46 @@ class TransmissionFeatures:
         bool
             Whether the gid is available or not
         """
-        return self._available_mask[gid]
+        return self._available_mask[self._get_index(gid)]
 
-    def _connect(self, gid, capacity):
+    def _connect(self, lines, capacity):
         """
-        Connect to a standalone transmission feature (not a substation)
-        and decrement the feature's available capacity.
+        Connect to standalone transmission features (not substations)
+        and decrement the features' available capacity.
         Raise exception if not able to connect.
 
         Parameters
         ----------
-        gid : int
-            Feature gid to connect to
-        capacity : float
-            Capacity needed in MW
+        lines : int | np.ndarray
+            Position(s) of the features to connect to
+        capacity : float | np.ndarray
+            Capacity needed in MW for each feature
         """
-        avail_cap = self[gid]['avail_cap']
+        lines = np.atleast_1d(lines)
+        capacity = np.broadcast_to(capacity, lines.shape)
+        avail_cap = self._avail_cap[lines]
 
-        if avail_cap < capacity:
+        bad = avail_cap < capacity
+        if bad.any():
+            j = np.argmax(bad)
             msg = ("Cannot connect to {}: "
                    "needed capacity({} MW) > "
                    "available capacity({} MW)"
-                   .format(gid, capacity, avail_cap))
+                   .format(self._gids[lines[j]], capacity[j], avail_cap[j]))
             logger.error(msg)
             raise RuntimeError(msg)
 
-        self[gid]['avail_cap'] -= capacity
+        np.subtract.at(self._avail_cap, lines, capacity)
 
-    def _fill_lines(self, line_gids, line_caps, capacity):
+    def _fill_lines(self, lines, line_caps, capacity):
         """
         Fill any lines that cannot handle equal portion of capacity and
         remove from lines to be filled and capacity needed
 
         Parameters
         ----------
-        line_gids : ndarray
-            Vector of transmission line gids connected to the substation
+        lines : ndarray
+            Positions of transmission lines connected to the substation
         line_caps : ndarray
             Vector of available capacity of the transmission lines
         capacity : float
@@ -395,72 +701,65 @@ class TransmissionFeatures:
 
         Returns
         ----------
-        line_gids : ndarray
+        lines : ndarray
             Transmission lines with available capacity
         line_caps : ndarray
             Capacity of lines with available capacity
         capacity : float
             Updated capacity needed to be applied to substation in MW
         """
-        apply_cap = capacity / len(line_gids)
+        apply_cap = capacity / len(lines)
         mask = line_caps < apply_cap
-        for pos in np.where(line_caps < apply_cap)[0]:
-            gid = line_gids[pos]
-            apply_cap = line_caps[pos]
-            self._connect(gid, apply_cap)
-            capacity -= apply_cap
+        if mask.any():
+            self._connect(lines[mask], line_caps[mask])
+            for apply_cap in line_caps[mask].tolist():
+                capacity -= apply_cap
 
-        return line_gids[~mask], line_caps[~mask], capacity
+        return lines[~mask], line_caps[~mask], capacity
 
-    def _spread_substation_load(self, line_gids, line_caps, capacity):
+    def _spread_substation_load(self, lines, line_caps, capacity):
         """
         Spread needed capacity over all lines connected to substation
 
         Parameters
         ----------
-        line_gids : ndarray
-            Vector of transmission line gids connected to the substation
+        lines : ndarray
+            Positions of transmission lines connected to the substation
         line_caps : ndarray
             Vector of available capacity of the transmission lines
         capacity : float
             Capacity needed to be applied to substation in MW
         """
         while True:
-            lines, line_caps, capacity = self._fill_lines(line_gids, line_caps,
-                                                          capacity)
-            if len(lines) < len(line_gids):
-                line_gids = lines
+            open_lines, line_caps, capacity = self._fill_lines(lines,
+                                                               line_caps,
+                                                               capacity)
+            if len(open_lines) < len(lines):
+                lines = open_lines
             else:
                 break
 
-        apply_cap = capacity / len(lines)
-        for gid in lines:
-            self._connect(gid, apply_cap)
+        apply_cap = capacity / len(open_lines)
+        self._connect(open_lines, apply_cap)
 
-    def _connect_to_substation(self, line_gids, capacity):
+    def _connect_to_substation(self, lines, capacity):
         """
-        Connect to substation and update internal dictionary accordingly
+        Connect to substation and update internal arrays accordingly
 
         Parameters
         ----------
-        line_gids : list
-            List of transmission line gids connected to the substation
+        lines : np.ndarray
+            Positions of transmission lines connected to the substation
         capacity : float
             Capacity needed in MW
-        line_lmited : bool
-            Substation connection is limited by maximum capacity of the
-            attached lines
         """
-        line_caps = np.array([self[gid]['avail_cap']
-                              for gid in line_gids])
+        line_caps = self._avail_cap[lines]
         if self._line_limited:
-            gid = line_gids[np.argmax(line_caps)]
-            self._connect(gid, capacity)
+            self._connect(lines[np.argmax(line_caps)], capacity)
         else:
             non_zero = np.nonzero(line_caps)[0]
-            line_gids = np.array([line_gids[i] for i in non_zero])
-            line_caps = line_caps[non_zero]
-            self._spread_substation_load(line_gids, line_caps, capacity)
+            self._spread_substation_load(lines[non_zero], line_caps[non_zero],
+                                         capacity)
 
     def connect(self, gid, capacity, apply=True):
         """
@@ -483,22 +782,21 @@ class TransmissionFeatures:
             Flag as to whether connection is possible or not
         """
         if self.check_availability(gid):
-            avail_cap = self.available_capacity(gid)
+            i = self._get_index(gid)
+            avail_cap = self._available_capacity(i)
             if avail_cap is not None and capacity > avail_cap:
                 connected = False
             else:
                 connected = True
                 if apply:
-                    feature_type = self[gid]['type']
-                    if feature_type == 'transline':
-                        self._connect(gid, capacity)
-                    elif feature_type == 'substation':
-                        lines = self[gid]['lines']
-                        self._connect_to_substation(lines, capacity)
-                    elif feature_type == 'loadcen':
-                        self._connect(gid, capacity)
-
-                    self._update_availability(gid)
+                    feature_type = self._types[i]
+                    if feature_type in (self.TRANSLINE, self.LOADCEN):
+                        self._connect(i, capacity)
+                    elif feature_type == self.SUBSTATION:
+                        self._connect_to_substation(self._get_lines(i),
+                                                    capacity)
+
+                    self._update_availability(i)
         else:
             connected = False
 
@@ -528,20 +826,20 @@ class TransmissionFeatures:
             Cost of transmission in $/MW, if None indicates connection is
             NOT possible
         """
-        feature_type = self[gid]['type']
+        feature_type = self._types[self._get_index(gid)]
         line_cost = self._line_cost
-        if feature_type == 'transline':
+        if feature_type == self.TRANSLINE:
             tie_in_cost = self._line_tie_in_cost
-        elif feature_type == 'substation':
+        elif feature_type == self.SUBSTATION:
             tie_in_cost = self._station_tie_in_cost
-        elif feature_type == 'loadcen':
+        elif feature_type == self.LOADCEN:
             tie_in_cost = self._center_tie_in_cost
-        elif feature_type == 'pcaloadcen':
+        elif feature_type == self.PCALOADCEN:
             tie_in_cost = self._sink_tie_in_cost
         else:
             tie_in_cost = 0
             msg = ("Do not recognize feature type {}, tie_in_cost set to 0"
-                   .format(feature_type))
+                   .format(self._type_names[feature_type]))
             logger.warning(msg)
             warn(msg, HandlerWarning)
 
@@ -585,15 +883,15 @@ class TransmissionFeatures:
         try:
             feature = cls(trans_table, available_capacity=available_capacity)
 
-            feature_cap = {}
-            for gid, _ in feature._features.items():
-                feature_cap[gid] = feature.available_capacity(gid)
+            avail_cap = feature._avail_cap.copy()
+            for i in np.where(feature._has_lines)[0]:
+                avail_cap[i] = feature._available_capacity(i)
         except Exception:
             logger.exception("Error computing available capacity for all "
                              "features in {}".format(cls))
             raise
 
-        feature_cap = pd.Series(feature_cap)
+        feature_cap = pd.Series(avail_cap, index=feature._gids)
         feature_cap.name = 'avail_cap'
         feature_cap.index.name = 'trans_line_gid'
         feature_cap = feature_cap.to_frame().reset_index()
@@ -618,45 +916,71 @@ class TransmissionCosts(TransmissionFeatures):
         Returns
         -------
         features : dict
-            Nested dictionary of features (lines, substations, loadcenters)
-            lines : {capacity}
-            substations : {lines}
-            loadcenters : {capacity}
+            Dictionary of feature arrays ordered by gid: "gid", "type" (codes
+            indexing "type_names"), "avail_cap" (NaN for unlimited capacity),
+            "has_lines", "line_counts" and "line_gids" (no features have
+            attached lines).
         """
 
-        features = {}
-
         if 'avail_cap' not in trans_table:
             kwargs = {'available_capacity': self._available_capacity_frac}
             fc = TransmissionFeatures.feature_capacity(trans_table,
                                                        **kwargs)
             trans_table = trans_table.merge(fc, on='trans_line_gid')
 
-        trans_features = trans_table.groupby('trans_line_gid').first()
-        for gid, feature in trans_features.iterrows():
-            name = feature['category'].lower()
-            feature_dict = {'type': name, 'avail_cap': feature['avail_cap']}
-            features[gid] = feature_dict
+        cols = ['category', 'avail_cap']
+        trans_features = trans_table.groupby('trans_line_gid')[cols].first()
+
+        gids = trans_features.index.values.astype(np.int64)
+        names = trans_features['category'].str.lower().values
+        types, type_names = self._parse_types(gids, names, strict=False)
+
+        features = {'gid': gids, 'type': types, 'type_names': type_names,
+                    'avail_cap': trans_features['avail_cap'].values
+                    .astype(np.float64),
+                    'has_lines': np.zeros(len(gids), dtype=bool),
+                    'line_counts': np.zeros(len(gids), dtype=np.int64),
+                    'line_gids': np.zeros(0, dtype=np.int64)}
 
         return features
 
-    def available_capacity(self, gid):
-        """
-        Get available capacity for given line
+    @staticmethod
+    def _feature_arrays(trans_table, available_capacity=0.1):
+        """Get the feature type and available capacity of each row in the
+        transmission table.
 
         Parameters
         ----------
-        gid : int
-            Unique id of feature of interest
+        trans_table : pandas.DataFrame
+            DataFrame of supply curve transmission mapping
+        available_capacity : float
+            Fraction of capacity that is available for connection, only used
+            if trans_table does not already have an 'avail_cap' column.
 
         Returns
         -------
-        avail_cap : float
-            Available capacity = capacity * available fraction
-            default = 10%
+        feature_types : np.ndarray
+            Lower case feature type (category) of each row's transmission
+            feature.
+        avail_cap : np.ndarray
+            Float array of the available capacity of each row's transmission
+            feature, NaN if capacity is unlimited.
         """
 
-        return self[gid]['avail_cap']
+        if 'avail_cap' not in trans_table:
+            fc = TransmissionFeatures.feature_capacity(
+                trans_table, available_capacity=available_capacity)
+            trans_table = trans_table.merge(fc, on='trans_line_gid')
+
+        # features are defined by the first valid entry for each gid
+        cols = ['category', 'avail_cap']
+        features = trans_table.groupby('trans_line_gid')[cols].first()
+        pos = features.index.get_indexer(trans_table['trans_line_gid'])
+
+        feature_types = features['category'].str.lower().values[pos]
+        avail_cap = features['avail_cap'].values.astype(np.float64)[pos]
+
+        return feature_types, avail_cap
 
     @classmethod
     def feature_costs(cls, trans_table, capacity=None, line_tie_in_cost=14000,
@@ -666,13 +990,17 @@ class TransmissionCosts(TransmissionFeatures):
         """
         Compute costs for all connections in given transmission table
 
+        This is a vectorized equivalent of calling TransmissionCosts.cost()
+        for every row in the transmission table.
+
         Parameters
         ----------
         trans_table : str | pandas.DataFrame
             Path to .csv or .json containing supply curve transmission mapping
-        capacity : float
+        capacity : float | np.ndarray
             Capacity needed in MW, if None DO NOT check if connection is
-            possible
+            possible. Can be an array with the capacity needed for each row
+            in trans_table.
         line_tie_in_cost : float
             Cost of connecting to a transmission line in $/MW
         line_cost : float
@@ -688,7 +1016,8 @@ class TransmissionCosts(TransmissionFeatures):
             Fraction of capacity that is available for connection
         line_limited : bool
             Substation connection is limited by maximum capacity of the
-            attached lines, legacy method
+            attached lines, legacy method. This does not affect the cost or
+            the connection check without applying the connection.
 
         Returns
         -------
@@ -697,24 +1026,40 @@ class TransmissionCosts(TransmissionFeatures):
             NOT possible
         """
         try:
-            feature = cls(trans_table,
-                          line_tie_in_cost=line_tie_in_cost,
-                          line_cost=line_cost,
-                          station_tie_in_cost=station_tie_in_cost,
-                          center_tie_in_cost=center_tie_in_cost,
-                          sink_tie_in_cost=sink_tie_in_cost,
-                          available_capacity=available_capacity,
-                          line_limited=line_limited)
-
-            costs = []
-            for _, row in trans_table.iterrows():
-                tm = row.get('transmission_multiplier', 1)
-                costs.append(feature.cost(row['trans_line_gid'],
-                                          row['dist_mi'], capacity=capacity,
-                                          transmission_multiplier=tm))
+            trans_table = cls._parse_table(trans_table)
+            feature_types, avail_cap = cls._feature_arrays(
+                trans_table, available_capacity=available_capacity)
+
+            tie_in_costs = {'transline': line_tie_in_cost,
+                            'substation': station_tie_in_cost,
+                            'loadcen': center_tie_in_cost,
+                            'pcaloadcen': sink_tie_in_cost}
+            tie_in_cost = pd.Series(feature_types).map(tie_in_costs)
+            unknown = tie_in_cost.isnull().values
+            if unknown.any():
+                unknown = np.unique(feature_types[unknown].astype(str))
+                msg = ("Do not recognize feature type(s) {}, tie_in_cost set "
+                       "to 0".format(unknown.tolist()))
+                logger.warning(msg)
+                warn(msg, HandlerWarning)
+
+            tie_in_cost = tie_in_cost.fillna(0).values.astype(np.float64)
+            tm = 1
+            if 'transmission_multiplier' in trans_table:
+                tm = trans_table['transmission_multiplier'].values
+
+            costs = cls._calc_cost(trans_table['dist_mi'].values,
+                                   line_cost=line_cost,
+                                   tie_in_cost=tie_in_cost,
+                                   transmission_multiplier=tm)
+            costs = np.array(costs, dtype=np.float64)
+            if capacity is not None:
+                with np.errstate(invalid='ignore'):
+                    costs[np.asarray(capacity) > avail_cap] = np.nan
+
         except Exception:
             logger.exception("Error computing costs for all connections in {}"
                              .format(cls))
             raise
 
-        return np.array(costs, dtype='float32')
+        return costs.astype('float32')
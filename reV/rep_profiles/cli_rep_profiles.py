@@ -13,7 +13,7 @@ from reV.pipeline.status import Status
 from reV.rep_profiles.rep_profiles import RepProfiles, AggregatedRepProfiles
 
 from rex.utilities.hpc import SLURM
-from rex.utilities.cli_dtypes import STR, INT, STRLIST
+from rex.utilities.cli_dtypes import STR, INT, FLOAT, STRLIST
 from rex.utilities.loggers import init_mult
 from rex.utilities.utilities import get_class_properties
 
@@ -115,6 +115,7 @@ def from_config(ctx, config_file, verbose):
                            log_dir=config.logdir,
                            n_profiles=config.n_profiles,
                            max_workers=config.execution_control.max_workers,
+                           max_region_mem=config.max_region_mem,
                            aggregate_profiles=config.aggregate_profiles,
                            verbose=verbose)
 
@@ -131,6 +132,7 @@ def from_config(ctx, config_file, verbose):
             ctx.obj['OUT_DIR'] = config.dirout
             ctx.obj['LOG_DIR'] = config.logdir
             ctx.obj['MAX_WORKERS'] = config.execution_control.max_workers
+            ctx.obj['MAX_REGION_MEM'] = config.max_region_mem
             ctx.obj['AGGREGATE_PROFILES'] = config.aggregate_profiles
             ctx.obj['VERBOSE'] = verbose
 
@@ -172,6 +174,11 @@ def from_config(ctx, config_file, verbose):
 @click.option('--max_workers', '-mw', type=INT, default=None,
               help='Number of parallel workers. 1 will run in serial. '
               'None will use all available.')
+@click.option('--max_region_mem', '-mrm', type=FLOAT, default=1.0,
+              help='Maximum memory in GB for the error temporaries of a '
+              'single region in serial, or for each streamed time block in '
+              'parallel. None will never chunk the error calculation. '
+              'Default is 1.0')
 @click.option('-agg', '--aggregate_profiles', is_flag=True,
               help='Flag to calculate the aggregate (weighted meanoid) '
               'profile for each supply curve point. This behavior is instead '
@@ -182,7 +189,7 @@ def from_config(ctx, config_file, verbose):
 @click.pass_context
 def direct(ctx, gen_fpath, rev_summary, reg_cols, cf_dset, rep_method,
            err_method, weight, n_profiles, out_dir, log_dir, max_workers,
-           aggregate_profiles, verbose):
+           max_region_mem, aggregate_profiles, verbose):
     """reV representative profiles CLI."""
     name = ctx.obj['NAME']
     ctx.obj['GEN_FPATH'] = gen_fpath
@@ -196,6 +203,7 @@ def direct(ctx, gen_fpath, rev_summary, reg_cols, cf_dset, rep_method,
     ctx.obj['OUT_DIR'] = out_dir
     ctx.obj['LOG_DIR'] = log_dir
     ctx.obj['MAX_WORKERS'] = max_workers
+    ctx.obj['MAX_REGION_MEM'] = max_region_mem
     ctx.obj['AGGREGATE_PROFILES'] = aggregate_profiles
     ctx.obj['VERBOSE'] = verbose
 
@@ -215,7 +223,8 @@ def direct(ctx, gen_fpath, rev_summary, reg_cols, cf_dset, rep_method,
             RepProfiles.run(gen_fpath, rev_summary, reg_cols, cf_dset=cf_dset,
                             rep_method=rep_method, err_method=err_method,
                             weight=weight, fout=fout, n_profiles=n_profiles,
-                            max_workers=max_workers)
+                            max_workers=max_workers,
+                            max_region_mem=max_region_mem)
 
         runtime = (time.time() - t0) / 60
         logger.info('reV representative profiles complete. '
@@ -231,7 +240,7 @@ def direct(ctx, gen_fpath, rev_summary, reg_cols, cf_dset, rep_method,
 
 def get_node_cmd(name, gen_fpath, rev_summary, reg_cols, cf_dset, rep_method,
                  err_method, weight, n_profiles, out_dir, log_dir, max_workers,
-                 aggregate_profiles, verbose):
+                 max_region_mem, aggregate_profiles, verbose):
     """Get a CLI call command for the rep profiles cli."""
 
     args = ['-g {}'.format(SLURM.s(gen_fpath)),
@@ -245,6 +254,7 @@ def get_node_cmd(name, gen_fpath, rev_summary, reg_cols, cf_dset, rep_method,
             '-od {}'.format(SLURM.s(out_dir)),
             '-ld {}'.format(SLURM.s(log_dir)),
             '-mw {}'.format(SLURM.s(max_workers)),
+            '-mrm {}'.format(SLURM.s(max_region_mem)),
             ]
 
     if aggregate_profiles:
@@ -294,6 +304,7 @@ def slurm(ctx, alloc, memory, walltime, feature, conda_env, module,
     out_dir = ctx.obj['OUT_DIR']
     log_dir = ctx.obj['LOG_DIR']
     max_workers = ctx.obj['MAX_WORKERS']
+    max_region_mem = ctx.obj['MAX_REGION_MEM']
     aggregate_profiles = ctx.obj['AGGREGATE_PROFILES']
     verbose = ctx.obj['VERBOSE']
 
@@ -302,8 +313,8 @@ def slurm(ctx, alloc, memory, walltime, feature, conda_env, module,
 
     cmd = get_node_cmd(name, gen_fpath, rev_summary, reg_cols, cf_dset,
                        rep_method, err_method, weight, n_profiles,
-                       out_dir, log_dir, max_workers, aggregate_profiles,
-                       verbose)
+                       out_dir, log_dir, max_workers, max_region_mem,
+                       aggregate_profiles, verbose)
 
     slurm_manager = ctx.obj.get('SLURM_MANAGER', None)
     if slurm_manager is None:
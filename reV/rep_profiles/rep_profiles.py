@@ -13,18 +13,19 @@ import logging
 import numpy as np
 import os
 import pandas as pd
-from scipy import stats
+from scipy import sparse, stats
 from warnings import warn
 
 
 from reV.handlers.outputs import Outputs
-from reV.utilities.exceptions import FileInputError, DataShapeError
+from reV.utilities.exceptions import (FileInputError, DataShapeError,
+                                      reVDeprecationWarning)
 
 from rex.rechunk_h5 import to_records_array
 from rex.resource import Resource
 from rex.utilities.execution import SpawnProcessPool
 from rex.utilities.utilities import parse_year
-from rex.utilities.loggers import log_mem
+from rex.utilities.loggers import LOGGERS, log_mem
 
 logger = logging.getLogger(__name__)
 
@@ -105,6 +106,93 @@ class RepresentativeMethods:
         """
         return arr.argsort()[:(n + 1)][-1]
 
+    @staticmethod
+    def nsmallest(arr, n):
+        """Get the locations of the n smallest values in arr in ascending
+        order using a partial selection so that only the candidates for the
+        n smallest values are sorted.
+
+        Parameters
+        ----------
+        arr : np.ndarray
+            1D array.
+        n : int
+            Number of smallest values to locate.
+
+        Returns
+        -------
+        i : np.ndarray
+            Locations of the min(n, len(arr)) smallest values in arr in
+            ascending order. Ties are ordered by location and NaN values are
+            ordered last.
+        """
+        n = min(n, len(arr))
+        candidates = np.arange(len(arr))
+        if 0 < n < len(arr):
+            kth = arr[np.argpartition(arr, n - 1)[n - 1]]
+            if not np.isnan(kth):
+                candidates = np.where(arr <= kth)[0]
+
+        order = candidates[np.lexsort((candidates, arr[candidates]))]
+
+        return order[:n]
+
+    @staticmethod
+    def errors(profiles, baseline, err_method='rmse', chunk_size=None):
+        """Calculate the error of every profile vs. a baseline profile.
+
+        Parameters
+        ----------
+        profiles : np.ndarray
+            (time, sites) timeseries array of cf profile data.
+        baseline : np.ndarray
+            (time, 1) timeseries of the meanoid or medianoid to which
+            cf profiles should be compared.
+        err_method : str
+            Error method identifier: "mbe", "mae", or "rmse".
+        chunk_size : int | None
+            Number of sites to process at once. None will compute the error
+            of all sites at once. Otherwise, the differences are computed in
+            float32 site chunks and summed into a float64 accumulator so the
+            (time, sites) temporaries never exceed one chunk.
+
+        Returns
+        -------
+        err : np.ndarray
+            1D array of the error of each site's profile.
+        """
+        baseline = baseline.reshape((len(baseline), 1))
+
+        if chunk_size is None:
+            err = profiles - baseline
+            if err_method == 'mae':
+                err = np.abs(err)
+            elif err_method == 'rmse':
+                err **= 2
+
+            err = np.mean(err, axis=0)
+
+        else:
+            err = np.zeros(profiles.shape[1], dtype=np.float64)
+            baseline = baseline.astype(np.float32)
+            for i0 in range(0, profiles.shape[1], chunk_size):
+                i1 = i0 + chunk_size
+                diff = profiles[:, i0:i1].astype(np.float32)
+                diff -= baseline
+                if err_method == 'mae':
+                    np.abs(diff, out=diff)
+                elif err_method == 'rmse':
+                    diff **= 2
+
+                err[i0:i1] = diff.sum(axis=0, dtype=np.float64)
+
+            err /= len(profiles)
+
+        if err_method == 'rmse':
+            err = np.sqrt(err)
+
+        return err
+
     @staticmethod
     def meanoid(profiles, weights=None):
         """Find the mean profile across all sites.
@@ -175,9 +263,8 @@ class RepresentativeMethods:
         i_rep : int
             Column Index in profiles of the representative profile.
         """
-        diff = profiles - baseline.reshape((len(baseline), 1))
-        mbe = diff.mean(axis=0)
-        i_rep = RepresentativeMethods.nargmin(mbe, i_profile)
+        mbe = RepresentativeMethods.errors(profiles, baseline, 'mbe')
+        i_rep = RepresentativeMethods.nsmallest(mbe, i_profile + 1)[-1]
 
         return profiles[:, i_rep], i_rep
 
@@ -203,9 +290,8 @@ class RepresentativeMethods:
         i_rep : int
             Column Index in profiles of the representative profile.
         """
-        diff = profiles - baseline.reshape((len(baseline), 1))
-        mae = np.abs(diff).mean(axis=0)
-        i_rep = RepresentativeMethods.nargmin(mae, i_profile)
+        mae = RepresentativeMethods.errors(profiles, baseline, 'mae')
+        i_rep = RepresentativeMethods.nsmallest(mae, i_profile + 1)[-1]
 
         return profiles[:, i_rep], i_rep
 
@@ -231,16 +317,14 @@ class RepresentativeMethods:
         i_rep : int
             Column Index in profiles of the representative profile.
         """
-        rmse = profiles - baseline.reshape((len(baseline), 1))
-        rmse **= 2
-        rmse = np.sqrt(np.mean(rmse, axis=0))
-        i_rep = RepresentativeMethods.nargmin(rmse, i_profile)
+        rmse = RepresentativeMethods.errors(profiles, baseline, 'rmse')
+        i_rep = RepresentativeMethods.nsmallest(rmse, i_profile + 1)[-1]
 
         return profiles[:, i_rep], i_rep
 
     @classmethod
     def run(cls, profiles, weights=None, rep_method='meanoid',
-            err_method='rmse', n_profiles=1):
+            err_method='rmse', n_profiles=1, max_mem=None):
         """Run representative profile methods.
 
         Parameters
@@ -256,6 +340,11 @@ class RepresentativeMethods:
             profile.
         n_profiles : int
             Number of representative profiles to save to fout.
+        max_mem : float | None
+            Maximum memory in GB for the (time, sites) error temporaries.
+            Profiles that would exceed this have their errors computed in
+            float32 site chunks bounded by max_mem. None will always compute
+            the errors of all sites at once.
 
         Returns
         -------
@@ -278,25 +367,46 @@ class RepresentativeMethods:
             i_reps = [None]
 
         else:
-            profiles = None
-            i_reps = []
-            for i in range(n_profiles):
-                p, ir = inst._err_method(inst._profiles, baseline, i_profile=i)
-                if profiles is None:
-                    profiles = np.zeros((len(p), n_profiles), dtype=p.dtype)
-
-                profiles[:, i] = p
-                i_reps.append(ir)
+            chunk_size = cls._get_chunk_size(inst._profiles.shape, max_mem)
+            err = cls.errors(inst._profiles, baseline, err_method=err_method,
+                             chunk_size=chunk_size)
+            order = cls.nsmallest(err, n_profiles)
+            i_reps = [order[min(i, len(order) - 1)]
+                      for i in range(n_profiles)]
+            profiles = inst._profiles[:, i_reps]
 
         return profiles, i_reps
 
+    @staticmethod
+    def _get_chunk_size(shape, max_mem):
+        """Get the site chunk size for the error calculation.
+
+        Parameters
+        ----------
+        shape : tuple
+            (time, sites) shape of the profiles array.
+        max_mem : float | None
+            Maximum memory in GB for the (time, sites) error temporaries.
+
+        Returns
+        -------
+        chunk_size : int | None
+            Number of sites to compute errors for at once, None if all
+            sites fit within max_mem as float64.
+        """
+        if max_mem is None or shape[0] * shape[1] * 8 <= max_mem * 1e9:
+            return None
+
+        return int(max(1, max_mem * 1e9 // (shape[0] * 4)))
+
 
 class RegionRepProfile:
     """Framework to handle rep profile for one resource region"""
 
     def __init__(self, gen_fpath, rev_summary, gid_col='gen_gids',
                  cf_dset='cf_profile', rep_method='meanoid', err_method='rmse',
-                 weight='gid_counts', n_profiles=1):
+                 weight='gid_counts', n_profiles=1, region_attrs=None,
+                 max_region_mem=1.0):
         """
         Parameters
         ----------
@@ -321,6 +431,14 @@ class RegionRepProfile:
             weight values corresponding to the gid_col in the same row.
         n_profiles : int
             Number of representative profiles to retrieve.
+        region_attrs : dict | None
+            Optional pre-parsed flat region data (e.g. from a RegionIndex)
+            keyed by column label. Columns not in this dict are parsed from
+            rev_summary.
+        max_region_mem : float | None
+            Maximum memory in GB for the error temporaries of a single
+            region. Larger regions automatically compute their errors in
+            float32 site chunks. None will never chunk.
         """
 
         self._gen_fpath = gen_fpath
@@ -335,6 +453,8 @@ class RegionRepProfile:
         self._err_method = err_method
         self._weight = weight
         self._n_profiles = n_profiles
+        self._region_attrs = dict(region_attrs or {})
+        self._max_region_mem = max_region_mem
 
     @property
     def source_profiles(self):
@@ -346,7 +466,7 @@ class RegionRepProfile:
             Timeseries array of cf profile data.
         """
         if self._source_profiles is None:
-            gen_gids = self._get_region_attr(self._rev_summary, self._gid_col)
+            gen_gids = self._region_attr(self._gid_col)
             with Resource(self._gen_fpath) as res:
                 self._source_profiles = res[self._cf_dset, :, gen_gids]
 
@@ -368,9 +488,7 @@ class RegionRepProfile:
             if self._weight is None:
                 self._weights = None
             else:
-                self._weights = self._get_region_attr(self._rev_summary,
-                                                      self._weight)
-                self._weights = np.array(self._weights)
+                self._weights = np.array(self._region_attr(self._weight))
 
         return self._weights
 
@@ -391,21 +509,46 @@ class RegionRepProfile:
         -------
         data : list
             Flat list of data from the column with label "attr_name".
-            Either a list of numbers or strings. Lists of jsonified lists
-            will be unpacked.
+            Either a list of numbers or strings. Lists of jsonified lists,
+            lists, or arrays will be unpacked.
         """
         data = rev_summary[attr_name].values.tolist()
 
-        if any(data):
+        if data and isinstance(data[0], np.ndarray):
+            data = np.concatenate(data).tolist()
+
+        elif any(data):
             if isinstance(data[0], str):
                 if ('[' and ']' in data[0]) or ('(' and ')' in data[0]):
-                    data = [json.loads(s) for s in data]
+                    # parse all jsonified lists at once into a nested list
+                    data = json.loads('[{}]'.format(','.join(data)))
 
             if isinstance(data[0], (list, tuple)):
                 data = [a for b in data for a in b]
 
         return data
 
+    def _region_attr(self, attr_name):
+        """Get flat region attribute data, parsing the rev summary column
+        at most once.
+
+        Parameters
+        ----------
+        attr_name : str
+            Column label to extract flattened data from (gen_gids,
+            gid_counts, etc...)
+
+        Returns
+        -------
+        data : list
+            Flat list of data from the column with label "attr_name".
+        """
+        if attr_name not in self._region_attrs:
+            self._region_attrs[attr_name] = self._get_region_attr(
+                self._rev_summary, attr_name)
+
+        return self._region_attrs[attr_name]
+
     def _run_rep_methods(self):
         """Run the representative profile methods to find the meanoid/medianoid
         profile and find the profiles most similar."""
@@ -417,8 +560,7 @@ class RegionRepProfile:
                      'profiles with shape {}.'
                      .format(self._weight, len(self.weights),
                              self._gid_col, self.source_profiles.shape))
-                gen_gids = self._get_region_attr(self._rev_summary,
-                                                 self._gid_col)
+                gen_gids = self._region_attr(self._gid_col)
                 logger.debug('Gids from column "{}" with len {}: {}'
                              .format(self._gid_col, len(gen_gids), gen_gids))
                 logger.debug('Weights from column "{}" with len {}: {}'
@@ -430,7 +572,7 @@ class RegionRepProfile:
         self._profiles, self._i_reps = RepresentativeMethods.run(
             self.source_profiles, weights=self.weights,
             rep_method=self._rep_method, err_method=self._err_method,
-            n_profiles=self._n_profiles)
+            n_profiles=self._n_profiles, max_mem=self._max_region_mem)
 
     @property
     def rep_profiles(self):
@@ -451,7 +593,7 @@ class RegionRepProfile:
     @property
     def rep_gen_gids(self):
         """Get the representative profile gen gids of this region."""
-        gids = self._get_region_attr(self._rev_summary, self._gid_col)
+        gids = self._region_attr(self._gid_col)
         if self.i_reps[0] is None:
             rep_gids = None
         else:
@@ -463,7 +605,7 @@ class RegionRepProfile:
     def rep_res_gids(self):
         """Get the representative profile resource gids of this region."""
         if self._gid_col == 'gen_gids':
-            gids = self._get_region_attr(self._rev_summary, 'res_gids')
+            gids = self._region_attr('res_gids')
         else:
             gids = None
 
@@ -478,7 +620,8 @@ class RegionRepProfile:
     def get_region_rep_profile(cls, gen_fpath, rev_summary, gid_col='gen_gids',
                                cf_dset='cf_profile', rep_method='meanoid',
                                err_method='rmse', weight='gid_counts',
-                               n_profiles=1):
+                               n_profiles=1, region_attrs=None,
+                               max_region_mem=1.0):
         """Class method for parallelization of rep profile calc.
 
         Parameters
@@ -504,6 +647,14 @@ class RegionRepProfile:
             weight values corresponding to the gid_col in the same row.
         n_profiles : int
             Number of representative profiles to retrieve.
+        region_attrs : dict | None
+            Optional pre-parsed flat region data (e.g. from a RegionIndex)
+            keyed by column label. Columns not in this dict are parsed from
+            rev_summary.
+        max_region_mem : float | None
+            Maximum memory in GB for the error temporaries of a single
+            region. Larger regions automatically compute their errors in
+            float32 site chunks. None will never chunk.
 
         Returns
         -------
@@ -518,11 +669,626 @@ class RegionRepProfile:
         """
         r = cls(gen_fpath, rev_summary, gid_col=gid_col, cf_dset=cf_dset,
                 rep_method=rep_method, err_method=err_method, weight=weight,
-                n_profiles=n_profiles)
+                n_profiles=n_profiles, region_attrs=region_attrs,
+                max_region_mem=max_region_mem)
 
         return r.rep_profiles, r.i_reps, r.rep_gen_gids, r.rep_res_gids
 
 
+class RegionProfileStream:
+    """Compute the representative profiles of many regions at once by
+    streaming contiguous time-block x site-chunk slabs of the generation
+    profile dataset.
+
+    Region membership is stored as flattened generation gids with a region
+    pointer array. Weighted meanoids for every region are computed with a
+    sparse (regions, sites) membership matrix and the per-site errors used
+    for the representative profile selection are accumulated from the same
+    in-memory time block, so the profile dataset is read once in large
+    contiguous slabs regardless of the number of regions.
+    """
+
+    # Target size in bytes of a single (time, sites) float32 block.
+    BLOCK_MEM = 5e8
+
+    REP_METHODS = ('mean', 'meanoid', 'median', 'medianoid')
+    ERR_METHODS = ('mbe', 'mae', 'rmse', None)
+
+    # Stream of a spawned worker process, set once per worker so that the
+    # parallel time block tasks only send their time slice
+    _WORKER_STREAM = None
+
+    def __init__(self, gen_fpath, gids, ptr, weights=None,
+                 cf_dset='cf_profile', rep_method='meanoid',
+                 err_method='rmse', n_profiles=1, time_chunk=None,
+                 site_chunk=10000, max_mem=None):
+        """
+        Parameters
+        ----------
+        gen_fpath : str
+            Filepath to reV gen output file to extract "cf_profile" from.
+        gids : np.ndarray | list
+            Flattened generation gids (data index in gen_fpath) of all
+            region members, ordered by region.
+        ptr : np.ndarray | list
+            Region pointer array of length n_regions + 1. The members of
+            region i are gids[ptr[i]:ptr[i + 1]].
+        weights : np.ndarray | list | None
+            Flattened weighting factors (multiplicative) corresponding to
+            gids. None will weight all members equally.
+        cf_dset : str
+            Dataset name to pull generation profiles from.
+        rep_method : str
+            Method identifier for calculation of the representative profile.
+        err_method : str | None
+            Method identifier for calculation of error from the representative
+            profile. None will return the meanoid/medianoid profiles.
+        n_profiles : int
+            Number of representative profiles to retrieve per region.
+        time_chunk : int | None
+            Number of timesteps to read per block. None will size blocks to
+            roughly BLOCK_MEM bytes or half of max_mem.
+        site_chunk : int
+            Maximum span of gids read in a single contiguous slab.
+        max_mem : float | None
+            Maximum memory in GB to process a single time block. Half is
+            used for the (time, sites) profile block and half bounds the
+            site_chunk of the slab reads and error temporaries. None will
+            use BLOCK_MEM for the profile block and the given site_chunk.
+        """
+        self._gen_fpath = gen_fpath
+        self._cf_dset = cf_dset
+        self._rep_method = self._check_method(rep_method, self.REP_METHODS)
+        self._err_method = self._check_method(err_method, self.ERR_METHODS)
+        self._n_profiles = n_profiles
+        self._site_chunk = int(site_chunk)
+
+        self._gids = np.asarray(gids, dtype=np.int64)
+        self._ptr = np.asarray(ptr, dtype=np.int64)
+        self._weights = weights
+        if weights is not None:
+            self._weights = np.asarray(weights, dtype=np.float64)
+            if len(self._weights) != len(self._gids):
+                e = ('Received {} weighting factors for {} region members.'
+                     .format(len(self._weights), len(self._gids)))
+                logger.error(e)
+                raise DataShapeError(e)
+
+        n_regions = len(self._ptr) - 1
+        self._regions = np.repeat(np.arange(n_regions, dtype=np.int64),
+                                  np.diff(self._ptr))
+        self._sites, self._cols = np.unique(self._gids, return_inverse=True)
+        self._membership, self._norm = self._get_membership()
+
+        with Resource(gen_fpath) as res:
+            self._n_time = res.get_dset_properties(cf_dset)[0][0]
+
+        block_mem = self.BLOCK_MEM
+        if max_mem is not None:
+            block_mem = max_mem * 1e9 / 2
+
+        if time_chunk is None:
+            time_chunk = block_mem / (4 * max(len(self._sites), 1))
+
+        self._time_chunk = int(np.clip(time_chunk, 1, max(self._n_time, 1)))
+
+        if max_mem is not None:
+            # float64 error temporaries of time_chunk x site_chunk members
+            max_chunk = int(max(1, block_mem // (8 * self._time_chunk)))
+            self._site_chunk = int(min(self._site_chunk, max_chunk))
+
+        self._site_groups = self._group_sites(self._sites, self._site_chunk)
+
+    @staticmethod
+    def _check_method(method, options):
+        """Check a method identifier against the available options.
+
+        Parameters
+        ----------
+        method : str | None
+            Method identifier.
+        options : tuple
+            Valid method identifiers.
+
+        Returns
+        -------
+        method : str | None
+            Method identifier with "mean"/"median" aliases resolved.
+        """
+        if method not in options:
+            e = ('Method "{}" not recognized, must be one of: {}'
+                 .format(method, options))
+            logger.error(e)
+            raise KeyError(e)
+
+        aliases = {'mean': 'meanoid', 'median': 'medianoid'}
+
+        return aliases.get(method, method)
+
+    @staticmethod
+    def _group_sites(sites, site_chunk):
+        """Split sorted unique sites into groups that each span at most
+        site_chunk gids so every group can be read as one contiguous slab.
+
+        Parameters
+        ----------
+        sites : np.ndarray
+            Sorted unique generation gids.
+        site_chunk : int
+            Maximum span of gids in a single group.
+
+        Returns
+        -------
+        groups : list
+            List of (start, stop) positions in sites.
+        """
+        groups = []
+        i0 = 0
+        while i0 < len(sites):
+            i1 = int(np.searchsorted(sites, sites[i0] + site_chunk))
+            groups.append((i0, i1))
+            i0 = i1
+
+        return groups
+
+    def _get_membership(self):
+        """Build the weighted sparse region membership matrix.
+
+        Returns
+        -------
+        membership : scipy.sparse.csr_matrix
+            (n_regions, n_sites) matrix of member weights.
+        norm : np.ndarray
+            Sum of member weights for each region.
+        """
+        weights = self._weights
+        if weights is None:
+            weights = np.ones(len(self._gids), dtype=np.float64)
+
+        shape = (len(self._ptr) - 1, len(self._sites))
+        membership = sparse.csr_matrix((weights, (self._regions, self._cols)),
+                                       shape=shape)
+        norm = np.bincount(self._regions, weights=weights,
+                           minlength=shape[0])
+
+        return membership, norm
+
+    @property
+    def time_slices(self):
+        """Get the contiguous time blocks to stream.
+
+        Returns
+        -------
+        list
+            List of time slices covering the full profile dataset.
+        """
+        return [slice(t0, min(t0 + self._time_chunk, self._n_time))
+                for t0 in range(0, self._n_time, self._time_chunk)]
+
+    def _read_block(self, res, time_slice, sites, groups):
+        """Read a (time, sites) block as a set of contiguous slabs.
+
+        Parameters
+        ----------
+        res : rex.Resource
+            Open generation file handler.
+        time_slice : slice
+            Time block to read.
+        sites : np.ndarray
+            Sorted unique generation gids to read.
+        groups : list
+            List of (start, stop) positions in sites to read as slabs.
+
+        Returns
+        -------
+        block : np.ndarray
+            (time, sites) float32 block of profile data.
+        """
+        n_time = time_slice.stop - time_slice.start
+        block = np.empty((n_time, len(sites)), dtype=np.float32)
+        for i0, i1 in groups:
+            s0 = sites[i0]
+            slab = res[self._cf_dset, time_slice, slice(s0, sites[i1 - 1] + 1)]
+            block[:, i0:i1] = slab[:, sites[i0:i1] - s0]
+
+        return block
+
+    def _baseline(self, block):
+        """Compute the meanoid/medianoid of every region for a time block.
+
+        Parameters
+        ----------
+        block : np.ndarray
+            (time, sites) block of profile data.
+
+        Returns
+        -------
+        baseline : np.ndarray
+            (time, n_regions) meanoid/medianoid profiles.
+        """
+        if self._rep_method == 'meanoid':
+            with np.errstate(divide='ignore', invalid='ignore'):
+                baseline = self._membership.dot(block.T).T / self._norm
+
+        else:
+            baseline = np.full((len(block), len(self._ptr) - 1), np.nan)
+            for i in range(len(self._ptr) - 1):
+                cols = self._cols[self._ptr[i]:self._ptr[i + 1]]
+                if len(cols):
+                    baseline[:, i] = np.median(block[:, cols], axis=1)
+
+        return baseline
+
+    def _errors(self, block, baseline):
+        """Accumulate the per-member error sums for a time block.
+
+        Parameters
+        ----------
+        block : np.ndarray
+            (time, sites) block of profile data.
+        baseline : np.ndarray
+            (time, n_regions) meanoid/medianoid profiles.
+
+        Returns
+        -------
+        err : np.ndarray
+            Sum over the time block of the error of each region member.
+        """
+        err = np.zeros(len(self._gids), dtype=np.float64)
+        for j0 in range(0, len(self._gids), self._site_chunk):
+            j1 = j0 + self._site_chunk
+            diff = (block[:, self._cols[j0:j1]]
+                    - baseline[:, self._regions[j0:j1]])
+            if self._err_method == 'mae':
+                np.abs(diff, out=diff)
+            elif self._err_method == 'rmse':
+                diff **= 2
+
+            err[j0:j1] = diff.sum(axis=0)
+
+        return err
+
+    def _run_block(self, time_slice):
+        """Compute the baselines and error sums for a single time block.
+
+        Parameters
+        ----------
+        time_slice : slice
+            Time block to process.
+
+        Returns
+        -------
+        baseline : np.ndarray | None
+            (time, n_regions) meanoid/medianoid profiles, only returned when
+            there is no error method.
+        err : np.ndarray | None
+            Per-member error sums, None when there is no error method.
+        """
+        with Resource(self._gen_fpath) as res:
+            block = self._read_block(res, time_slice, self._sites,
+                                     self._site_groups)
+
+        baseline = self._baseline(block)
+        if self._err_method is None:
+            return baseline.astype(np.float32), None
+
+        return None, self._errors(block, baseline)
+
+    @classmethod
+    def _init_worker(cls, stream, loggers=None):
+        """Initialize a spawned worker process with the stream to process.
+
+        Parameters
+        ----------
+        stream : RegionProfileStream
+            Stream to process time blocks for on this worker.
+        loggers : list | None
+            Logger names to initialize on this worker.
+        """
+        if loggers is not None:
+            LOGGERS.init_logger(loggers)
+
+        cls._WORKER_STREAM = stream
+
+    @classmethod
+    def _run_worker_block(cls, time_slice):
+        """Compute the baselines and error sums for a single time block with
+        the stream of this worker process.
+
+        Parameters
+        ----------
+        time_slice : slice
+            Time block to process.
+
+        Returns
+        -------
+        out : tuple
+            Output of RegionProfileStream._run_block
+        """
+        return cls._WORKER_STREAM._run_block(time_slice)
+
+    def _select(self, err):
+        """Select the representative members of each region.
+
+        Parameters
+        ----------
+        err : np.ndarray
+            Per-member error metric.
+
+        Returns
+        -------
+        i_reps : np.ndarray
+            (n_regions, n_profiles) array of member index within each region
+            of the representative profiles. -1 for empty regions.
+        """
+        i_reps = np.full((len(self._ptr) - 1, self._n_profiles), -1,
+                         dtype=np.int64)
+        for i in range(len(self._ptr) - 1):
+            region_err = err[self._ptr[i]:self._ptr[i + 1]]
+            if len(region_err):
+                order = RepresentativeMethods.nsmallest(region_err,
+                                                        self._n_profiles)
+                i_reps[i, :len(order)] = order
+                i_reps[i, len(order):] = order[-1]
+
+        return i_reps
+
+    def _gather(self, i_reps):
+        """Read the selected representative profiles.
+
+        Parameters
+        ----------
+        i_reps : np.ndarray
+            (n_regions, n_profiles) array of member index within each region
+            of the representative profiles. -1 for empty regions.
+
+        Returns
+        -------
+        profiles : list
+            List of n_profiles (time, n_regions) float32 arrays.
+        """
+        valid = i_reps >= 0
+        rep_gids = np.full(i_reps.shape, -1, dtype=np.int64)
+        members = (self._ptr[:-1, np.newaxis] + i_reps)[valid]
+        rep_gids[valid] = self._gids[members]
+
+        sites = np.unique(rep_gids[valid])
+        groups = self._group_sites(sites, self._site_chunk)
+        profiles = [np.zeros((self._n_time, len(i_reps)), dtype=np.float32)
+                    for _ in range(self._n_profiles)]
+        with Resource(self._gen_fpath) as res:
+            for time_slice in self.time_slices:
+                block = self._read_block(res, time_slice, sites, groups)
+                for n, arr in enumerate(profiles):
+                    regions = np.where(valid[:, n])[0]
+                    cols = np.searchsorted(sites, rep_gids[regions, n])
+                    arr[time_slice, regions] = block[:, cols]
+
+        return profiles
+
+    def run(self, max_workers=None):
+        """Stream the profile dataset and compute the representative
+        profiles of every region.
+
+        Parameters
+        ----------
+        max_workers : int | None
+            Number of parallel workers to process time blocks. 1 will run
+            serial, None will use all available.
+
+        Returns
+        -------
+        profiles : list
+            List of n_profiles (time, n_regions) float32 arrays for the most
+            representative profile(s) of each region.
+        i_reps : np.ndarray | None
+            (n_regions, n_profiles) array of member index within each region
+            of the representative profiles. -1 for empty regions. None if
+            there is no error method.
+        """
+        time_slices = self.time_slices
+        logger.info('Streaming {} time blocks of {} sites for {} regions.'
+                    .format(len(time_slices), len(self._sites),
+                            len(self._ptr) - 1))
+
+        err = np.zeros(len(self._gids), dtype=np.float64)
+        baseline = None
+        if self._err_method is None:
+            baseline = np.zeros((self._n_time, len(self._ptr) - 1),
+                                dtype=np.float32)
+
+        def _collect(time_slice, out):
+            """Add a processed time block to the running results."""
+            if baseline is not None:
+                baseline[time_slice] = out[0]
+            else:
+                err[:] += out[1]
+
+        if max_workers == 1:
+            for i, time_slice in enumerate(time_slices):
+                _collect(time_slice, self._run_block(time_slice))
+                logger.debug('Time block {} out of {} complete.'
+                             .format(i + 1, len(time_slices)))
+        else:
+            loggers = [__name__, 'reV']
+            with SpawnProcessPool(max_workers=max_workers,
+                                  initializer=self._init_worker,
+                                  initargs=(self, loggers)) as exe:
+                futures = {exe.submit(self._run_worker_block, time_slice):
+                           time_slice for time_slice in time_slices}
+                for i, future in enumerate(as_completed(futures)):
+                    _collect(futures[future], future.result())
+                    logger.debug('Time block {} out of {} complete.'
+                                 .format(i + 1, len(time_slices)))
+                    log_mem(logger, log_level='DEBUG')
+
+        if baseline is not None:
+            return [baseline], None
+
+        err /= self._n_time
+        if self._err_method == 'rmse':
+            np.sqrt(err, out=err)
+
+        i_reps = self._select(err)
+
+        return self._gather(i_reps), i_reps
+
+
+class RegionIndex:
+    """Precomputed region row index and flattened gid/weight store for a
+    reV supply curve summary table.
+
+    The table is grouped on the region columns once, mapping every region to
+    its row positions, and the per-row list columns (e.g. gen_gids,
+    gid_counts) are parsed once into flat arrays with a row pointer array.
+    Regions are then sliced from these arrays instead of masking and
+    re-parsing the full table for every region.
+    """
+
+    def __init__(self, rev_summary, reg_cols, columns):
+        """
+        Parameters
+        ----------
+        rev_summary : pd.DataFrame
+            Aggregated rev supply curve summary table.
+        reg_cols : list
+            Label(s) for the categorical region column(s). Regions are
+            numbered in the sorted groupby order of these columns.
+        columns : list
+            Column labels with per-row gid or weight data to parse and
+            flatten.
+        """
+        # rows with null region labels are in no group (NaN or -1)
+        group = rev_summary.groupby(reg_cols).ngroup()
+        group = group.fillna(-1).values.astype(np.int64)
+        self._n_regions = int(group.max() + 1) if len(group) else 0
+        self._row_order, self._row_ptr = self._group_rows(group,
+                                                          self._n_regions)
+        self._attrs = {c: self._flatten(rev_summary[c]) for c in columns
+                       if c is not None}
+
+    def __len__(self):
+        return self._n_regions
+
+    @property
+    def columns(self):
+        """Get the parsed column labels.
+
+        Returns
+        -------
+        list
+        """
+        return list(self._attrs)
+
+    @staticmethod
+    def _group_rows(group, n_regions):
+        """Get the row positions of every region.
+
+        Parameters
+        ----------
+        group : np.ndarray
+            Region number of every row, -1 for rows not in any region.
+        n_regions : int
+            Number of regions.
+
+        Returns
+        -------
+        order : np.ndarray
+            Row positions ordered by region then by row.
+        ptr : np.ndarray
+            Region pointer array. The rows of region i are
+            order[ptr[i]:ptr[i + 1]].
+        """
+        valid = np.where(group >= 0)[0]
+        order = valid[np.argsort(group[valid], kind='stable')]
+        ptr = np.zeros(n_regions + 1, dtype=np.int64)
+        ptr[1:] = np.cumsum(np.bincount(group[valid], minlength=n_regions))
+
+        return order, ptr
+
+    @staticmethod
+    def _flatten(data):
+        """Parse a column of per-row lists into a flat array.
+
+        Parameters
+        ----------
+        data : pd.Series
+            Column of jsonified lists, lists, arrays, or scalars.
+
+        Returns
+        -------
+        values : np.ndarray
+            Flat array of all row values.
+        ptr : np.ndarray
+            Row pointer array. The values of row i are
+            values[ptr[i]:ptr[i + 1]].
+        """
+        data = data.values.tolist()
+        if data and isinstance(data[0], str):
+            if (']' in data[0]) or (')' in data[0]):
+                data = json.loads('[{}]'.format(','.join(data)))
+
+        ptr = np.arange(len(data) + 1, dtype=np.int64)
+        if data and isinstance(data[0], (list, tuple, np.ndarray)):
+            ptr[1:] = np.cumsum([len(row) for row in data])
+            data = [a for b in data for a in b]
+
+        return np.array(data), ptr
+
+    def rows(self, i):
+        """Get the row positions of a region.
+
+        Parameters
+        ----------
+        i : int
+            Region number.
+
+        Returns
+        -------
+        np.ndarray
+            Row positions of the region in the summary table.
+        """
+        return self._row_order[self._row_ptr[i]:self._row_ptr[i + 1]]
+
+    def members(self, column, regions=None):
+        """Get the flattened column data for a set of regions.
+
+        Parameters
+        ----------
+        column : str
+            Parsed column label.
+        regions : list | np.ndarray | None
+            Region numbers. None will get all regions.
+
+        Returns
+        -------
+        values : np.ndarray
+            Flat column values ordered by region then by row.
+        ptr : np.ndarray
+            Region pointer array. The values of region regions[i] are
+            values[ptr[i]:ptr[i + 1]].
+        """
+        if regions is None:
+            regions = np.arange(self._n_regions)
+
+        regions = np.asarray(regions, dtype=np.int64)
+        rows = np.concatenate([np.zeros(0, dtype=np.int64)]
+                              + [self.rows(i) for i in regions])
+        n_rows = self._row_ptr[regions + 1] - self._row_ptr[regions]
+
+        values, row_ptr = self._attrs[column]
+        counts = row_ptr[rows + 1] - row_ptr[rows]
+        starts = np.repeat(row_ptr[rows] - np.cumsum(counts) + counts, counts)
+        values = values[starts + np.arange(counts.sum())]
+
+        row_regions = np.repeat(np.arange(len(regions)), n_rows)
+        ptr = np.zeros(len(regions) + 1, dtype=np.int64)
+        ptr[1:] = np.cumsum(np.bincount(row_regions, weights=counts,
+                                        minlength=len(regions)))
+
+        return values, ptr
+
+
 class RepProfilesBase(ABC):
     """Abstract utility framework for representative profile run classes."""
 
@@ -851,7 +1617,7 @@ class RepProfiles(RepProfilesBase):
     def __init__(self, gen_fpath, rev_summary, reg_cols, gid_col='gen_gids',
                  cf_dset='cf_profile', rep_method='meanoid',
                  err_method='rmse', weight='gid_counts',
-                 n_profiles=1):
+                 n_profiles=1, max_region_mem=1.0):
         """
         Parameters
         ----------
@@ -879,6 +1645,12 @@ class RepProfiles(RepProfilesBase):
             weight values corresponding to the gid_col in the same row.
         n_profiles : int
             Number of representative profiles to save to fout.
+        max_region_mem : float | None
+            Maximum memory in GB for the error temporaries of a single
+            region in serial, or for each streamed time block in parallel.
+            Larger regions automatically compute their errors in float32 site
+            chunks. None will never chunk the serial calculation and will use
+            the RegionProfileStream defaults in parallel.
         """
 
         logger.info('Finding representative profiles that are most similar '
@@ -900,9 +1672,17 @@ class RepProfiles(RepProfilesBase):
                          rep_method=rep_method, err_method=err_method,
                          weight=weight, n_profiles=n_profiles)
 
+        self._max_region_mem = max_region_mem
         self._set_meta()
         self._init_profiles()
 
+        attrs = [self._gid_col, self._weight]
+        if self._gid_col == 'gen_gids':
+            attrs.append('res_gids')
+
+        self._region_index = RegionIndex(self._rev_summary, self._reg_cols,
+                                         attrs)
+
     def _set_meta(self):
         """Set the rep profile meta data with each row being a unique
         combination of the region columns."""
@@ -914,29 +1694,21 @@ class RepProfiles(RepProfilesBase):
         self._meta['rep_gen_gid'] = None
         self._meta['rep_res_gid'] = None
 
-    def _get_mask(self, region_dict):
-        """Get the mask for a given region and res class.
+    def _get_region_attrs(self, i):
+        """Get the pre-parsed flat gid and weight data for a single region.
 
         Parameters
         ----------
-        region_dict : dict
-            Column-value pairs to filter the rev summary on.
+        i : int
+            Region index in meta.
 
         Returns
         -------
-        mask : np.ndarray
-            Boolean mask to filter rev_summary to the appropriate
-            region_dict values.
-        """
-        mask = None
-        for k, v in region_dict.items():
-            temp = (self._rev_summary[k] == v)
-            if mask is None:
-                mask = temp
-            else:
-                mask = (mask & temp)
-
-        return mask
+        region_attrs : dict
+            Flat lists of region data keyed by rev summary column label.
+        """
+        return {c: self._region_index.members(c, [i])[0].tolist()
+                for c in self._region_index.columns}
 
     def _run_serial(self):
         """Compute all representative profiles in serial."""
@@ -947,9 +1719,9 @@ class RepProfiles(RepProfilesBase):
         for i, row in meta_static.iterrows():
             region_dict = {k: v for (k, v) in row.to_dict().items()
                            if k in self._reg_cols}
-            mask = self._get_mask(region_dict)
+            rows = self._region_index.rows(i)
 
-            if not any(mask):
+            if not len(rows):
                 logger.warning('Skipping profile {} out of {} '
                                'for region: {} with no valid mask.'
                                .format(i + 1, len(meta_static), region_dict))
@@ -957,10 +1729,12 @@ class RepProfiles(RepProfilesBase):
                 logger.debug('Working on profile {} out of {} for region: {}'
                              .format(i + 1, len(meta_static), region_dict))
                 out = RegionRepProfile.get_region_rep_profile(
-                    self._gen_fpath, self._rev_summary[mask],
+                    self._gen_fpath, self._rev_summary.iloc[rows],
                     gid_col=self._gid_col, cf_dset=self._cf_dset,
                     rep_method=self._rep_method, err_method=self._err_method,
-                    weight=self._weight, n_profiles=self._n_profiles)
+                    weight=self._weight, n_profiles=self._n_profiles,
+                    region_attrs=self._get_region_attrs(i),
+                    max_region_mem=self._max_region_mem)
                 profiles, _, ggids, rgids = out
                 logger.info('Profile {} out of {} complete '
                             'for region: {}'
@@ -976,75 +1750,110 @@ class RepProfiles(RepProfilesBase):
                         self._meta.at[i, 'rep_gen_gid'] = str(ggids)
                         self._meta.at[i, 'rep_res_gid'] = str(rgids)
 
-    def _run_parallel(self, max_workers=None, pool_size=72):
-        """Compute all representative profiles in parallel.
+    def _get_region_members(self):
+        """Get the flattened generation gids, weights, and resource gids of
+        every region in meta from the region index.
+
+        Returns
+        -------
+        gids : list
+            Flattened generation gids of all region members ordered by the
+            regions in meta.
+        ptr : np.ndarray
+            Region pointer array. The members of region i are
+            gids[ptr[i]:ptr[i + 1]].
+        weights : np.ndarray | None
+            Flattened weighting factors corresponding to gids.
+        res_gids : list | None
+            Flattened resource gids corresponding to gids.
+        """
+        gids, ptr = self._region_index.members(self._gid_col)
+
+        weights = None
+        if self._weight is not None:
+            weights, w_ptr = self._region_index.members(self._weight)
+            bad = np.where(w_ptr != ptr)[0]
+            if len(bad):
+                i = bad[0] - 1
+                e = ('Weights column "{}" resulted in {} weight scalars '
+                     'which doesnt match gid column "{}" which yields '
+                     '{} gids for region: {}'
+                     .format(self._weight, w_ptr[i + 1] - w_ptr[i],
+                             self._gid_col, ptr[i + 1] - ptr[i],
+                             self.meta.loc[i, self._reg_cols].to_dict()))
+                logger.error(e)
+                raise DataShapeError(e)
+
+        res_gids = None
+        if self._gid_col == 'gen_gids':
+            res_gids = self._region_index.members('res_gids')[0].tolist()
+
+        return gids.tolist(), ptr, weights, res_gids
+
+    def _run_parallel(self, max_workers=None, time_chunk=None,
+                      site_chunk=10000, pool_size=None):
+        """Compute all representative profiles by streaming the generation
+        profiles in contiguous slabs, processing time blocks in parallel.
 
         Parameters
         ----------
         max_workers : int | None
             Number of parallel workers. 1 will run serial, None will use all
             available.
-        pool_size : int
-            Number of futures to submit to a single process pool for
-            parallel futures.
+        time_chunk : int | None
+            Number of timesteps to read per block. None will size blocks to
+            the RegionProfileStream memory target.
+        site_chunk : int
+            Maximum span of gids read in a single contiguous slab.
+        pool_size : int | None
+            Deprecated and ignored, regions are no longer submitted in
+            chunks of futures.
         """
+        if pool_size is not None:
+            msg = ('The RepProfiles pool_size input is deprecated and has no '
+                   'effect, time blocks are streamed with max_workers.')
+            logger.warning(msg)
+            warn(msg, reVDeprecationWarning)
 
-        logger.info('Kicking off {} rep profile futures.'
+        logger.info('Streaming rep profiles for {} regions.'
                     .format(len(self.meta)))
 
-        iter_chunks = np.array_split(self.meta.index.values,
-                                     np.ceil(len(self.meta) / pool_size))
-        n_complete = 0
-        for iter_chunk in iter_chunks:
-            logger.debug('Starting process pool...')
-            futures = {}
-            loggers = [__name__, 'reV']
-            with SpawnProcessPool(max_workers=max_workers,
-                                  loggers=loggers) as exe:
-                for i in iter_chunk:
-                    row = self.meta.loc[i, :]
-                    region_dict = {k: v for (k, v) in row.to_dict().items()
-                                   if k in self._reg_cols}
-
-                    mask = self._get_mask(region_dict)
-
-                    if not any(mask):
-                        logger.info('Skipping profile {} out of {} '
-                                    'for region: {} with no valid mask.'
-                                    .format(i + 1, len(self.meta),
-                                            region_dict))
-                    else:
-                        future = exe.submit(
-                            RegionRepProfile.get_region_rep_profile,
-                            self._gen_fpath, self._rev_summary[mask],
-                            gid_col=self._gid_col,
-                            cf_dset=self._cf_dset,
-                            rep_method=self._rep_method,
-                            err_method=self._err_method,
-                            weight=self._weight,
-                            n_profiles=self._n_profiles)
-
-                        futures[future] = [i, region_dict]
-
-                for future in as_completed(futures):
-                    i, region_dict = futures[future]
-                    profiles, _, ggids, rgids = future.result()
-                    n_complete += 1
-                    logger.info('Future {} out of {} complete '
-                                'for region: {}'
-                                .format(n_complete, len(self.meta),
-                                        region_dict))
-                    log_mem(logger, log_level='DEBUG')
-
-                    for n in range(profiles.shape[1]):
-                        self._profiles[n][:, i] = profiles[:, n]
-
-                    if len(ggids) == 1:
-                        self._meta.at[i, 'rep_gen_gid'] = ggids[0]
-                        self._meta.at[i, 'rep_res_gid'] = rgids[0]
-                    else:
-                        self._meta.at[i, 'rep_gen_gid'] = str(ggids)
-                        self._meta.at[i, 'rep_res_gid'] = str(rgids)
+        gids, ptr, weights, res_gids = self._get_region_members()
+        stream = RegionProfileStream(self._gen_fpath, gids, ptr,
+                                     weights=weights, cf_dset=self._cf_dset,
+                                     rep_method=self._rep_method,
+                                     err_method=self._err_method,
+                                     n_profiles=self._n_profiles,
+                                     time_chunk=time_chunk,
+                                     site_chunk=site_chunk,
+                                     max_mem=self._max_region_mem)
+        profiles, i_reps = stream.run(max_workers=max_workers)
+
+        for n, arr in enumerate(profiles):
+            self._profiles[n][:] = arr
+
+        if i_reps is None:
+            return
+
+        for i in self.meta.index:
+            if ptr[i] == ptr[i + 1]:
+                logger.info('Skipping profile {} out of {} for region with '
+                            'no generation gids.'.format(i + 1,
+                                                         len(self.meta)))
+                continue
+
+            members = ptr[i] + i_reps[i]
+            ggids = [gids[j] for j in members]
+            rgids = [None]
+            if res_gids is not None:
+                rgids = [res_gids[j] for j in members]
+
+            if len(ggids) == 1:
+                self._meta.at[i, 'rep_gen_gid'] = ggids[0]
+                self._meta.at[i, 'rep_res_gid'] = rgids[0]
+            else:
+                self._meta.at[i, 'rep_gen_gid'] = str(ggids)
+                self._meta.at[i, 'rep_res_gid'] = str(rgids)
 
     def _run(self, fout=None, save_rev_summary=True, scaled_precision=False,
              max_workers=None):
@@ -1080,7 +1889,8 @@ class RepProfiles(RepProfilesBase):
     def run(cls, gen_fpath, rev_summary, reg_cols, gid_col='gen_gids',
             cf_dset='cf_profile', rep_method='meanoid', err_method='rmse',
             weight='gid_counts', n_profiles=1, fout=None,
-            save_rev_summary=True, scaled_precision=False, max_workers=None):
+            save_rev_summary=True, scaled_precision=False, max_workers=None,
+            max_region_mem=1.0):
         """Run representative profiles by finding the closest single profile
         to the weighted meanoid for each SC region.
 
@@ -1121,6 +1931,12 @@ class RepProfiles(RepProfilesBase):
         max_workers : int, optional
             Number of parallel workers. 1 will run serial, None will use all
             available., by default None
+        max_region_mem : float | None, optional
+            Maximum memory in GB for the error temporaries of a single
+            region in serial, or for each streamed time block in parallel.
+            Larger regions automatically compute their errors in float32 site
+            chunks. None will never chunk the serial calculation and will use
+            the RegionProfileStream defaults in parallel., by default 1.0
 
         Returns
         -------
@@ -1136,7 +1952,8 @@ class RepProfiles(RepProfilesBase):
 
         rp = cls(gen_fpath, rev_summary, reg_cols, gid_col=gid_col,
                  cf_dset=cf_dset, rep_method=rep_method, err_method=err_method,
-                 n_profiles=n_profiles, weight=weight)
+                 n_profiles=n_profiles, weight=weight,
+                 max_region_mem=max_region_mem)
 
         rp._run(fout=fout, save_rev_summary=save_rev_summary,
                 scaled_precision=scaled_precision, max_workers=max_workers)
@@ -33,8 +33,12 @@ class CompetitiveWindFarms:
         """
         self._wind_dirs = self._parse_wind_dirs(wind_dirs)
 
-        self._sc_gids, self._sc_point_gids, self._mask = \
-            self._parse_sc_points(sc_points, offshore=offshore)
+        out = self._parse_sc_points(sc_points, offshore=offshore)
+        self._sc_gids, self._sc_point_ptr, self._sc_point_sc_gids = out
+
+        # extra sentinel element absorbs exclusions of invalid neighbors
+        self._mask_buffer = np.ones(len(self._sc_point_ptr), dtype=bool)
+        self._mask = self._mask_buffer[:-1]
 
         self._offshore = offshore
 
@@ -46,15 +50,20 @@ class CompetitiveWindFarms:
             logger.error(msg)
             raise RuntimeError(msg)
 
-        mask = self._wind_dirs.index.isin(self._sc_point_gids.keys())
+        mask = self._wind_dirs.index.isin(self.sc_point_gids)
         self._wind_dirs = self._wind_dirs.loc[mask]
-        self._upwind, self._downwind = self._get_neighbors(self._wind_dirs,
-                                                           n_dirs=n_dirs)
+        upwind, downwind = self._get_neighbors(self._wind_dirs,
+                                               n_dirs=n_dirs)
+
+        shape = (len(self._mask), upwind.shape[1])
+        self._upwind = np.full(shape, -1, dtype=np.int64)
+        self._downwind = np.full(shape, -1, dtype=np.int64)
+        self._upwind[self._wind_dirs.index.values] = upwind
+        self._downwind[self._wind_dirs.index.values] = downwind
 
     def __repr__(self):
-        gids = len(self._upwind)
-        # pylint: disable=unsubscriptable-object
-        neighbors = len(self._upwind.values[0])
+        gids = np.sum(self._valid)
+        neighbors = self._upwind.shape[1]
         msg = ("{} with {} sc_point_gids and {} prominent directions"
                .format(self.__class__.__name__, gids, neighbors))
 
@@ -119,10 +128,7 @@ class CompetitiveWindFarms:
         -------
         ndarray
         """
-        sc_point_gids = np.array(list(self._sc_point_gids.keys()), dtype=int)
-        mask = self.mask[sc_point_gids]
-
-        return sc_point_gids[mask]
+        return np.where(self._valid & self.mask)[0]
 
     @property
     def sc_gids(self):
@@ -133,11 +139,48 @@ class CompetitiveWindFarms:
         -------
         ndarray
         """
-        sc_gids = \
-            np.concatenate([self._sc_point_gids[gid]
-                            for gid in self.sc_point_gids])
+        counts = np.diff(self._sc_point_ptr)
+        mask = np.repeat(self.mask, counts)
+
+        return self._sc_point_sc_gids[mask]
+
+    @property
+    def _valid(self):
+        """
+        Boolean array of sc_point_gids that have at least one sc_gid
+
+        Returns
+        -------
+        ndarray
+        """
+        return self._sc_point_ptr[1:] > self._sc_point_ptr[:-1]
+
+    def _check_sc_point_gids(self, sc_point_gids):
+        """
+        Check which sc_point_gids are valid supply curve points
+
+        Parameters
+        ----------
+        sc_point_gids : int | float | ndarray
+            Supply curve point gid(s) to check
 
-        return sc_gids
+        Returns
+        -------
+        valid : bool | ndarray
+            Flag(s) for whether each sc_point_gid is a valid supply curve
+            point with at least one sc_gid
+        """
+        gids = np.asarray(sc_point_gids)
+        with np.errstate(invalid='ignore'):
+            valid = ((gids >= 0) & (gids < len(self._mask))
+                     & (gids == np.floor(gids)))
+
+        ind = np.where(valid, gids, 0).astype(np.int64)
+        valid &= self._valid[ind]
+        if valid.ndim == 0:
+            valid = bool(valid)
+
+        return valid
 
     @staticmethod
     def _parse_table(table):
@@ -204,12 +247,16 @@ class CompetitiveWindFarms:
 
         Returns
         -------
-        sc_gids : pandas.DataFrame
-            sc_gid to sc_point_gid mapping
-        sc_point_gids : pandas.DataFrame
-            sc_point_gid to sc_gid mapping
-        mask : ndarray
-            Mask array to mask excluded sc_point_gids
+        sc_gids : ndarray
+            sc_gid to sc_point_gid mapping indexed by sc_gid, -1 for sc_gids
+            that are not in the table
+        sc_point_ptr : ndarray
+            Pointer array of length max(sc_point_gid) + 2 so that the sc_gids
+            of a sc_point_gid are:
+            sc_point_sc_gids[sc_point_ptr[gid]:sc_point_ptr[gid + 1]]
+        sc_point_sc_gids : ndarray
+            Unique sc_gids of each sc_point_gid in order of appearance,
+            grouped by sc_point_gid
         """
         sc_points = CompetitiveWindFarms._parse_table(sc_points)
         if 'offshore' in sc_points and not offshore:
@@ -218,18 +265,22 @@ class CompetitiveWindFarms:
             mask = sc_points['offshore'] == 0
             sc_points = sc_points.loc[mask]
 
-        mask = np.ones(int(1 + sc_points['sc_point_gid'].max()), dtype=bool)
+        sc_gid = sc_points['sc_gid'].values.astype(np.int64)
+        sc_point_gid = sc_points['sc_point_gid'].values.astype(np.int64)
 
-        sc_points = sc_points[['sc_gid', 'sc_point_gid']]
-        sc_gids = sc_points.set_index('sc_gid')
-        sc_gids = {k: int(v[0]) for k, v in sc_gids.iterrows()}
+        sc_gids = np.full(int(1 + sc_gid.max()), -1, dtype=np.int64)
+        sc_gids[sc_gid] = sc_point_gid
 
-        sc_point_gids = \
-            sc_points.groupby('sc_point_gid')['sc_gid'].unique().to_frame()
-        sc_point_gids = {int(k): v['sc_gid']
-                         for k, v in sc_point_gids.iterrows()}
+        pairs = sc_points[['sc_point_gid', 'sc_gid']].drop_duplicates()
+        order = np.argsort(pairs['sc_point_gid'].values, kind='stable')
+        sc_point_sc_gids = pairs['sc_gid'].values.astype(np.int64)[order]
 
-        return sc_gids, sc_point_gids, mask
+        counts = np.bincount(pairs['sc_point_gid'].values.astype(np.int64),
+                             minlength=int(1 + sc_point_gid.max()))
+        sc_point_ptr = np.zeros(len(counts) + 1, dtype=np.int64)
+        sc_point_ptr[1:] = np.cumsum(counts)
+
+        return sc_gids, sc_point_ptr, sc_point_sc_gids
 
     @staticmethod
     def _get_neighbors(wind_dirs, n_dirs=2):
@@ -246,10 +297,12 @@ class CompetitiveWindFarms:
 
         Returns
         -------
-        upwind : pandas.DataFrame
-            Upwind neighbor gids for n prominent wind directions
-        downwind : pandas.DataFrame
-            Downwind neighbor gids for n prominent wind directions
+        upwind : ndarray
+            Upwind neighbor gids for n prominent wind directions for each
+            row in wind_dirs, -1 for missing neighbors
+        downwind : ndarray
+            Downwind neighbor gids for n prominent wind directions for each
+            row in wind_dirs, -1 for missing neighbors
         """
         cols = [c for c in wind_dirs
                 if (c.endswith('_gid') and not c.startswith('sc'))]
@@ -268,14 +321,58 @@ class CompetitiveWindFarms:
         downwind_gids = wind_dirs[cols].values
         downwind_gids = np.take_along_axis(downwind_gids, neighbors, axis=1)
 
-        downwind = {}
-        upwind = {}
-        for i, gid in enumerate(wind_dirs.index.values):
-            downwind[gid] = downwind_gids[i]
-            upwind[gid] = upwind_gids[i]
+        upwind = CompetitiveWindFarms._as_gids(upwind_gids)
+        downwind = CompetitiveWindFarms._as_gids(downwind_gids)
 
         return upwind, downwind
 
+    @staticmethod
+    def _as_gids(gids):
+        """
+        Convert neighbor gids to integers
+
+        Parameters
+        ----------
+        gids : ndarray
+            Neighbor gids, can be floats with NaN values for missing
+            neighbors
+
+        Returns
+        -------
+        gids : ndarray
+            int64 neighbor gids, -1 for missing neighbors
+        """
+        if np.issubdtype(gids.dtype, np.integer):
+            return gids.astype(np.int64)
+
+        gids = gids.astype(np.float64)
+        out = np.full(gids.shape, -1, dtype=np.int64)
+        valid = np.isfinite(gids) & (gids == np.floor(gids))
+        out[valid] = gids[valid]
+
+        return out
+
+    def _get_sc_point_gid(self, sc_point_gid):
+        """
+        Check that a sc_point_gid is a valid supply curve point
+
+        Parameters
+        ----------
+        sc_point_gid : int
+            Supply curve point gid
+
+        Returns
+        -------
+        sc_point_gid : int
+            Valid integer supply curve point gid
+        """
+        if not self._check_sc_point_gids(sc_point_gid):
+            msg = "Invalid sc_point_gid {}".format(sc_point_gid)
+            logger.error(msg)
+            raise KeyError(msg)
+
+        return int(sc_point_gid)
+
     def map_sc_point_gid_to_sc_gid(self, sc_point_gid):
         """
         Map given sc_point_gid to equivalent sc_gid(s)
@@ -287,10 +384,13 @@ class CompetitiveWindFarms:
 
         Returns
         -------
-        int | list
+        ndarray
             Equivalent supply curve gid(s)
         """
-        return self._sc_point_gids[sc_point_gid]
+        gid = self._get_sc_point_gid(sc_point_gid)
+        start, end = self._sc_point_ptr[gid:gid + 2]
+
+        return self._sc_point_sc_gids[start:end]
 
     def map_sc_gid_to_sc_point_gid(self, sc_gid):
         """
@@ -306,7 +406,13 @@ class CompetitiveWindFarms:
         int
             Equivalent supply point curve gid
         """
-        return self._sc_gids[sc_gid]
+        sc_point_gid = self.check_sc_gid(sc_gid)
+        if sc_point_gid is None:
+            msg = "Invalid sc_gid {}".format(sc_gid)
+            logger.error(msg)
+            raise KeyError(msg)
+
+        return sc_point_gid
 
     def check_sc_gid(self, sc_gid):
         """
@@ -325,8 +431,10 @@ class CompetitiveWindFarms:
             (offshore)
         """
         sc_point_gid = None
-        if sc_gid in self._sc_gids:
-            sc_point_gid = self._sc_gids[sc_gid]
+        if 0 <= sc_gid < len(self._sc_gids) and sc_gid == int(sc_gid):
+            gid = self._sc_gids[int(sc_gid)]
+            if gid >= 0:
+                sc_point_gid = int(gid)
 
         return sc_point_gid
 
@@ -340,10 +448,10 @@ class CompetitiveWindFarms:
             Supply point curve gid to get upwind neighbors
         Returns
         -------
-        int | list
-            upwind neighborings
+        ndarray
+            upwind neighborings, -1 for missing neighbors
         """
-        return self._upwind[sc_point_gid]
+        return self._upwind[self._get_sc_point_gid(sc_point_gid)]
 
     def map_downwind(self, sc_point_gid):
         """
@@ -355,10 +463,10 @@ class CompetitiveWindFarms:
             Supply point curve gid to get downwind neighbors
         Returns
         -------
-        int | list
-            downwind neighborings
+        ndarray
+            downwind neighborings, -1 for missing neighbors
         """
-        return self._downwind[sc_point_gid]
+        return self._downwind[self._get_sc_point_gid(sc_point_gid)]
 
     def exclude_sc_point_gid(self, sc_point_gid):
         """
@@ -375,14 +483,103 @@ class CompetitiveWindFarms:
         bool
             Flag if gid is valid and was masked
         """
-        if sc_point_gid in self._sc_point_gids:
-            self._mask[sc_point_gid] = False
-            out = True
-        else:
-            out = False
+        out = self._check_sc_point_gids(sc_point_gid)
+        if out:
+            self._mask[int(sc_point_gid)] = False
 
         return out
 
+    def _get_neighbor_index(self, downwind=False):
+        """
+        Get the neighbors of every sc_point_gid for the exclusion kernel
+
+        Parameters
+        ----------
+        downwind : bool, optional
+            Flag to include downwind neighbors as well as upwind neighbors,
+            by default False
+
+        Returns
+        -------
+        neighbors : ndarray
+            2D array of neighbor sc_point_gids indexed by sc_point_gid.
+            Invalid neighbors point to the sentinel element at the end of
+            the mask buffer.
+        """
+        neighbors = self._upwind
+        if downwind:
+            neighbors = np.hstack((neighbors, self._downwind))
+
+        valid = self._check_sc_point_gids(neighbors)
+
+        return np.where(valid, neighbors, len(self._mask))
+
+    @staticmethod
+    def _exclude_neighbors(sc_point_gids, neighbors, mask):
+        """
+        Sequentially exclude the neighbors of every supply curve point that
+        has not been excluded yet, in the given order.
+
+        Parameters
+        ----------
+        sc_point_gids : ndarray
+            Supply curve point gids in the order of build priority
+        neighbors : ndarray
+            2D array of neighbor sc_point_gids indexed by sc_point_gid, see
+            _get_neighbor_index()
+        mask : ndarray
+            Boolean mask buffer with a sentinel element, updated in place,
+            False == excluded sc_point_gid
+
+        Returns
+        -------
+        mask : ndarray
+            Updated mask buffer
+        """
+        for gid in sc_point_gids.tolist():
+            if mask[gid]:
+                mask[neighbors[gid]] = False
+
+        return mask
+
+    def exclude_neighbors(self, sc_gid, downwind=False):
+        """
+        Exclude the neighbors of the supply curve point of the given sc_gid
+        if that supply curve point has not been excluded.
+
+        Parameters
+        ----------
+        sc_gid : int
+            Supply curve gid to exclude non-competitive wind farms around
+        downwind : bool, optional
+            Flag to remove downwind neighbors as well as upwind neighbors,
+            by default False
+
+        Returns
+        -------
+        sc_gids : ndarray
+            sc_gids of all valid neighboring supply curve points, empty if
+            sc_gid is invalid (offshore) or its supply curve point was
+            already excluded
+        """
+        sc_gids = np.zeros(0, dtype=np.int64)
+        gid = self.check_sc_gid(sc_gid)
+        if gid is not None and self._mask[gid]:
+            neighbors = self._upwind[gid]
+            if downwind:
+                neighbors = np.append(neighbors, self._downwind[gid])
+
+            neighbors = neighbors[self._check_sc_point_gids(neighbors)]
+            self._mask[neighbors] = False
+
+            sc_gids = [self._sc_point_sc_gids[self._sc_point_ptr[n]:
+                                              self._sc_point_ptr[n + 1]]
+                       for n in neighbors]
+            if sc_gids:
+                sc_gids = np.concatenate(sc_gids)
+
+        return np.asarray(sc_gids, dtype=np.int64)
+
     def remove_noncompetitive_farm(self, sc_points, sort_on='total_lcoe',
                                    downwind=False):
         """
@@ -414,18 +611,9 @@ class CompetitiveWindFarms:
         sc_points = sc_points.sort_values(sort_on)
 
         sc_point_gids = sc_points['sc_point_gid'].values.astype(int)
-
-        for i in range(len(sc_points)):
-            gid = sc_point_gids[i]
-            if self.mask[gid]:
-                upwind_gids = self['upwind', gid]
-                for n in upwind_gids:
-                    self.exclude_sc_point_gid(n)
-
-                if downwind:
-                    downwind_gids = self['downwind', gid]
-                    for n in downwind_gids:
-                        self.exclude_sc_point_gid(n)
+        self._exclude_neighbors(sc_point_gids,
+                                self._get_neighbor_index(downwind=downwind),
+                                self._mask_buffer)
 
         sc_gids = self.sc_gids
         mask = sc_points['sc_gid'].isin(sc_gids)
@@ -8,7 +8,6 @@ Created on Fri Jun 21 13:24:31 2019
 import logging
 import numpy as np
 import pandas as pd
-from scipy import stats
 from warnings import warn
 
 from reV.handlers.exclusions import ExclusionLayers
@@ -63,9 +62,10 @@ class SupplyCurvePointSummary(GenerationSupplyCurvePoint):
             None if no resource classes.
         excl_area : float
             Area of an exclusion cell (square km).
-        power_density : float | None | pd.DataFrame
-            Constant power density float, None, or opened dataframe with
-            (resource) "gid" and "power_density columns".
+        power_density : float | None | pd.DataFrame | np.ndarray
+            Constant power density float, None, opened dataframe with
+            (resource) "gid" and "power_density columns", or array of power
+            densities indexed by resource gid (NaN if not available).
         cf_dset : str | np.ndarray
             Dataset name from gen containing capacity factor mean values.
             Can be pre-extracted generation output data in np.ndarray.
@@ -104,6 +104,9 @@ class SupplyCurvePointSummary(GenerationSupplyCurvePoint):
         self._pd_obj = None
         self._power_density = power_density
         self._friction_layer = friction_layer
+        self._friction_data = None
+        self._data_layer_cache = {}
+        self._data_layer_handles = {}
 
         super().__init__(gid, excl, gen, tm_dset, gen_index,
                          excl_dict=excl_dict, resolution=resolution,
@@ -112,6 +115,14 @@ class SupplyCurvePointSummary(GenerationSupplyCurvePoint):
 
         self._apply_exclusions()
 
+    def close(self):
+        """Close all file handlers."""
+        super().close()
+        for f in self._data_layer_handles.values():
+            f.close()
+
+        self._data_layer_handles = {}
+
     def _apply_exclusions(self):
         """Apply exclusions by masking the generation and resource gid arrays.
         This removes all res/gen entries that are masked by the exclusions or
@@ -120,6 +131,17 @@ class SupplyCurvePointSummary(GenerationSupplyCurvePoint):
         # exclusions mask is False where excluded
         exclude = (self.excl_data == 0).flatten()
         exclude = self._resource_exclusion(exclude)
+        self._mask_exclusions(exclude)
+
+    def _mask_exclusions(self, exclude):
+        """Mask the generation and resource gid arrays and the exclusions
+        data with a boolean exclusion array.
+
+        Parameters
+        ----------
+        exclude : np.ndarray
+            Flat boolean exclusion array (True is exclude).
+        """
 
         self._gen_gids[exclude] = -1
         self._res_gids[exclude] = -1
@@ -161,6 +183,74 @@ class SupplyCurvePointSummary(GenerationSupplyCurvePoint):
 
         return boolean_exclude
 
+    def _get_point_state(self):
+        """Get a copy of the gid and exclusions arrays that define the
+        current point state so that it can be shared between resource classes.
+
+        Returns
+        -------
+        point_state : tuple
+            Copies of the gen gids, res gids, and 2D exclusions data arrays.
+        """
+        return (self._gen_gids.copy(), self._res_gids.copy(),
+                self._excl_data.copy())
+
+    def _get_res_class_masks(self, res_class_bins):
+        """Get the boolean resource class membership of every exclusion
+        pixel for all resource class bins at once.
+
+        Parameters
+        ----------
+        res_class_bins : list
+            List of two-entry lists dictating the resource class bins.
+
+        Returns
+        -------
+        in_bin : np.ndarray
+            2D boolean array (n_bins, n_pixels) that is True where the
+            pixel resource falls in the resource class bin.
+        """
+        res = self.res_data[self._gen_gids]
+
+        # compare against scalar bin edges so that the comparison dtype is
+        # the same as in _resource_exclusion()
+        in_bin = np.vstack([(res >= np.min(res_bin))
+                            & (res < np.max(res_bin))
+                            for res_bin in res_class_bins])
+
+        return in_bin
+
+    def _set_res_class(self, res_class_bin, in_bin, point_state):
+        """Reset this point to a shared point state and apply the exclusions
+        for a single resource class bin.
+
+        Parameters
+        ----------
+        res_class_bin : list
+            Two-entry lists dictating the single resource class bin.
+        in_bin : np.ndarray
+            Flat boolean array that is True where the pixel resource falls in
+            the resource class bin.
+        point_state : tuple
+            Output from _get_point_state() before any resource class
+            exclusions were applied.
+        """
+
+        # gid arrays are aliased by other attributes, reset in place
+        gen_gids, res_gids, excl_data = point_state
+        self._gen_gids[:] = gen_gids
+        self._res_gids[:] = res_gids
+        self._excl_data[:] = excl_data
+
+        self._res_class_bin = res_class_bin
+        self._res_gid_set = None
+        self._gen_gid_set = None
+        self._gid_counts = None
+        if self._pd_obj is not None:
+            self._power_density = self._pd_obj
+
+        self._mask_exclusions(~in_bin)
+
     @property
     def res_data(self):
         """Get the resource data array.
@@ -315,11 +405,11 @@ class SupplyCurvePointSummary(GenerationSupplyCurvePoint):
             the SC domain. If friction layer is not input to this class,
             None is returned.
         """
-        friction_data = None
-        if self._friction_layer is not None:
-            friction_data = self._friction_layer[self.rows, self.cols]
+        if (self._friction_layer is not None
+                and self._friction_data is None):
+            self._friction_data = self._friction_layer[self.rows, self.cols]
 
-        return friction_data
+        return self._friction_data
 
     @property
     def power_density(self):
@@ -341,11 +431,29 @@ class SupplyCurvePointSummary(GenerationSupplyCurvePoint):
                      'data: "{}". Cannot lookup an appropriate power density '
                      'to calculate SC point capacity.'.format(tech))
 
+        elif isinstance(self._power_density, np.ndarray):
+            self._pd_obj = self._power_density
+
+            res_gids = self._res_gids[self.bool_mask]
+            in_bounds = res_gids < len(self._pd_obj)
+            pds = np.full(len(res_gids), np.nan, dtype=np.float32)
+            pds[in_bounds] = self._pd_obj[res_gids[in_bounds]]
+            if np.isnan(pds).any():
+                missing = set(res_gids[np.isnan(pds)])
+                msg = ('Variable power density input is missing the '
+                       'following resource GIDs: {}'.format(missing))
+                logger.error(msg)
+                raise FileInputError(msg)
+
+            pds *= self.excl_data_flat[self.bool_mask]
+            denom = self.excl_data_flat[self.bool_mask].sum()
+            self._power_density = pds.sum() / denom
+
         elif isinstance(self._power_density, pd.DataFrame):
             self._pd_obj = self._power_density
 
             missing = set(self.res_gid_set) - set(self._pd_obj.index.values)
-            if any(missing):
+            if missing:
                 msg = ('Variable power density input is missing the '
                        'following resource GIDs: {}'.format(missing))
                 logger.error(msg)
@@ -452,15 +560,13 @@ class SupplyCurvePointSummary(GenerationSupplyCurvePoint):
         if data_layers is not None:
             for name, attrs in data_layers.items():
 
-                if 'fobj' not in attrs:
-                    with ExclusionLayers(attrs['fpath']) as f:
-                        raw = f[attrs['dset'], self.rows, self.cols]
-                        nodata = f.get_nodata_value(attrs['dset'])
-                else:
-                    raw = attrs['fobj'][attrs['dset'], self.rows, self.cols]
-                    nodata = attrs['fobj'].get_nodata_value(attrs['dset'])
+                if name not in self._data_layer_cache:
+                    self._data_layer_cache[name] = self._read_data_layer(
+                        attrs)
 
-                data = raw.flatten()[self.bool_mask]
+                raw, nodata = self._data_layer_cache[name]
+
+                data = raw.ravel()[self.bool_mask]
                 excl_mult = self.excl_data_flat[self.bool_mask]
 
                 if nodata is not None:
@@ -468,8 +574,8 @@ class SupplyCurvePointSummary(GenerationSupplyCurvePoint):
 
                     # All included extent is nodata.
                     # Reset data from raw without exclusions.
-                    if all(nodata_mask):
-                        data = raw.flatten()
+                    if nodata_mask.all():
+                        data = raw.ravel()
                         excl_mult = self.excl_data_flat
                         nodata_mask = (data == nodata)
 
@@ -484,14 +590,165 @@ class SupplyCurvePointSummary(GenerationSupplyCurvePoint):
                              .format(name, self._gid))
                         logger.debug(m)
 
-                data = self._agg_data_layer_method(data, excl_mult,
-                                                   attrs['method'])
+                data = self._agg_data_layer_method(
+                    data, excl_mult, attrs['method'],
+                    categories=attrs.get('categories', None))
                 summary[name] = data
 
         return summary
 
+    def _read_data_layer(self, attrs):
+        """Read the raw data for this sc point from a single data layer.
+
+        Parameters
+        ----------
+        attrs : dict
+            Data layer attributes with "dset" and either "fpath" or an open
+            ExclusionLayers handler in "fobj".
+
+        Returns
+        -------
+        raw : np.ndarray
+            2D data layer data for the full SC point extent (no exclusions).
+        nodata : int | float | None
+            Nodata value for the data layer.
+        """
+        if 'fobj' in attrs:
+            f = attrs['fobj']
+        else:
+            if attrs['fpath'] not in self._data_layer_handles:
+                self._data_layer_handles[attrs['fpath']] = ExclusionLayers(
+                    attrs['fpath'])
+
+            f = self._data_layer_handles[attrs['fpath']]
+
+        raw = f[attrs['dset'], self.rows, self.cols]
+        nodata = f.get_nodata_value(attrs['dset'])
+
+        return raw, nodata
+
     @staticmethod
-    def _agg_data_layer_method(data, excl_mult, method):
+    def _get_category_codes(data, categories=None, max_lut_size=2**16):
+        """Map data values to integer category codes so that categorical
+        aggregations can be done with a weighted bincount.
+
+        Parameters
+        ----------
+        data : np.ndarray
+            1D data array.
+        categories : list | np.ndarray | None
+            Optional list of expected category values. Data values not in this
+            list are given a code of -1. None will use the unique data values
+            (NaN data values are given a code of -1).
+        max_lut_size : int
+            Maximum value range of integer data to map to codes with a simple
+            offset lookup table. Larger ranges (and non-integer data) use
+            np.unique instead.
+
+        Returns
+        -------
+        codes : np.ndarray
+            Integer category code for each entry in data. Codes index values.
+        values : np.ndarray
+            Category value for each code.
+        """
+
+        if categories is not None:
+            values = np.asarray(categories)
+            order = np.argsort(values, kind='stable')
+            ind = np.searchsorted(values[order], data)
+            ind = np.minimum(ind, len(values) - 1)
+            found = values[order][ind] == data
+            codes = np.where(found, order[ind], -1)
+
+        else:
+            valid = np.ones(data.shape, dtype=bool)
+            if np.issubdtype(data.dtype, np.floating):
+                valid = ~np.isnan(data)
+
+            codes = np.full(data.shape, -1, dtype=np.int64)
+            vdata = data[valid]
+            values = vdata[:0]
+            if vdata.size:
+                # exclusion layers are read as floats, use a lookup table if
+                # the data values are all integers with a small range
+                idata = vdata.astype(np.int64)
+                vmin = idata.min()
+                if ((idata.max() - vmin) < max_lut_size
+                        and (np.issubdtype(data.dtype, np.integer)
+                             or (idata == vdata).all())):
+                    codes[valid] = idata - vmin
+                    values = (np.arange(idata.max() - vmin + 1) + vmin)
+                    values = values.astype(data.dtype)
+                else:
+                    values, codes[valid] = np.unique(vdata,
+                                                     return_inverse=True)
+
+        return codes, values
+
+    @classmethod
+    def _agg_mode(cls, data):
+        """Get the most common value in a data array. Ties are broken by
+        returning the smallest value.
+
+        Parameters
+        ----------
+        data : np.ndarray
+            1D data array.
+
+        Returns
+        -------
+        mode : int | float
+            Most common value in data. NaN if data has no non-NaN values.
+        """
+        codes, values = cls._get_category_codes(data)
+        if not len(values):
+            return np.nan
+
+        counts = np.bincount(codes[codes >= 0], minlength=len(values))
+
+        return values[np.argmax(counts)]
+
+    @classmethod
+    def _agg_category(cls, data, excl_mult, categories=None):
+        """Get the exclusion-weighted pixel count of each category in a data
+        array.
+
+        Parameters
+        ----------
+        data : np.ndarray
+            1D data array.
+        excl_mult : np.ndarray
+            1D exclusion multiplier array with the same shape as data.
+        categories : list | None
+            Optional list of category values. If input, the output is an
+            array in the order of the categories instead of a json string.
+            SupplyCurveAggregation expands these arrays into one
+            "<layer>_<category>" column per category.
+
+        Returns
+        -------
+        out : str | np.ndarray
+            Jsonified dictionary of the weighted count keyed by category value
+            or float32 array of the weighted counts for the input categories.
+        """
+        codes, values = cls._get_category_codes(data, categories=categories)
+        mask = codes >= 0
+        weights = np.bincount(codes[mask], weights=excl_mult[mask],
+                              minlength=len(values))
+
+        if categories is not None:
+            out = weights.astype(np.float32)
+        else:
+            present = np.bincount(codes[mask], minlength=len(values)) > 0
+            out = {values[i]: float(weights[i]) for i in np.where(present)[0]}
+            out = jsonify_dict(out)
+
+        return out
+
+    @classmethod
+    def _agg_data_layer_method(cls, data, excl_mult, method,
+                               categories=None):
         """Aggregate the data array using specified method.
 
         Parameters
@@ -505,10 +762,15 @@ class SupplyCurvePointSummary(GenerationSupplyCurvePoint):
             aggregation methods. Shape must match input data.
         method : str
             Aggregation method (mode, mean, max, min, sum, category)
+        categories : list | None
+            Optional list of category values for the "category" method. If
+            input, the category result is a compact float32 array of the
+            exclusion-weighted pixel counts in the order of the categories
+            (values not in the list are not counted) instead of a json string.
 
         Returns
         -------
-        data : float | int | str | None
+        data : float | int | str | np.ndarray | None
             Result of applying method to data.
         """
         if data is not None:
@@ -521,9 +783,10 @@ class SupplyCurvePointSummary(GenerationSupplyCurvePoint):
 
             if len(data.shape) > 1:
                 data = data.flatten()
+                excl_mult = excl_mult.flatten()
 
             if method.lower() == 'mode':
-                data = stats.mode(data).mode[0]
+                data = cls._agg_mode(data)
             elif method.lower() == 'mean':
                 data = data.mean()
             elif method.lower() == 'max':
@@ -533,9 +796,8 @@ class SupplyCurvePointSummary(GenerationSupplyCurvePoint):
             elif method.lower() == 'sum':
                 data = data.sum()
             elif method.lower() == 'category':
-                data = {category: float(excl_mult[(data == category)].sum())
-                        for category in np.unique(data)}
-                data = jsonify_dict(data)
+                data = cls._agg_category(data, excl_mult,
+                                         categories=categories)
             else:
                 e = ('Cannot recognize data layer agg method: '
                      '"{}". Can only do mean, mode, sum, or category.'
@@ -559,9 +821,9 @@ class SupplyCurvePointSummary(GenerationSupplyCurvePoint):
             name. Each value must be another dictionary with "dset", "method",
             and "fpath".
         """
-        ARGS = {'res_gids': self.res_gid_set,
-                'gen_gids': self.gen_gid_set,
-                'gid_counts': self.gid_counts,
+        ARGS = {'res_gids': list(self.res_gid_set),
+                'gen_gids': list(self.gen_gid_set),
+                'gid_counts': list(self.gid_counts),
                 'n_gids': self.n_gids,
                 'mean_cf': self.mean_cf,
                 'mean_lcoe': self.mean_lcoe,
@@ -637,9 +899,10 @@ class SupplyCurvePointSummary(GenerationSupplyCurvePoint):
             None if no resource classes.
         excl_area : float
             Area of an exclusion cell (square km).
-        power_density : float | None | pd.DataFrame
-            Constant power density float, None, or opened dataframe with
-            (resource) "gid" and "power_density columns".
+        power_density : float | None | pd.DataFrame | np.ndarray
+            Constant power density float, None, opened dataframe with
+            (resource) "gid" and "power_density columns", or array of power
+            densities indexed by resource gid (NaN if not available).
         cf_dset : str | np.ndarray
             Dataset name from gen containing capacity factor mean values.
             Can be pre-extracted generation output data in np.ndarray.
@@ -690,3 +953,129 @@ class SupplyCurvePointSummary(GenerationSupplyCurvePoint):
             summary = point.point_summary(args=args, data_layers=data_layers)
 
         return summary
+
+    @classmethod
+    def summarize_res_classes(cls, gid, excl_fpath, gen_fpath, tm_dset,
+                              gen_index, excl_dict=None, res_class_dset=None,
+                              res_class_bins=None, excl_area=0.0081,
+                              power_density=None, cf_dset='cf_mean-means',
+                              lcoe_dset='lcoe_fcr-means', h5_dsets=None,
+                              resolution=64, exclusion_shape=None,
+                              close=False, offshore_flags=None,
+                              friction_layer=None, args=None,
+                              data_layers=None):
+        """Get summary dictionaries of a single supply curve point for all
+        resource class bins.
+
+        The techmap, exclusions, generation gid mapping, offshore removal,
+        and data layers are only processed once for the sc point. Each
+        resource class is then summarized from this shared point state.
+
+        Parameters
+        ----------
+        gid : int
+            gid for supply curve point to analyze.
+        excl_fpath : str
+            Filepath to exclusions h5.
+        gen_fpath : str
+            Filepath to .h5 reV generation output results.
+        tm_dset : str
+            Dataset name in the techmap file containing the
+            exclusions-to-resource mapping data.
+        gen_index : np.ndarray
+            Array of generation gids with array index equal to resource gid.
+            Array value is -1 if the resource index was not used in the
+            generation run.
+        excl_dict : dict | None
+            Dictionary of exclusion LayerMask arugments {layer: {kwarg: value}}
+            None if excl input is pre-initialized.
+        res_class_dset : str | np.ndarray | None
+            Dataset in the generation file dictating resource classes.
+            Can be pre-extracted resource data in np.ndarray.
+            None if no resource classes.
+        res_class_bins : list | None
+            List of two-entry lists dictating the resource class bins.
+            None (or [None]) if no resource classes.
+        excl_area : float
+            Area of an exclusion cell (square km).
+        power_density : float | None | pd.DataFrame | np.ndarray
+            Constant power density float, None, opened dataframe with
+            (resource) "gid" and "power_density columns", or array of power
+            densities indexed by resource gid (NaN if not available).
+        cf_dset : str | np.ndarray
+            Dataset name from gen containing capacity factor mean values.
+            Can be pre-extracted generation output data in np.ndarray.
+        lcoe_dset : str | np.ndarray
+            Dataset name from gen containing LCOE mean values.
+            Can be pre-extracted generation output data in np.ndarray.
+        h5_dsets : None | list | dict
+            Optional list of dataset names to summarize from the gen/econ h5
+            files. Can also be pre-extracted data dictionary where keys are
+            the dataset names and values are the arrays of data from the
+            h5 files.
+        resolution : int | None
+            SC resolution, must be input in combination with gid.
+        exclusion_shape : tuple
+            Shape of the exclusions extent (rows, cols). Inputing this will
+            speed things up considerably.
+        close : bool
+            Flag to close object file handlers on exit.
+        offshore_flags : np.ndarray | None
+            Array of offshore boolean flags if available from wind generation
+            data. None if offshore flag is not available.
+        friction_layer : None | FrictionMask
+            Friction layer with scalar friction values if valid friction inputs
+            were entered. Otherwise, None to not apply friction layer.
+        args : tuple | list, optional
+            List of summary arguments to include. None defaults to all
+            available args defined in the class attr, by default None
+        data_layers : dict, optional
+            Aggregation data layers. Must be a dictionary keyed by data label
+            name. Each value must be another dictionary with "dset", "method",
+            and "fpath", by default None
+
+        Returns
+        -------
+        summaries : dict
+            Dictionary of summary outputs for this sc point keyed by the
+            resource class index. Resource classes that are completely
+            excluded are not included. Empty if the sc point is completely
+            excluded.
+        """
+        if res_class_bins is None:
+            res_class_bins = [None]
+
+        kwargs = {"excl_dict": excl_dict, "res_class_dset": res_class_dset,
+                  "res_class_bin": None, "excl_area": excl_area,
+                  "power_density": power_density, "cf_dset": cf_dset,
+                  "lcoe_dset": lcoe_dset, "h5_dsets": h5_dsets,
+                  "resolution": resolution,
+                  "exclusion_shape": exclusion_shape, "close": close,
+                  "offshore_flags": offshore_flags,
+                  'friction_layer': friction_layer}
+
+        summaries = {}
+        try:
+            point = cls(gid, excl_fpath, gen_fpath, tm_dset, gen_index,
+                        **kwargs)
+        except EmptySupplyCurvePointError:
+            return summaries
+
+        with point:
+            if (res_class_dset is None
+                    or all(res_bin is None for res_bin in res_class_bins)):
+                summaries[0] = point.point_summary(args=args,
+                                                   data_layers=data_layers)
+                return summaries
+
+            point_state = point._get_point_state()
+            in_bins = point._get_res_class_masks(res_class_bins)
+            valid = (in_bins & point.bool_mask).any(axis=1)
+
+            for ri, res_bin in enumerate(res_class_bins):
+                if valid[ri]:
+                    point._set_res_class(res_bin, in_bins[ri], point_state)
+                    summaries[ri] = point.point_summary(
+                        args=args, data_layers=data_layers)
+
+        return summaries
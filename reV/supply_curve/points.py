@@ -626,6 +626,7 @@ class AggregationSupplyCurvePoint(SupplyCurvePoint):
                          close=close)
 
         self._h5_gid_set = None
+        self._gid_counts = None
         self._h5_fpath, self._h5 = self._parse_h5_file(agg_h5)
 
         if gen_index is not None:
@@ -710,23 +711,42 @@ class AggregationSupplyCurvePoint(SupplyCurvePoint):
         return gen_gids, res_gids
 
     @staticmethod
-    def _ordered_unique(seq):
-        """Get a list of unique values in the same order as the input sequence.
+    def _ordered_unique(gids, weights=None):
+        """Get the unique valid gids (not -1) in order of first appearance
+        and (optionally) the sum of the weights for each unique gid.
 
         Parameters
         ----------
-        seq : list | tuple
-            Sequence of values.
+        gids : np.ndarray
+            1D array of gids with -1 for invalid entries.
+        weights : np.ndarray | None
+            Optional 1D array of weights (e.g. exclusion multipliers) with the
+            same shape as gids.
 
         Returns
         -------
-        seq : list
-            List of unique values in seq input with original order.
+        unique_gids : np.ndarray
+            Unique valid gids in order of first appearance in gids.
+        first_ind : np.ndarray
+            Index of the first appearance of each unique gid in gids.
+        counts : np.ndarray | None
+            Sum of the weights for each unique gid. None if weights is None.
         """
 
-        seen = set()
+        valid_ind = np.where(gids != -1)[0]
+        unique_gids, first, inverse = np.unique(gids[valid_ind],
+                                                return_index=True,
+                                                return_inverse=True)
+        order = np.argsort(first)
+        first_ind = valid_ind[first[order]]
 
-        return [x for x in seq if not (x in seen or seen.add(x))]
+        counts = None
+        if weights is not None:
+            counts = np.bincount(inverse, weights=weights[valid_ind],
+                                 minlength=len(unique_gids))
+            counts = counts[order].astype(weights.dtype)
+
+        return unique_gids[order], first_ind, counts
 
     @property
     def h5(self):
@@ -798,13 +818,12 @@ class AggregationSupplyCurvePoint(SupplyCurvePoint):
 
         Returns
         -------
-        h5_gids : list
-            List of h5 gids.
+        h5_gids : np.ndarray
+            Array of h5 gids.
         """
         if self._h5_gid_set is None:
-            self._h5_gid_set = self._ordered_unique(self._h5_gids)
-            if -1 in self._h5_gid_set:
-                self._h5_gid_set.remove(-1)
+            self._h5_gid_set, _, self._gid_counts = self._ordered_unique(
+                self._h5_gids, weights=self.excl_data_flat)
 
         return self._h5_gid_set
 
@@ -815,13 +834,14 @@ class AggregationSupplyCurvePoint(SupplyCurvePoint):
 
         Returns
         -------
-        gid_counts : list
-            List of exclusion pixels in each resource/generation gid.
+        gid_counts : np.ndarray
+            Array of exclusion pixels in each resource/generation gid.
         """
-        gid_counts = [self.excl_data_flat[(self._h5_gids == gid)].sum()
-                      for gid in self.h5_gid_set]
+        if self._gid_counts is None:
+            self._h5_gid_set, _, self._gid_counts = self._ordered_unique(
+                self._h5_gids, weights=self.excl_data_flat)
 
-        return gid_counts
+        return self._gid_counts
 
     @property
     def summary(self):
@@ -834,8 +854,8 @@ class AggregationSupplyCurvePoint(SupplyCurvePoint):
             List of supply curve point's meta data
         """
         meta = {'sc_point_gid': self.sc_point_gid,
-                'source_gids': self.h5_gid_set,
-                'gid_counts': self.gid_counts,
+                'source_gids': list(self.h5_gid_set),
+                'gid_counts': list(self.gid_counts),
                 'n_gids': self.n_gids,
                 'area_sq_km': self.area,
                 'latitude': self.latitude,
@@ -1061,47 +1081,50 @@ class GenerationSupplyCurvePoint(AggregationSupplyCurvePoint):
 
         return self._gen
 
+    def _set_gid_sets(self):
+        """Compute the unique resource and generation gids and the gid counts
+        for this sc point all at once."""
+        self._res_gid_set, first_ind, self._gid_counts = self._ordered_unique(
+            self._res_gids, weights=self.excl_data_flat)
+        self._gen_gid_set = self._gen_gids[first_ind]
+
     @property
     def res_gid_set(self):
-        """Get list of unique resource gids corresponding to this sc point.
+        """Get the unique resource gids corresponding to this sc point.
 
         Returns
         -------
-        res_gids : list
-            List of resource gids.
+        res_gids : np.ndarray
+            Array of resource gids.
         """
         if self._res_gid_set is None:
-            self._res_gid_set = self._ordered_unique(self._res_gids)
-            if -1 in self._res_gid_set:
-                self._res_gid_set.remove(-1)
+            self._set_gid_sets()
 
         return self._res_gid_set
 
     @property
     def gen_gid_set(self):
-        """Get list of unique generation gids corresponding to this sc point.
+        """Get the unique generation gids corresponding to this sc point.
 
         Returns
         -------
-        gen_gids : list
-            List of generation gids.
+        gen_gids : np.ndarray
+            Array of generation gids.
         """
         if self._gen_gid_set is None:
-            self._gen_gid_set = self._ordered_unique(self._gen_gids)
-            if -1 in self._gen_gid_set:
-                self._gen_gid_set.remove(-1)
+            self._set_gid_sets()
 
         return self._gen_gid_set
 
     @property
     def h5_gid_set(self):
-        """Get list of unique h5 gids corresponding to this sc point.
+        """Get the unique h5 gids corresponding to this sc point.
         Same as gen_gid_set
 
         Returns
         -------
-        h5_gids : list
-            List of h5 gids.
+        h5_gids : np.ndarray
+            Array of h5 gids.
         """
         return self.gen_gid_set
 
@@ -1112,13 +1135,13 @@ class GenerationSupplyCurvePoint(AggregationSupplyCurvePoint):
 
         Returns
         -------
-        gid_counts : list
-            List of exclusion pixels in each resource/generation gid.
+        gid_counts : np.ndarray
+            Array of exclusion pixels in each resource/generation gid.
         """
-        gid_counts = [self.excl_data_flat[(self._res_gids == gid)].sum()
-                      for gid in self.res_gid_set]
+        if self._gid_counts is None:
+            self._set_gid_sets()
 
-        return gid_counts
+        return self._gid_counts
 
 
 class SupplyCurveExtent:
@@ -25,6 +25,7 @@ from reV.supply_curve.point_summary import SupplyCurvePointSummary
 from reV.utilities.exceptions import (EmptySupplyCurvePointError,
                                       OutputWarning, FileInputError,
                                       InputWarning, SupplyCurveInputError)
+from reV.utilities.shared_arrays import SharedArrays
 
 from rex.resource import Resource
 from rex.multi_file_resource import MultiFileResource
@@ -99,8 +100,7 @@ class SupplyCurveAggFileHandler(AbstractAggFileHandler):
         _ = self._gen.meta
 
         self._data_layers = self._open_data_layers(data_layers)
-        self._power_density = power_density
-        self._parse_power_density()
+        self._power_density = self._parse_power_density(power_density)
 
         self._friction_layer = None
         if friction_fpath is not None and friction_dset is not None:
@@ -153,11 +153,13 @@ class SupplyCurveAggFileHandler(AbstractAggFileHandler):
         Returns
         -------
         data_layers : None | dict
-            Aggregation data layers. fobj is added to the dictionary of each
-            layer.
+            Copy of the aggregation data layers. fobj is added to the
+            dictionary of each layer.
         """
 
         if data_layers is not None:
+            # copy so the open handlers are not added to the input dict
+            data_layers = {k: dict(v) for k, v in data_layers.items()}
             for name, attrs in data_layers.items():
                 data_layers[name]['fobj'] = self._excl.excl_h5
                 if 'fpath' in attrs:
@@ -182,29 +184,66 @@ class SupplyCurveAggFileHandler(AbstractAggFileHandler):
                 if 'fobj' in layer:
                     layer['fobj'].close()
 
-    def _parse_power_density(self):
-        """Parse the power density input. If file, open file handler."""
+    @staticmethod
+    def _parse_power_density(power_density):
+        """Parse the power density input. If file, read the csv and convert
+        the variable power density into a dense array indexed by resource gid.
+        Shared power density references from parallel workers are attached
+        to.
+
+        Parameters
+        ----------
+        power_density : float | str | None | pd.DataFrame | np.ndarray
+            Power density in MW/km2, filepath to variable power density csv,
+            or pre-parsed variable power density data (can be a shared
+            reference from the parent process).
+
+        Returns
+        -------
+        power_density : float | None | np.ndarray
+            Constant power density float, None, or float32 array of variable
+            power density values indexed by resource gid (NaN where the
+            resource gid is not in the variable power density input). The
+            array ends at the largest input gid, so SC points treat resource
+            gids past its end as missing.
+        """
+
+        power_density = SharedArrays.attach(power_density)
 
-        if isinstance(self._power_density, str):
-            self._pdf = self._power_density
+        if isinstance(power_density, str):
+            pdf = power_density
 
-            if self._pdf.endswith('.csv'):
-                self._power_density = pd.read_csv(self._pdf)
-                if ('gid' in self._power_density
-                        and 'power_density' in self._power_density):
-                    self._power_density = self._power_density.set_index('gid')
+            if pdf.endswith('.csv'):
+                power_density = pd.read_csv(pdf)
+                if ('gid' in power_density
+                        and 'power_density' in power_density):
+                    power_density = power_density.set_index('gid')
                 else:
                     msg = ('Variable power density file must include "gid" '
                            'and "power_density" columns, but received: {}'
-                           .format(self._power_density.columns.values))
+                           .format(power_density.columns.values))
                     logger.error(msg)
                     raise FileInputError(msg)
             else:
                 msg = ('Variable power density file must be csv but received: '
-                       '{}'.format(self._pdf))
+                       '{}'.format(pdf))
+                logger.error(msg)
+                raise FileInputError(msg)
+
+        if isinstance(power_density, pd.DataFrame):
+            gids = power_density.index.values.astype(np.int64)
+            if (gids < 0).any():
+                msg = ('Variable power density input has negative resource '
+                       'GIDs: {}'.format(gids[gids < 0].tolist()))
                 logger.error(msg)
                 raise FileInputError(msg)
 
+            pd_arr = np.full(gids.max() + 1, np.nan, dtype=np.float32)
+            pd_arr[gids] = power_density['power_density'].values
+            power_density = pd_arr
+
+        return power_density
+
     def close(self):
         """Close all file handlers."""
         self._excl.close()
@@ -241,9 +280,9 @@ class SupplyCurveAggFileHandler(AbstractAggFileHandler):
 
         Returns
         -------
-        _power_density : float | None | pd.DataFrame
-            Constant power density float, None, or opened dataframe with
-            (resource) "gid" and "power_density columns".
+        _power_density : float | None | np.ndarray
+            Constant power density float, None, or array of variable power
+            density values indexed by resource gid.
         """
         return self._power_density
 
@@ -619,7 +658,10 @@ class SupplyCurveAggregation(AbstractAggregation):
         data_layers : None | dict
             Aggregation data layers. Must be a dictionary keyed by data label
             name. Each value must be another dictionary with "dset", "method",
-            and "fpath".
+            and "fpath". "category" layers can also have a "categories"
+            list to output the exclusion-weighted pixel counts in one
+            "<layer>_<category>" column per category instead of json
+            strings.
         power_density : float | str | None
             Power density in MW/km2 or filepath to variable power
             density file. None will attempt to infer a constant
@@ -724,15 +766,104 @@ class SupplyCurveAggregation(AbstractAggregation):
                     raise ValueError('Cannot recognize data layer agg method: '
                                      '"{}". Can only do: {}.'
                                      .format(v['method'], methods))
+                if ('categories' in v
+                        and v['method'].lower() != 'category'):
+                    raise ValueError('Data layer "{}" has "categories" but '
+                                     'categories can only be used with the '
+                                     '"category" method.'.format(k))
                 if 'fpath' in v:
                     with ExclusionLayers(v['fpath']) as f:
-                        if any(f.shape != shape_base):
+                        if tuple(f.shape) != tuple(shape_base):
                             msg = ('Data shape of data layer "{}" is {}, '
                                    'which does not match the baseline '
                                    'exclusions shape {}.'
                                    .format(k, f.shape, shape_base))
                             raise FileInputError(msg)
 
+    def _get_techmap_res_gids(self, offshore_flags=None):
+        """Get all onshore resource gids in the techmap for the sc points
+        being aggregated that are also in the generation run.
+
+        Parameters
+        ----------
+        offshore_flags : np.ndarray | None
+            Array of offshore boolean flags if available from wind generation
+            data. None if offshore flag is not available.
+
+        Returns
+        -------
+        res_gids : np.ndarray
+            Sorted array of unique resource gids.
+        """
+
+        in_tm = np.zeros(len(self._gen_index), dtype=bool)
+        with SupplyCurveExtent(self._excl_fpath,
+                               resolution=self._resolution) as sc:
+            points = sc.points.loc[self._gids]
+            n_excl_cols = sc.exclusions.shape[1]
+            for row_ind, col_inds in points.groupby('row_ind')['col_ind']:
+                col_mask = np.zeros(n_excl_cols, dtype=bool)
+                for col_ind in col_inds:
+                    col_mask[sc.excl_col_slices[col_ind]] = True
+
+                tm = sc.exclusions[self._tm_dset,
+                                   sc.excl_row_slices[row_ind]]
+                tm = tm[:, col_mask].astype(np.int32).flatten()
+                tm = tm[(tm >= 0) & (tm < len(self._gen_index))]
+                in_tm[tm] = True
+
+        res_gids = np.where(in_tm & (self._gen_index != -1))[0]
+        if offshore_flags is not None:
+            onshore = offshore_flags[self._gen_index[res_gids]] != 1
+            res_gids = res_gids[onshore]
+
+        return res_gids
+
+    def _get_power_density(self, offshore_flags=None):
+        """Parse the power density input. Variable power density data is
+        validated up front against all resource gids in the techmap so that
+        sc points can use plain array indexing to look up power densities.
+
+        Parameters
+        ----------
+        offshore_flags : np.ndarray | None
+            Array of offshore boolean flags if available from wind generation
+            data. None will read the flags from the generation meta data if
+            needed. Offshore resource gids do not require a variable power
+            density.
+
+        Returns
+        -------
+        power_density : float | None | np.ndarray
+            Constant power density float, None, or float32 array of variable
+            power density values indexed by resource gid.
+        """
+
+        power_density = SupplyCurveAggFileHandler._parse_power_density(
+            self._power_density)
+
+        if isinstance(power_density, np.ndarray):
+            if len(power_density) < len(self._gen_index):
+                n_pad = len(self._gen_index) - len(power_density)
+                power_density = np.append(
+                    power_density, np.full(n_pad, np.nan, dtype=np.float32))
+
+            if offshore_flags is None:
+                with Resource(self._gen_fpath) as f:
+                    if 'offshore' in f.meta:
+                        offshore_flags = f.meta['offshore'].values
+
+            res_gids = self._get_techmap_res_gids(
+                offshore_flags=offshore_flags)
+            missing = res_gids[np.isnan(power_density[res_gids])]
+            if missing.size:
+                msg = ('Variable power density input is missing the '
+                       'following resource GIDs: {}'.format(missing.tolist()))
+                logger.error(msg)
+                raise FileInputError(msg)
+
+        return power_density
+
     @staticmethod
     def _get_input_data(gen, gen_fpath, econ_fpath, res_class_dset,
                         res_class_bins, cf_dset, lcoe_dset, h5_dsets):
@@ -846,7 +977,8 @@ class SupplyCurveAggregation(AbstractAggregation):
                    args=None, res_class_dset=None, res_class_bins=None,
                    cf_dset='cf_mean-means', lcoe_dset='lcoe_fcr-means',
                    h5_dsets=None, data_layers=None, power_density=None,
-                   friction_fpath=None, friction_dset=None, excl_area=0.0081):
+                   friction_fpath=None, friction_dset=None, excl_area=0.0081,
+                   input_data=None):
         """Standalone method to create agg summary - can be parallelized.
 
         Parameters
@@ -858,10 +990,11 @@ class SupplyCurveAggregation(AbstractAggregation):
         tm_dset : str
             Dataset name in the exclusions file containing the
             exclusions-to-resource mapping data.
-        gen_index : np.ndarray
+        gen_index : np.ndarray | SharedArray
             Array of generation gids with array index equal to resource gid.
             Array value is -1 if the resource index was not used in the
-            generation run.
+            generation run. Can be a shared array reference from the parent
+            process.
         econ_fpath : str | None
             Filepath to .h5 reV econ output results. This is optional and only
             used if the lcoe_dset is not present in the gen_fpath file.
@@ -905,7 +1038,8 @@ class SupplyCurveAggregation(AbstractAggregation):
             power density from the generation meta data technology.
             Variable power density csvs must have "gid" and "power_density"
             columns where gid is the resource gid (typically wtk or nsrdb gid)
-            and the power_density column is in MW/km2.
+            and the power_density column is in MW/km2. Can also be a
+            pre-parsed array of power densities indexed by resource gid.
         friction_fpath : str | None
             Filepath to friction surface data (cost based exclusions).
             Must be paired with friction_dset. The friction data must be the
@@ -918,6 +1052,11 @@ class SupplyCurveAggregation(AbstractAggregation):
             exclusions.
         excl_area : float
             Area of an exclusion cell (square km).
+        input_data : tuple | None
+            Pre-extracted output from _get_input_data(), optionally with the
+            arrays replaced by shared array references from the parent
+            process. None will extract the input data from the gen/econ
+            files.
 
         Returns
         -------
@@ -926,6 +1065,7 @@ class SupplyCurveAggregation(AbstractAggregation):
         """
 
         summary = []
+        gen_index = SharedArrays.attach(gen_index)
 
         with SupplyCurveExtent(excl_fpath, resolution=resolution) as sc:
             points = sc.points
@@ -945,27 +1085,25 @@ class SupplyCurveAggregation(AbstractAggregation):
                        'check_excl_layers': check_excl_layers}
         with SupplyCurveAggFileHandler(excl_fpath, gen_fpath,
                                        **file_kwargs) as fh:
-            inputs = SupplyCurveAggregation._get_input_data(fh.gen,
-                                                            gen_fpath,
-                                                            econ_fpath,
-                                                            res_class_dset,
-                                                            res_class_bins,
-                                                            cf_dset,
-                                                            lcoe_dset,
-                                                            h5_dsets)
+            if input_data is None:
+                inputs = SupplyCurveAggregation._get_input_data(
+                    fh.gen, gen_fpath, econ_fpath, res_class_dset,
+                    res_class_bins, cf_dset, lcoe_dset, h5_dsets)
+            else:
+                inputs = SharedArrays.attach(input_data)
 
             n_finished = 0
             for gid in gids:
-                for ri, res_bin in enumerate(inputs[1]):
-                    try:
-                        pointsum = SupplyCurvePointSummary.summarize(
+                try:
+                    pointsums = \
+                        SupplyCurvePointSummary.summarize_res_classes(
                             gid,
                             fh.exclusions,
                             fh.gen,
                             tm_dset,
                             gen_index,
                             res_class_dset=inputs[0],
-                            res_class_bin=res_bin,
+                            res_class_bins=inputs[1],
                             cf_dset=inputs[2],
                             lcoe_dset=inputs[3],
                             h5_dsets=inputs[5],
@@ -980,27 +1118,65 @@ class SupplyCurveAggregation(AbstractAggregation):
                             offshore_flags=inputs[4],
                             friction_layer=fh.friction_layer)
 
-                    except EmptySupplyCurvePointError:
-                        pass
-
-                    except Exception:
-                        logger.exception('SC gid {} failed!'.format(gid))
-                        raise
+                except Exception:
+                    logger.exception('SC gid {} failed!'.format(gid))
+                    raise
 
-                    else:
-                        pointsum['sc_point_gid'] = gid
-                        pointsum['sc_row_ind'] = points.loc[gid, 'row_ind']
-                        pointsum['sc_col_ind'] = points.loc[gid, 'col_ind']
-                        pointsum['res_class'] = ri
+                for ri, pointsum in pointsums.items():
+                    pointsum['sc_point_gid'] = gid
+                    pointsum['sc_row_ind'] = points.loc[gid, 'row_ind']
+                    pointsum['sc_col_ind'] = points.loc[gid, 'col_ind']
+                    pointsum['res_class'] = ri
 
-                        summary.append(pointsum)
-                        n_finished += 1
-                        logger.debug('Serial aggregation: '
-                                     '{} out of {} points complete'
-                                     .format(n_finished, len(gids)))
+                    summary.append(pointsum)
+                    n_finished += 1
+                    logger.debug('Serial aggregation: '
+                                 '{} out of {} points complete'
+                                 .format(n_finished, len(gids)))
 
         return summary
 
+    def _get_shared_inputs(self, shared):
+        """Extract the gen/econ input data, generation index, and variable
+        power density once in the parent process and share them with the
+        parallel workers as read-only memory maps.
+
+        Parameters
+        ----------
+        shared : SharedArrays
+            Open shared array manager that owns the shared data files.
+
+        Returns
+        -------
+        input_data : tuple
+            Output from _get_input_data() with all arrays replaced by shared
+            array references.
+        gen_index : SharedArray | None
+            Shared reference to the generation gid index array.
+        power_density : float | None | SharedArray
+            Constant power density or shared reference to the variable power
+            density array.
+        """
+
+        with SupplyCurveAggFileHandler._open_gen_econ_resource(
+                self._gen_fpath, self._econ_fpath) as gen:
+            input_data = self._get_input_data(gen, self._gen_fpath,
+                                              self._econ_fpath,
+                                              self._res_class_dset,
+                                              self._res_class_bins,
+                                              self._cf_dset,
+                                              self._lcoe_dset,
+                                              self._h5_dsets)
+
+        power_density = self._get_power_density(
+            offshore_flags=input_data[4])
+
+        input_data = shared.share_all(input_data)
+        gen_index = shared.share_all(self._gen_index)
+        power_density = shared.share_all(power_density)
+
+        return input_data, gen_index, power_density
+
     def run_parallel(self, args=None, excl_area=0.0081, max_workers=None):
         """Get the supply curve points aggregation summary using futures.
 
@@ -1034,39 +1210,45 @@ class SupplyCurveAggregation(AbstractAggregation):
         futures = []
         summary = []
         loggers = [__name__, 'reV.supply_curve.point_summary', 'reV']
-        with SpawnProcessPool(max_workers=max_workers, loggers=loggers) as exe:
-
-            # iterate through split executions, submitting each to worker
-            for gid_set in chunks:
-                # submit executions and append to futures list
-                futures.append(exe.submit(
-                    self.run_serial,
-                    self._excl_fpath, self._gen_fpath,
-                    self._tm_dset, self._gen_index,
-                    econ_fpath=self._econ_fpath,
-                    excl_dict=self._excl_dict,
-                    res_class_dset=self._res_class_dset,
-                    res_class_bins=self._res_class_bins,
-                    cf_dset=self._cf_dset,
-                    lcoe_dset=self._lcoe_dset,
-                    h5_dsets=self._h5_dsets,
-                    data_layers=self._data_layers,
-                    resolution=self._resolution,
-                    power_density=self._power_density,
-                    friction_fpath=self._friction_fpath,
-                    friction_dset=self._friction_dset,
-                    area_filter_kernel=self._area_filter_kernel,
-                    min_area=self._min_area,
-                    gids=gid_set, args=args, excl_area=excl_area,
-                    check_excl_layers=self._check_excl_layers))
-
-            # gather results
-            for future in as_completed(futures):
-                n_finished += 1
-                logger.info('Parallel aggregation futures collected: '
-                            '{} out of {}'
-                            .format(n_finished, len(chunks)))
-                summary += future.result()
+        with SharedArrays() as shared:
+            input_data, gen_index, power_density = \
+                self._get_shared_inputs(shared)
+
+            with SpawnProcessPool(max_workers=max_workers,
+                                  loggers=loggers) as exe:
+
+                # iterate through split executions, submitting each to worker
+                for gid_set in chunks:
+                    # submit executions and append to futures list
+                    futures.append(exe.submit(
+                        self.run_serial,
+                        self._excl_fpath, self._gen_fpath,
+                        self._tm_dset, gen_index,
+                        econ_fpath=self._econ_fpath,
+                        excl_dict=self._excl_dict,
+                        res_class_dset=self._res_class_dset,
+                        res_class_bins=self._res_class_bins,
+                        cf_dset=self._cf_dset,
+                        lcoe_dset=self._lcoe_dset,
+                        h5_dsets=self._h5_dsets,
+                        data_layers=self._data_layers,
+                        resolution=self._resolution,
+                        power_density=power_density,
+                        friction_fpath=self._friction_fpath,
+                        friction_dset=self._friction_dset,
+                        area_filter_kernel=self._area_filter_kernel,
+                        min_area=self._min_area,
+                        gids=gid_set, args=args, excl_area=excl_area,
+                        check_excl_layers=self._check_excl_layers,
+                        input_data=input_data))
+
+                # gather results
+                for future in as_completed(futures):
+                    n_finished += 1
+                    logger.info('Parallel aggregation futures collected: '
+                                '{} out of {}'
+                                .format(n_finished, len(chunks)))
+                    summary += future.result()
 
         return summary
 
@@ -1168,13 +1350,17 @@ class SupplyCurveAggregation(AbstractAggregation):
             return bbins
 
     @staticmethod
-    def _summary_to_df(summary):
+    def _summary_to_df(summary, data_layers=None):
         """Convert the agg summary list to a DataFrame.
 
         Parameters
         ----------
         summary : list
             List of dictionaries, each being an SC point summary.
+        data_layers : None | dict
+            Aggregation data layers. The compact count arrays of "category"
+            layers with "categories" are expanded into one
+            "<layer>_<category>" column per category.
 
         Returns
         -------
@@ -1182,6 +1368,23 @@ class SupplyCurveAggregation(AbstractAggregation):
             Summary of the SC points.
         """
         summary = pd.DataFrame(summary)
+
+        for name, attrs in (data_layers or {}).items():
+            categories = attrs.get('categories', None)
+            if categories is None or name not in summary:
+                continue
+
+            counts = np.full((len(summary), len(categories)), np.nan,
+                             dtype=np.float32)
+            for i, arr in enumerate(summary[name].values):
+                if isinstance(arr, np.ndarray):
+                    counts[i] = arr
+
+            columns = ['{}_{}'.format(name, c) for c in categories]
+            counts = pd.DataFrame(counts, columns=columns,
+                                  index=summary.index)
+            summary = pd.concat([summary.drop(columns=name), counts], axis=1)
+
         summary = summary.sort_values('sc_point_gid')
         summary = summary.reset_index(drop=True)
         summary.index.name = 'sc_gid'
@@ -1223,6 +1426,7 @@ class SupplyCurveAggregation(AbstractAggregation):
         if max_workers == 1:
             afk = self._area_filter_kernel
             chk = self._check_excl_layers
+            power_density = self._get_power_density()
             summary = self.run_serial(self._excl_fpath, self._gen_fpath,
                                       self._tm_dset, self._gen_index,
                                       econ_fpath=self._econ_fpath,
@@ -1234,7 +1438,7 @@ class SupplyCurveAggregation(AbstractAggregation):
                                       h5_dsets=self._h5_dsets,
                                       data_layers=self._data_layers,
                                       resolution=self._resolution,
-                                      power_density=self._power_density,
+                                      power_density=power_density,
                                       friction_fpath=self._friction_fpath,
                                       friction_dset=self._friction_dset,
                                       area_filter_kernel=afk,
@@ -1258,7 +1462,7 @@ class SupplyCurveAggregation(AbstractAggregation):
             logger.error(e)
             raise EmptySupplyCurvePointError(e)
 
-        summary = self._summary_to_df(summary)
+        summary = self._summary_to_df(summary, data_layers=self._data_layers)
         summary = OffshoreAggregation._agg_data_layers(self._data_layers,
                                                        summary)
 
@@ -1320,7 +1524,10 @@ class SupplyCurveAggregation(AbstractAggregation):
         data_layers : None | dict
             Aggregation data layers. Must be a dictionary keyed by data label
             name. Each value must be another dictionary with "dset", "method",
-            and "fpath".
+            and "fpath". "category" layers can also have a "categories"
+            list to output the exclusion-weighted pixel counts in one
+            "<layer>_<category>" column per category instead of json
+            strings.
         power_density : float | str | None
             Power density in MW/km2 or filepath to variable power
             density file. None will attempt to infer a constant
@@ -4,7 +4,9 @@ reV supply curve module
 - Calculation of LCOT
 - Supply Curve creation
 """
+from concurrent.futures import as_completed
 from copy import deepcopy
+import heapq
 import os
 import logging
 import numpy as np
@@ -15,6 +17,7 @@ from reV.handlers.transmission import TransmissionCosts as TC
 from reV.handlers.transmission import TransmissionFeatures as TF
 from reV.supply_curve.competitive_wind_farms import CompetitiveWindFarms
 from reV.utilities.exceptions import SupplyCurveInputError, SupplyCurveError
+from reV.utilities.shared_arrays import SharedArrays
 
 from rex.utilities import parse_table, SpawnProcessPool
 
@@ -25,6 +28,12 @@ class SupplyCurve:
     """
     Class to handle LCOT calcuation and SupplyCurve sorting
     """
+
+    SCENARIO_KWARGS = ('fcr', 'simple', 'transmission_costs', 'line_limited',
+                       'consider_friction', 'sort_on', 'columns', 'wind_dirs',
+                       'n_dirs', 'downwind', 'offshore_compete')
+    TRANS_TABLE_COLUMNS = TF.FEATURE_COLUMNS + ('dist_mi', 'farm_gid')
+
     def __init__(self, sc_points, trans_table, fcr, sc_features=None,
                  transmission_costs=None, line_limited=False,
                  connectable=True, max_workers=None, consider_friction=True,
@@ -65,18 +74,53 @@ class SupplyCurve:
         logger.info('Supply curve points input: {}'.format(sc_points))
         logger.info('Transmission table input: {}'.format(trans_table))
 
+        self._sc_points, self._trans_table = \
+            self._parse_tables(sc_points, trans_table,
+                               sc_features=sc_features,
+                               offshore_trans_table=offshore_trans_table)
+        self._init_scenario(fcr, transmission_costs=transmission_costs,
+                            line_limited=line_limited,
+                            connectable=connectable,
+                            max_workers=max_workers,
+                            consider_friction=consider_friction)
+
+    def _init_scenario(self, fcr, transmission_costs=None,
+                       line_limited=False, connectable=True,
+                       max_workers=None, consider_friction=True,
+                       feature_cap=None):
+        """Compute LCOT for all possible connections in the merged trans
+        table and initialize the transmission features handler.
+
+        Parameters
+        ----------
+        fcr : float
+            Fixed charge rate, used to compute LCOT
+        transmission_costs : str | dict
+            Transmission feature costs to use with TransmissionFeatures
+            handler: line_tie_in_cost, line_cost, station_tie_in_cost,
+            center_tie_in_cost, sink_tie_in_cost
+        line_limited : bool
+            Substation connection is limited by maximum capacity of the
+            attached lines, legacy method
+        connectable : bool
+            Determine if connection is possible
+        max_workers : int | NoneType
+            Number of workers to use to compute lcot, if > 1 run in parallel.
+            None uses all available cpu's.
+        consider_friction : bool
+            Flag to consider friction layer on LCOE.
+        feature_cap : pd.DataFrame | None
+            Pre-computed transmission feature capacity from
+            TransmissionFeatures.feature_capacity(), None will compute the
+            feature capacity from the trans table.
+        """
         trans_costs = transmission_costs
-        self._sc_points = self._parse_sc_points(sc_points,
-                                                sc_features=sc_features)
-        self._trans_table = \
-            self._merge_sc_trans_tables(self._sc_points, trans_table,
-                                        offshore_table=offshore_trans_table)
-        self._check_sc_trans_table(self._sc_points, self._trans_table)
         self._trans_table = self._add_trans_lcot(self._trans_table, fcr,
                                                  trans_costs=trans_costs,
                                                  line_limited=line_limited,
                                                  connectable=connectable,
-                                                 max_workers=max_workers)
+                                                 max_workers=max_workers,
+                                                 feature_cap=feature_cap)
         self._trans_features = self._create_handler(self._trans_table,
                                                     trans_costs=trans_costs)
 
@@ -104,6 +148,42 @@ class SupplyCurve:
 
         return self._sc_points.iloc[i]
 
+    @classmethod
+    def _parse_tables(cls, sc_points, trans_table, sc_features=None,
+                      offshore_trans_table=None):
+        """Parse the supply curve points and merge them with the
+        transmission table.
+
+        Parameters
+        ----------
+        sc_points : str | pandas.DataFrame
+            Path to .csv or .json or DataFrame containing supply curve
+            point summary
+        trans_table : str | pandas.DataFrame
+            Path to .csv or .json or DataFrame containing supply curve
+            transmission mapping
+        sc_features : str | pandas.DataFrame
+            Path to .csv or .json or DataFrame containing additional supply
+            curve features, e.g. transmission multipliers, regions
+        offshore_trans_table : str, optional
+            Path to offshore transmission table, if None offshore sc points
+            will not be included, by default None
+
+        Returns
+        -------
+        sc_points : pandas.DataFrame
+            Supply curve points table
+        trans_table : pandas.DataFrame
+            Transmission table merged with the supply curve points
+        """
+        sc_points = cls._parse_sc_points(sc_points, sc_features=sc_features)
+        trans_table = \
+            cls._merge_sc_trans_tables(sc_points, trans_table,
+                                       offshore_table=offshore_trans_table)
+        cls._check_sc_trans_table(sc_points, trans_table)
+
+        return sc_points, trans_table
+
     @staticmethod
     def _parse_sc_points(sc_points, sc_features=None):
         """
@@ -177,10 +257,33 @@ class SupplyCurve:
 
         return merge_cols
 
+    @classmethod
+    def _trans_table_column(cls, name):
+        """Check if a transmission table column is needed to build the
+        supply curve, used to project all trans table inputs.
+
+        Parameters
+        ----------
+        name : str
+            Transmission table column name.
+
+        Returns
+        -------
+        bool
+            True if the column is a transmission feature column or a
+            supply curve row/col id column used for merging.
+        """
+        return (name in cls.TRANS_TABLE_COLUMNS
+                or (name.startswith('sc_') and ('row' in name
+                                                or 'col' in name)))
+
     @staticmethod
     def _parse_trans_table(trans_table):
         """
-        Import transmission features table
+        Import transmission features table projected to the columns needed
+        to build the supply curve. Columnar .parquet, .feather, and .h5
+        tables are only read for these columns, other inputs are projected
+        after they are loaded.
 
         Parameters
         ----------
@@ -194,12 +297,10 @@ class SupplyCurve:
             Loaded transmission feature table.
         """
 
-        trans_table = parse_table(trans_table)
-
-        drop_cols = ['sc_gid', 'cap_left', 'sc_point_gid']
-        drop_cols = [c for c in drop_cols if c in trans_table]
-        if drop_cols:
-            trans_table = trans_table.drop(columns=drop_cols)
+        columns = SupplyCurve._trans_table_column
+        trans_table = TF._parse_table(trans_table, columns=columns)
+        trans_table = trans_table[TF._project_columns(trans_table.columns,
+                                                      columns=columns)]
 
         return trans_table
 
@@ -269,10 +370,114 @@ class SupplyCurve:
         sc_cols = sc_cols + merge_cols
         sc_points = sc_points[sc_cols].copy()
 
-        trans_table = trans_table.merge(sc_points, on=merge_cols, how='inner')
+        trans_table = SupplyCurve._merge_on_keys(trans_table, sc_points,
+                                                 merge_cols)
 
         return trans_table
 
+    @staticmethod
+    def _get_merge_keys(table, merge_cols, n_cols):
+        """Get compact integer merge keys from the supply curve row and
+        column ids.
+
+        Parameters
+        ----------
+        table : pd.DataFrame
+            Table with numeric supply curve row and column id columns.
+        merge_cols : list
+            Supply curve row and column id column labels.
+        n_cols : int
+            Number of supply curve columns, must be greater than all column
+            ids.
+
+        Returns
+        -------
+        keys : np.ndarray
+            int64 key for each table row, -1 where the row or column id is
+            not a non-negative integer, e.g. NaN.
+        """
+        rows = table[merge_cols[0]].values
+        cols = table[merge_cols[1]].values
+        with np.errstate(invalid='ignore'):
+            valid = ((rows >= 0) & (cols >= 0)
+                     & (rows == np.floor(rows)) & (cols == np.floor(cols)))
+
+        keys = np.full(len(table), -1, dtype=np.int64)
+        keys[valid] = (rows[valid].astype(np.int64) * n_cols
+                       + cols[valid].astype(np.int64))
+
+        return keys
+
+    @staticmethod
+    def _merge_on_keys(trans_table, sc_points, merge_cols,
+                       chunk_size=1000000):
+        """Inner merge of supply curve point columns into the transmission
+        table on compact integer row/col keys.
+
+        The transmission table keys are matched to the supply curve points
+        in chunks so that only one chunk of keys is held in memory at a time.
+        The merged table is then gathered column by column into a new
+        DataFrame. Rows are ordered
+        the same as an inner pandas merge (grouped by key in order of first
+        appearance). Tables that cannot be keyed on unique non-negative
+        integer ids fall back to a pandas merge.
+
+        Parameters
+        ----------
+        trans_table : pd.DataFrame
+            Table mapping supply curve points to transmission features.
+        sc_points : pd.DataFrame
+            Supply curve point columns to merge into the trans table,
+            including the merge columns.
+        merge_cols : list
+            Supply curve row and column id column labels.
+        chunk_size : int
+            Number of trans table rows to match at a time.
+
+        Returns
+        -------
+        trans_table : pd.DataFrame
+            Transmission table with the supply curve point columns.
+        """
+        sc_cols = [c for c in sc_points if c not in merge_cols]
+        numeric = all(np.issubdtype(df[c].dtype, np.number)
+                      for df in (trans_table, sc_points) for c in merge_cols)
+        keyed = (numeric and len(merge_cols) == 2
+                 and not any(c in trans_table for c in sc_cols))
+        if keyed:
+            n_cols = 1 + int(np.nanmax([trans_table[merge_cols[1]].max(),
+                                        sc_points[merge_cols[1]].max(), 0]))
+            sc_keys = SupplyCurve._get_merge_keys(sc_points, merge_cols,
+                                                  n_cols)
+            keyed = ((sc_keys >= 0).all()
+                     and len(np.unique(sc_keys)) == len(sc_keys))
+
+        if not keyed:
+            logger.debug('Cannot merge on compact integer keys, using a '
+                         'pandas merge.')
+            return trans_table.merge(sc_points, on=merge_cols, how='inner')
+
+        sc_order = np.argsort(sc_keys)
+        sc_keys = sc_keys[sc_order]
+        pos = np.full(len(trans_table), -1, dtype=np.int64)
+        for i in range(0, len(trans_table), chunk_size):
+            keys = SupplyCurve._get_merge_keys(
+                trans_table.iloc[i:i + chunk_size], merge_cols, n_cols)
+            j = np.minimum(np.searchsorted(sc_keys, keys), len(sc_keys) - 1)
+            match = (keys >= 0) & (sc_keys[j] == keys)
+            pos[i:i + chunk_size][match] = sc_order[j[match]]
+
+        rows = np.where(pos >= 0)[0]
+        codes = pd.factorize(pos[rows])[0]
+        rows = rows[np.argsort(codes, kind='stable')]
+        pos = pos[rows]
+
+        merged = {c: trans_table[c].values[rows] for c in trans_table}
+        for c in sc_cols:
+            merged[c] = sc_points[c].values[pos]
+
+        return pd.DataFrame(merged)
+
     @staticmethod
     def _check_sc_trans_table(sc_points, trans_table):
         """Run self checks on sc_points table and the merged trans_table
@@ -312,7 +517,7 @@ class SupplyCurve:
                      .format(trans_table.columns.values.tolist()))
 
     @staticmethod
-    def _feature_capacity(trans_table, trans_costs=None):
+    def _feature_capacity(trans_table, trans_costs=None, feature_cap=None):
         """
         Add the transmission connection feature capacity to the trans table.
 
@@ -324,6 +529,10 @@ class SupplyCurve:
             Transmission feature costs to use with TransmissionFeatures
             handler: line_tie_in_cost, line_cost, station_tie_in_cost,
             center_tie_in_cost, sink_tie_in_cost
+        feature_cap : pd.DataFrame | None
+            Pre-computed transmission feature capacity from
+            TransmissionFeatures.feature_capacity(), None will compute the
+            feature capacity from the trans table.
 
         Returns
         -------
@@ -331,12 +540,11 @@ class SupplyCurve:
             Table mapping supply curve points to transmission features with
             'avail_cap' column.
         """
-        avc = 0.1
-        if trans_costs is not None:
-            if 'available_capacity' in trans_costs:
-                avc = trans_costs['available_capacity']
+        if feature_cap is None:
+            avc = SupplyCurve._available_capacity_frac(trans_costs)
+            feature_cap = TF.feature_capacity(trans_table,
+                                              available_capacity=avc)
 
-        feature_cap = TF.feature_capacity(trans_table, available_capacity=avc)
         dtype = trans_table['trans_line_gid'].dtype
         feature_cap['trans_line_gid'] = \
             feature_cap['trans_line_gid'].astype(dtype)
@@ -344,10 +552,33 @@ class SupplyCurve:
 
         return trans_table
 
+    @staticmethod
+    def _available_capacity_frac(trans_costs=None):
+        """Get the fraction of transmission feature capacity that is
+        available for connection.
+
+        Parameters
+        ----------
+        trans_costs : str | dict | None
+            Transmission feature costs to use with TransmissionFeatures
+            handler, may include "available_capacity".
+
+        Returns
+        -------
+        avc : float
+            Available capacity fraction, default is 0.1
+        """
+        avc = 0.1
+        if trans_costs is not None:
+            if 'available_capacity' in trans_costs:
+                avc = trans_costs['available_capacity']
+
+        return avc
+
     @staticmethod
     def _add_trans_lcot(trans_table, fcr, trans_costs=None,
                         line_limited=False, connectable=True,
-                        max_workers=None):
+                        max_workers=None, feature_cap=None):
         """Compute LCOT for possible connections and add to the trans_table
 
         Parameters
@@ -368,6 +599,10 @@ class SupplyCurve:
         max_workers : int | NoneType
             Number of workers to use to compute lcot, if > 1 run in parallel.
             None uses all available cpu's.
+        feature_cap : pd.DataFrame | None
+            Pre-computed transmission feature capacity from
+            TransmissionFeatures.feature_capacity(), None will compute the
+            feature capacity from the trans table.
 
         Returns
         -------
@@ -377,7 +612,8 @@ class SupplyCurve:
         """
 
         trans_table = SupplyCurve._feature_capacity(trans_table,
-                                                    trans_costs=trans_costs)
+                                                    trans_costs=trans_costs,
+                                                    feature_cap=feature_cap)
         trans_table = trans_table.sort_values('sc_gid')
         lcot, cost = SupplyCurve._compute_lcot(trans_table, fcr,
                                                trans_costs=trans_costs,
@@ -455,13 +691,39 @@ class SupplyCurve:
 
         return trans_table, sc_gids, mask
 
+    @staticmethod
+    def _check_sc_capacity(trans_table):
+        """Check that each supply curve point has a single capacity.
+
+        Parameters
+        ----------
+        trans_table : pd.DataFrame
+            Table mapping supply curve points to transmission features
+            with supply curve point capacity.
+        """
+        n_caps = trans_table.groupby('sc_gid')['capacity'].nunique()
+        bad = n_caps.index[n_caps.values > 1]
+        if len(bad):
+            sc_gid = bad[0]
+            capacity = trans_table.loc[trans_table['sc_gid'] == sc_gid,
+                                       'capacity'].unique()
+            msg = ('Each supply curve point should only have '
+                   'a single capacity, but {} has {}'
+                   .format(sc_gid, capacity))
+            logger.error(msg)
+            raise RuntimeError(msg)
+
     @staticmethod
     def _compute_lcot(trans_table, fcr, trans_costs=None, max_workers=None,
-                      connectable=True, line_limited=False):
+                      connectable=True, line_limited=False,
+                      block_size=100000):
         """
         Compute levelized cost of transmission for all combinations of
         supply curve points and tranmission features in trans_table
 
+        Costs are computed for all rows at once. The table is only split
+        across parallel workers in large row blocks.
+
         Parameters
         ----------
         trans_table : pd.DataFrame
@@ -481,6 +743,9 @@ class SupplyCurve:
         line_limited : bool
             Substation connection is limited by maximum capacity of the
             attached lines, legacy method
+        block_size : int
+            Approximate number of trans_table rows per parallel worker.
+            Tables with at most block_size rows are computed in serial.
 
         Returns
         -------
@@ -504,50 +769,34 @@ class SupplyCurve:
         if max_workers is None:
             max_workers = os.cpu_count()
 
+        capacity = None
+        if connectable:
+            SupplyCurve._check_sc_capacity(trans_table)
+            capacity = trans_table['capacity'].values
+
         logger.info('Computing LCOT costs for all possible connections...')
-        if max_workers > 1:
-            groups = trans_table.groupby('sc_gid')
+        n_blocks = int(np.min((max_workers,
+                               np.ceil(len(trans_table) / block_size))))
+        if n_blocks > 1:
+            blocks = np.array_split(np.arange(len(trans_table)), n_blocks)
             loggers = [__name__, 'reV.handlers.transmission', 'reV']
             with SpawnProcessPool(max_workers=max_workers,
                                   loggers=loggers) as exe:
                 futures = []
-                for sc_gid, sc_table in groups:
-                    if connectable:
-                        capacity = sc_table['capacity'].unique()
-                        if len(capacity) == 1:
-                            capacity = capacity[0]
-                        else:
-                            msg = ('Each supply curve point should only have '
-                                   'a single capacity, but {} has {}'
-                                   .format(sc_gid, capacity))
-                            logger.error(msg)
-                            raise RuntimeError(msg)
-                    else:
-                        capacity = None
-
-                    futures.append(exe.submit(TC.feature_costs, sc_table,
-                                              capacity=capacity,
+                for block in blocks:
+                    block_cap = None if capacity is None else capacity[block]
+                    futures.append(exe.submit(TC.feature_costs,
+                                              trans_table.iloc[block],
+                                              capacity=block_cap,
                                               line_limited=line_limited,
                                               **trans_costs))
 
                 cost = [future.result() for future in futures]
                 cost = np.hstack(cost)
         else:
-            feature = TC(trans_table, line_limited=line_limited,
-                         **trans_costs)
-            cost = []
-            for _, row in trans_table.iterrows():
-                if connectable:
-                    capacity = row['capacity']
-                else:
-                    capacity = None
-
-                tm = row.get('transmission_multiplier', 1)
-                cost.append(feature.cost(row['trans_line_gid'], row['dist_mi'],
-                                         capacity=capacity,
-                                         transmission_multiplier=tm))
-
-            cost = np.array(cost, dtype='float32')
+            cost = TC.feature_costs(trans_table, capacity=capacity,
+                                    line_limited=line_limited,
+                                    **trans_costs)
 
         cf_mean_arr = trans_table['mean_cf'].values
         lcot = (cost * fcr) / (cf_mean_arr * 8760)
@@ -588,22 +837,11 @@ class SupplyCurve:
         comp_wind_dirs : CompetitiveWindFarms
             updated CompetitiveWindFarms instance
         """
-        gid = comp_wind_dirs.check_sc_gid(sc_gid)
-        if gid is not None:
-            if comp_wind_dirs.mask[gid]:
-                exclude_gids = comp_wind_dirs['upwind', gid]
-                if downwind:
-                    exclude_gids = np.append(exclude_gids,
-                                             comp_wind_dirs['downwind', gid])
-                for n in exclude_gids:
-                    check = comp_wind_dirs.exclude_sc_point_gid(n)
-                    if check:
-                        sc_gids = comp_wind_dirs['sc_gid', n]
-                        for sc_id in sc_gids:
-                            if self._mask[sc_id]:
-                                logger.debug('Excluding sc_gid {}'
-                                             .format(sc_id))
-                                self._mask[sc_id] = False
+        sc_gids = comp_wind_dirs.exclude_neighbors(sc_gid, downwind=downwind)
+        sc_gids = sc_gids[self._mask[sc_gids]]
+        if len(sc_gids):
+            logger.debug('Excluding sc_gids {}'.format(sc_gids))
+            self._mask[sc_gids] = False
 
         return comp_wind_dirs
 
@@ -624,7 +862,8 @@ class SupplyCurve:
         Returns
         -------
         table : pd.DataFrame
-            Supply curve table with additional summation columns.
+            Supply curve table with additional summation columns. NaN values
+            in the summed columns are set to zero in place.
         """
 
         for new_label, sum_labels in sum_cols.items():
@@ -637,13 +876,84 @@ class SupplyCurve:
                 sum_arr = np.zeros(len(table))
                 for s in sum_labels:
                     temp = table[s].values
-                    temp[np.isnan(temp)] = 0
-                    sum_arr += temp
+                    null = np.isnan(temp)
+                    if null.any():
+                        temp[null] = 0
+                        if not np.shares_memory(temp, table[s].values):
+                            table[s] = temp
+
+                    np.add(sum_arr, temp, out=sum_arr)
 
                 table[new_label] = sum_arr
 
         return table
 
+    @staticmethod
+    def _group_candidates(trans_sc_gids, n_gids):
+        """Group the rows of a sorted transmission table by sc_gid.
+
+        Parameters
+        ----------
+        trans_sc_gids : np.ndarray
+            Integer sc_gid of each row in the sorted transmission table.
+        n_gids : int
+            Number of sc_gids, must be greater than the maximum sc_gid.
+
+        Returns
+        -------
+        order : np.ndarray
+            Row indices of the transmission table grouped by sc_gid. Rows
+            within a group keep their sorted order.
+        ptr : np.ndarray
+            Pointer array of length n_gids + 1 so that the candidate rows for
+            sc_gid are order[ptr[sc_gid]:ptr[sc_gid + 1]].
+        """
+        order = np.argsort(trans_sc_gids, kind='stable')
+        ptr = np.zeros(n_gids + 1, dtype=np.int64)
+        ptr[1:] = np.cumsum(np.bincount(trans_sc_gids, minlength=n_gids))
+
+        return order, ptr
+
+    @staticmethod
+    def _segment_argmin(keys, values):
+        """Find the row with the minimum value for each unique key.
+
+        Parameters
+        ----------
+        keys : np.ndarray
+            Group key of each row, e.g. sc_gid.
+        values : np.ndarray
+            Numeric value of each row to minimize. NaN values are only
+            selected for groups where all values are NaN.
+
+        Returns
+        -------
+        rows : np.ndarray
+            Index of the row with the minimum value for each unique key, in
+            order of ascending key. Ties are resolved to the first row.
+        """
+        if np.all(keys[1:] >= keys[:-1]):
+            order = np.arange(len(keys))
+        else:
+            order = np.argsort(keys, kind='stable')
+
+        keys = keys[order]
+        values = values[order].astype(np.float64)
+        starts = np.where(keys[1:] != keys[:-1])[0] + 1
+        starts = np.concatenate(([0], starts))
+        counts = np.diff(np.append(starts, len(keys)))
+
+        null = np.isnan(values)
+        all_null = np.repeat(np.logical_and.reduceat(null, starts), counts)
+        values[null] = np.inf
+        mins = np.repeat(np.minimum.reduceat(values, starts), counts)
+
+        candidates = np.where((values == mins) & (~null | all_null))[0]
+        segments = np.repeat(np.arange(len(starts)), counts)[candidates]
+        first = np.concatenate(([True], segments[1:] != segments[:-1]))
+
+        return order[candidates[first]]
+
     def _full_sort(self, trans_table, comp_wind_dirs=None,
                    total_lcoe_fric=None, sort_on='total_lcoe',
                    columns=('trans_gid', 'trans_capacity', 'trans_type',
@@ -652,6 +962,13 @@ class SupplyCurve:
         """
         Internal method to handle full supply curve sorting
 
+        Each available supply curve point keeps a cursor to its best
+        remaining candidate connection and a priority queue orders the
+        points by the sorted position of that candidate. A point's cursor is
+        only advanced when a connection fails, so connections are attempted
+        in the same order as walking the sorted table while skipping rows
+        for points that are already connected or excluded.
+
         Parameters
         ----------
         trans_table : pandas.DataFrame
@@ -691,41 +1008,53 @@ class SupplyCurve:
         lcots = trans_table['lcot'].values
         total_lcoes = trans_table['total_lcoe'].values
 
+        order, ptr = self._group_candidates(trans_sc_gids, len(self._mask))
+        cursors = ptr[:-1].copy()
+        gids = np.where(self._mask & (ptr[1:] > ptr[:-1]))[0]
+        candidates = [(int(order[ptr[gid]]), gid) for gid in gids]
+        heapq.heapify(candidates)
+
         connected = 0
         progress = 0
-        for i in range(len(trans_table)):
-            sc_gid = trans_sc_gids[i]
-            if self._mask[sc_gid]:
-                trans_gid = trans_gids[i]
-                connect = self._trans_features.connect(trans_gid,
-                                                       capacities[i])
-                if connect:
-                    connected += 1
-                    logger.debug('Connecting sc gid {}'.format(sc_gid))
-                    self._mask[sc_gid] = False
-
-                    conn_lists['trans_gid'][sc_gid] = trans_gid
-                    conn_lists['trans_capacity'][sc_gid] = trans_cap[i]
-                    conn_lists['trans_type'][sc_gid] = categories[i]
-                    conn_lists['trans_cap_cost'][sc_gid] = trans_cap_costs[i]
-                    conn_lists['dist_mi'][sc_gid] = dists[i]
-                    conn_lists['lcot'][sc_gid] = lcots[i]
-                    conn_lists['total_lcoe'][sc_gid] = total_lcoes[i]
-
-                    if total_lcoe_fric is not None:
-                        conn_lists['total_lcoe_friction'][sc_gid] = \
-                            total_lcoe_fric[i]
-
-                    current_prog = connected // (len(self) / 100)
-                    if current_prog > progress:
-                        progress = current_prog
-                        logger.info('{} % of supply curve points connected'
-                                    .format(progress))
-
-                    if comp_wind_dirs is not None:
-                        comp_wind_dirs = \
-                            self._exclude_noncompetitive_wind_farms(
-                                comp_wind_dirs, sc_gid, downwind=downwind)
+        while candidates:
+            i, sc_gid = heapq.heappop(candidates)
+            if not self._mask[sc_gid]:
+                continue
+
+            trans_gid = trans_gids[i]
+            connect = self._trans_features.connect(trans_gid, capacities[i])
+            if connect:
+                connected += 1
+                logger.debug('Connecting sc gid {}'.format(sc_gid))
+                self._mask[sc_gid] = False
+
+                conn_lists['trans_gid'][sc_gid] = trans_gid
+                conn_lists['trans_capacity'][sc_gid] = trans_cap[i]
+                conn_lists['trans_type'][sc_gid] = categories[i]
+                conn_lists['trans_cap_cost'][sc_gid] = trans_cap_costs[i]
+                conn_lists['dist_mi'][sc_gid] = dists[i]
+                conn_lists['lcot'][sc_gid] = lcots[i]
+                conn_lists['total_lcoe'][sc_gid] = total_lcoes[i]
+
+                if total_lcoe_fric is not None:
+                    conn_lists['total_lcoe_friction'][sc_gid] = \
+                        total_lcoe_fric[i]
+
+                current_prog = connected // (len(self) / 100)
+                if current_prog > progress:
+                    progress = current_prog
+                    logger.info('{} % of supply curve points connected'
+                                .format(progress))
+
+                if comp_wind_dirs is not None:
+                    comp_wind_dirs = \
+                        self._exclude_noncompetitive_wind_farms(
+                            comp_wind_dirs, sc_gid, downwind=downwind)
+            else:
+                cursors[sc_gid] += 1
+                if cursors[sc_gid] < ptr[sc_gid + 1]:
+                    heapq.heappush(candidates,
+                                   (int(order[cursors[sc_gid]]), sc_gid))
 
         index = range(0, int(1 + np.max(self._sc_gids)))
         connections = pd.DataFrame(conn_lists, index=index)
@@ -881,12 +1210,15 @@ class SupplyCurve:
         if self._consider_friction and 'total_lcoe_friction' in trans_table:
             columns.append('total_lcoe_friction')
 
-        connections = trans_table.sort_values(sort_on).groupby('sc_gid')
-        connections = connections.first()
-        rename = {'trans_line_gid': 'trans_gid',
-                  'category': 'trans_type'}
-        connections = connections.rename(columns=rename)
-        connections = connections[columns].reset_index()
+        sc_gids = trans_table['sc_gid'].values
+        rows = self._segment_argmin(sc_gids, trans_table[sort_on].values)
+        rename = {'trans_gid': 'trans_line_gid',
+                  'trans_type': 'category'}
+        connections = {'sc_gid': sc_gids[rows]}
+        for c in columns:
+            connections[c] = trans_table[rename.get(c, c)].values[rows]
+
+        connections = pd.DataFrame(connections)
 
         supply_curve = self._sc_points.merge(connections, on='sc_gid')
         if wind_dirs is not None:
@@ -1048,3 +1380,218 @@ class SupplyCurve:
                                       offshore_compete=offshore_compete)
 
         return supply_curve
+
+    @classmethod
+    def _from_merged_tables(cls, sc_points, trans_table, fcr, **kwargs):
+        """Initialize a SupplyCurve from supply curve points that have
+        already been parsed and merged with the transmission table.
+
+        Parameters
+        ----------
+        sc_points : pandas.DataFrame
+            Supply curve points table from SupplyCurve._parse_tables()
+        trans_table : pandas.DataFrame
+            Merged transmission table from SupplyCurve._parse_tables()
+        fcr : float
+            Fixed charge rate, used to compute LCOT
+        kwargs : dict
+            Keyword arguments for SupplyCurve._init_scenario()
+
+        Returns
+        -------
+        sc : SupplyCurve
+            SupplyCurve instance ready to be sorted.
+        """
+        sc = cls.__new__(cls)
+        sc._sc_points = sc_points
+        sc._trans_table = trans_table
+        sc._init_scenario(fcr, **kwargs)
+
+        return sc
+
+    @classmethod
+    def _parse_scenarios(cls, scenarios):
+        """Check the scenario definitions for missing or invalid inputs.
+
+        Parameters
+        ----------
+        scenarios : dict
+            Scenario definitions, see SupplyCurve.scenarios()
+
+        Returns
+        -------
+        scenarios : dict
+            Copies of the scenario definitions keyed by scenario name.
+        """
+        out = {}
+        for name, scenario in scenarios.items():
+            scenario = dict(scenario)
+            invalid = [k for k in scenario if k not in cls.SCENARIO_KWARGS]
+            if 'fcr' not in scenario or invalid:
+                msg = ('Supply curve scenario "{}" must have a "fcr" and can '
+                       'only have the following inputs: {}, but received: {}'
+                       .format(name, cls.SCENARIO_KWARGS, list(scenario)))
+                logger.error(msg)
+                raise SupplyCurveInputError(msg)
+
+            out[name] = scenario
+
+        return out
+
+    @classmethod
+    def _run_scenario(cls, sc_points, trans_table, feature_cap, scenario,
+                      out_fpath=None):
+        """Run a single supply curve scenario on the shared base tables.
+
+        Parameters
+        ----------
+        sc_points : pandas.DataFrame | SharedFrame
+            Supply curve points table from SupplyCurve._parse_tables()
+        trans_table : pandas.DataFrame | SharedFrame
+            Merged transmission table from SupplyCurve._parse_tables()
+        feature_cap : pandas.DataFrame | SharedFrame
+            Transmission feature capacity for the scenario's available
+            capacity fraction.
+        scenario : dict
+            Scenario definition, see SupplyCurve.scenarios()
+        out_fpath : str | None
+            Optional .csv filepath to write the supply curve to.
+
+        Returns
+        -------
+        out : pandas.DataFrame | str
+            Scenario supply curve, or out_fpath if the supply curve was
+            written to disk.
+        """
+        sc_points, trans_table, feature_cap = \
+            SharedArrays.attach((sc_points, trans_table, feature_cap))
+
+        scenario = dict(scenario)
+        fcr = scenario.pop('fcr')
+        simple = scenario.pop('simple', False)
+        kwargs = {k: scenario.pop(k) for k in ('transmission_costs',
+                                               'line_limited',
+                                               'consider_friction')
+                  if k in scenario}
+
+        sc = cls._from_merged_tables(sc_points, trans_table, fcr,
+                                     connectable=not simple, max_workers=1,
+                                     feature_cap=feature_cap, **kwargs)
+        if simple:
+            out = sc.simple_sort(**scenario)
+        else:
+            out = sc.full_sort(**scenario)
+
+        if out_fpath is not None:
+            out.to_csv(out_fpath, index=False)
+            out = out_fpath
+
+        return out
+
+    @classmethod
+    def scenarios(cls, sc_points, trans_table, scenarios, sc_features=None,
+                  offshore_trans_table=None, max_workers=None, out_dir=None):
+        """
+        Run a batch of supply curve scenarios. The supply curve points are
+        parsed and merged with the transmission table once and the merged
+        tables are shared read-only with parallel workers that each run a
+        full or simple supply curve scenario.
+
+        Parameters
+        ----------
+        sc_points : str | pandas.DataFrame
+            Path to .csv or .json or DataFrame containing supply curve
+            point summary
+        trans_table : str | pandas.DataFrame
+            Path to .csv or .json or DataFrame containing supply curve
+            transmission mapping
+        scenarios : dict
+            Scenario definitions keyed by scenario name. Each scenario is a
+            dictionary that must have "fcr" and can have any of: "simple"
+            (bool flag to run a simple instead of a full supply curve,
+            default False), "transmission_costs" (including the
+            "available_capacity" fraction), "line_limited",
+            "consider_friction", "sort_on", "columns", "wind_dirs",
+            "n_dirs", "downwind", and "offshore_compete", see
+            SupplyCurve.full() and SupplyCurve.simple()
+        sc_features : str | pandas.DataFrame
+            Path to .csv or .json or DataFrame containing additional supply
+            curve features, e.g. transmission multipliers, regions
+        offshore_trans_table : str, optional
+            Path to offshore transmission table, if None offshore sc points
+            will not be included, by default None
+        max_workers : int | NoneType
+            Number of scenarios to run in parallel, if > 1 run in parallel.
+            None uses all available cpu's.
+        out_dir : str | None
+            Optional directory to write each scenario supply curve to as
+            "{scenario name}.csv".
+
+        Returns
+        -------
+        out : dict
+            Scenario supply curve DataFrames keyed by scenario name, or
+            .csv filepaths if out_dir was given.
+        """
+        scenarios = cls._parse_scenarios(scenarios)
+        sc_points, trans_table = \
+            cls._parse_tables(sc_points, trans_table,
+                              sc_features=sc_features,
+                              offshore_trans_table=offshore_trans_table)
+
+        feature_caps = {}
+        for scenario in scenarios.values():
+            avc = cls._available_capacity_frac(
+                scenario.get('transmission_costs'))
+            if avc not in feature_caps:
+                feature_cap = TF.feature_capacity(trans_table,
+                                                  available_capacity=avc)
+                dtype = trans_table['trans_line_gid'].dtype
+                feature_cap['trans_line_gid'] = \
+                    feature_cap['trans_line_gid'].astype(dtype)
+                feature_caps[avc] = feature_cap
+
+        out_fpaths = {name: None for name in scenarios}
+        if out_dir is not None:
+            os.makedirs(out_dir, exist_ok=True)
+            out_fpaths = {name: os.path.join(out_dir, '{}.csv'.format(name))
+                          for name in scenarios}
+
+        if max_workers is None:
+            max_workers = os.cpu_count()
+
+        logger.info('Running {} supply curve scenarios with {} workers.'
+                    .format(len(scenarios), max_workers))
+        out = {}
+        if max_workers > 1:
+            loggers = [__name__, 'reV.handlers.transmission', 'reV']
+            with SharedArrays() as shared:
+                sc_points, trans_table, feature_caps = \
+                    shared.share_all((sc_points, trans_table, feature_caps))
+                with SpawnProcessPool(max_workers=max_workers,
+                                      loggers=loggers) as exe:
+                    futures = {}
+                    for name, scenario in scenarios.items():
+                        avc = cls._available_capacity_frac(
+                            scenario.get('transmission_costs'))
+                        future = exe.submit(cls._run_scenario, sc_points,
+                                            trans_table, feature_caps[avc],
+                                            scenario,
+                                            out_fpath=out_fpaths[name])
+                        futures[future] = name
+
+                    for i, future in enumerate(as_completed(futures)):
+                        out[futures[future]] = future.result()
+                        logger.info('Completed {} out of {} supply curve '
+                                    'scenarios.'.format(i + 1, len(futures)))
+
+            out = {name: out[name] for name in scenarios}
+        else:
+            for name, scenario in scenarios.items():
+                avc = cls._available_capacity_frac(
+                    scenario.get('transmission_costs'))
+                out[name] = cls._run_scenario(sc_points, trans_table,
+                                              feature_caps[avc], scenario,
+                                              out_fpath=out_fpaths[name])
+
+        return out
@@ -9,6 +9,7 @@ Created on Fri Jun 21 16:05:47 2019
 @author: gbuster
 """
 import h5py
+import hashlib
 from concurrent.futures import as_completed
 import numpy as np
 import os
@@ -16,8 +17,9 @@ from scipy.spatial import cKDTree
 import logging
 from warnings import warn
 
-from reV.supply_curve.points import SupplyCurveExtent
-from reV.utilities.exceptions import FileInputWarning, FileInputError
+from reV.utilities.exceptions import (FileInputWarning, FileInputError,
+                                      reVDeprecationWarning)
+from reV.utilities.shared_arrays import SharedArrays
 
 from rex.resource import Resource
 from rex.utilities.execution import SpawnProcessPool
@@ -28,8 +30,13 @@ logger = logging.getLogger(__name__)
 class TechMapping:
     """Framework to create map between tech layer (exclusions), res, and gen"""
 
+    # Approximate peak memory in bytes per exclusion point being mapped
+    # (coordinate buffers, float64 query copy, distances, and indices)
+    POINT_BYTES = 64
+
     def __init__(self, excl_fpath, res_fpath, dset, distance_upper_bound=0.03,
-                 map_chunk=2560, max_workers=None):
+                 map_chunk=None, max_workers=None, fingerprint_rows=128,
+                 max_worker_mem=1.0):
         """
         Parameters
         ----------
@@ -45,10 +52,19 @@ class TechMapping:
             resource points. None will calculate a good distance based on the
             resource meta data coordinates. 0.03 is a good value for a 4km
             resource grid and finer.
-        map_chunk : int | None
-            Calculation chunk used for the tech mapping calc.
+        map_chunk : None
+            Deprecated and ignored, exclusion coordinates are read in row
+            strips bounded by max_worker_mem.
         max_workers : int | None
             Number of cores to run mapping on. None uses all available cpus.
+        fingerprint_rows : int
+            Number of exclusion rows per coordinate fingerprint. Only the
+            row strips whose coordinate fingerprints changed are remapped
+            when a matching tech map is reused. This is increased as needed
+            to keep the fingerprint attribute small.
+        max_worker_mem : float
+            Approximate peak memory in GB that each worker can use to read
+            and map exclusion coordinates.
         """
 
         self._distance_upper_bound = distance_upper_bound
@@ -56,21 +72,33 @@ class TechMapping:
         self._res_fpath = res_fpath
         self._dset = dset
         self._check_fout()
-        self._map_chunk = map_chunk
+        self._res_coords = None
+        self._res_fingerprint = None
+        self._max_points = int(np.max(
+            (1, max_worker_mem * 1e9 // self.POINT_BYTES)))
 
         if max_workers is None:
             max_workers = os.cpu_count()
         self._max_workers = max_workers
 
-        with SupplyCurveExtent(self._excl_fpath,
-                               resolution=self._map_chunk) as sc:
-            self._map_chunk = sc._res
-            self._n_sc = len(sc)
-            self._excl_shape = sc.exclusions.shape
-            self._n_excl = (self._excl_shape[0] * self._excl_shape[1])
-            logger.info('Initialized TechMapping object with {} calc chunks '
-                        'for {} tech exclusion points'
-                        .format(len(sc), self._n_excl))
+        if map_chunk is not None:
+            msg = ('The TechMapping map_chunk input is deprecated and has no '
+                   'effect, exclusion coordinates are mapped in row strips '
+                   'bounded by max_worker_mem.')
+            logger.warning(msg)
+            warn(msg, reVDeprecationWarning)
+
+        with h5py.File(self._excl_fpath, 'r') as f:
+            self._excl_shape = f['latitude'].shape
+            self._coord_chunks = f['latitude'].chunks
+            if self._coord_chunks is None:
+                self._coord_chunks = (1, self._excl_shape[1])
+
+        self._n_excl = self._excl_shape[0] * self._excl_shape[1]
+        self._fingerprint_rows = int(np.max(
+            (fingerprint_rows, np.ceil(self._excl_shape[0] / 4096))))
+        logger.info('Initialized TechMapping object for {} tech exclusion '
+                    'points'.format(self._n_excl))
 
     def __enter__(self):
         return self
@@ -101,24 +129,6 @@ class TechMapping:
             logger.exception(emsg)
             raise FileInputError(emsg)
 
-    def _init_out_arrays(self):
-        """Initialize full sized output arrays.
-
-        Returns
-        -------
-        ind : np.ndarray
-            1D integer array filled with -1's with length equal to the number
-            of tech exclusion points in the supply curve extent.
-        coords : np.ndarray
-            2D integer array (N, 2) filled with 0's with length equal to the
-            number of tech exclusion points in the supply curve extent.
-        """
-
-        ind = -1 * np.ones((self._n_excl, ), dtype=np.int32)
-        coords = np.zeros((self._n_excl, 2), dtype=np.float32)
-
-        return ind, coords
-
     @property
     def distance_upper_bound(self):
         """Get the upper bound on NN distance between excl and res points.
@@ -133,9 +143,7 @@ class TechMapping:
 
         if self._distance_upper_bound is None:
 
-            with Resource(self._res_fpath, str_decode=False) as res:
-                lats = res.get_meta_arr('latitude')
-
+            lats = self.res_coords[:, 0]
             dists = np.abs(lats - np.roll(lats, 1))
             dists = dists[(dists != 0)]
             self._distance_upper_bound = 1.05 * (2 ** 0.5) * (dists.min() / 2)
@@ -145,71 +153,252 @@ class TechMapping:
 
         return self._distance_upper_bound
 
+    @property
+    def res_coords(self):
+        """Get the resource meta coordinates.
+
+        Returns
+        -------
+        res_coords : np.ndarray
+            (N, 2) array of the resource meta (latitude, longitude)
+            coordinates. Row indices are resource gids.
+        """
+
+        if self._res_coords is None:
+            with Resource(self._res_fpath, str_decode=False) as res:
+                self._res_coords = np.vstack(
+                    (res.get_meta_arr('latitude'),
+                     res.get_meta_arr('longitude'))).T
+
+        return self._res_coords
+
+    @property
+    def res_fingerprint(self):
+        """Get a fingerprint of the resource coordinates and the distance
+        upper bound. Tech maps with a matching fingerprint are valid for this
+        resource file.
+
+        Returns
+        -------
+        res_fingerprint : str
+            sha1 hex digest of the resource meta coordinates and the distance
+            upper bound.
+        """
+
+        if self._res_fingerprint is None:
+            h = hashlib.sha1()
+            h.update(np.ascontiguousarray(self.res_coords,
+                                          dtype=np.float64).tobytes())
+            h.update(repr(float(self.distance_upper_bound)).encode())
+            self._res_fingerprint = h.hexdigest()
+
+        return self._res_fingerprint
+
+    @staticmethod
+    def get_coord_fingerprints(lats, lons, fingerprint_rows):
+        """Get fingerprints of strips of the exclusion coordinates.
+
+        Parameters
+        ----------
+        lats : np.ndarray
+            2D un-projected latitude array of tech exclusion points.
+        lons : np.ndarray
+            2D un-projected longitude array of tech exclusion points.
+        fingerprint_rows : int
+            Number of exclusion rows per fingerprint.
+
+        Returns
+        -------
+        fingerprints : np.ndarray
+            1D uint64 array of coordinate fingerprints, one per strip of
+            fingerprint_rows exclusion rows.
+        """
+
+        fingerprints = []
+        for start in range(0, lats.shape[0], fingerprint_rows):
+            row_slice = slice(start, start + fingerprint_rows)
+            h = hashlib.sha1(np.ascontiguousarray(lats[row_slice]).tobytes())
+            h.update(np.ascontiguousarray(lons[row_slice]).tobytes())
+            fingerprints.append(int.from_bytes(h.digest()[:8], 'little'))
+
+        return np.array(fingerprints, dtype=np.uint64)
+
+    def _get_coord_fingerprints(self):
+        """Get the exclusion coordinate fingerprints without loading the full
+        coordinate arrays. Each strip of fingerprint_rows exclusion rows is
+        read in blocks of full rows with at most max_points points.
+
+        Returns
+        -------
+        fingerprints : np.ndarray
+            1D uint64 array of coordinate fingerprints, one per strip of
+            fingerprint_rows exclusion rows. Identical to
+            get_coord_fingerprints() on the full coordinate arrays.
+        """
+
+        n_rows, n_cols = self._excl_shape
+        fingerprints = []
+        with h5py.File(self._excl_fpath, 'r') as f:
+            for start in range(0, n_rows, self._fingerprint_rows):
+                stop = int(np.min((start + self._fingerprint_rows, n_rows)))
+                blocks = self._get_coord_blocks(slice(start, stop),
+                                                self._excl_shape, (1, n_cols),
+                                                self._max_points)
+                h = hashlib.sha1()
+                for label in ('latitude', 'longitude'):
+                    for block_rows, _ in blocks:
+                        h.update(np.ascontiguousarray(
+                            f[label][block_rows]).tobytes())
+
+                fingerprints.append(int.from_bytes(h.digest()[:8], 'little'))
+
+        return np.array(fingerprints, dtype=np.uint64)
+
+    def _build_res_tree(self):
+        """Build a single KD-tree for the full resource meta coordinates.
+
+        Returns
+        -------
+        res_tree : cKDTree
+            KD-tree of the resource meta (latitude, longitude) coordinates.
+            Tree indices are resource gids.
+        """
+
+        logger.debug('Building resource KD-tree for {} resource points'
+                     .format(len(self.res_coords)))
+
+        # pylint: disable=not-callable
+        res_tree = cKDTree(self.res_coords)
+
+        return res_tree
+
+    def _get_row_strips(self):
+        """Split the exclusion rows into large row-strip work units aligned
+        with the chunking of the coordinate datasets.
+
+        Returns
+        -------
+        row_strips : list
+            List of row slices. Each row strip spans all exclusion columns.
+        """
+        n_rows = self._excl_shape[0]
+        chunk_rows = self._coord_chunks[0]
+        n_chunks = int(np.ceil(n_rows / chunk_rows))
+        n_strips = int(np.min((n_chunks, 4 * self._max_workers)))
+        bounds = np.linspace(0, n_chunks, n_strips + 1).astype(np.int64)
+        bounds = np.minimum(bounds * chunk_rows, n_rows)
+        row_strips = [slice(start, stop) for start, stop
+                      in zip(bounds[:-1], bounds[1:]) if stop > start]
+
+        return row_strips
+
     @staticmethod
-    def _unpack_coords(gids, sc, excl_fpath,
+    def _get_coord_blocks(row_slice, shape, chunks, max_points):
+        """Split a row strip into blocks aligned with the coordinate dataset
+        chunks with at most max_points exclusion points each.
+
+        Parameters
+        ----------
+        row_slice : slice
+            Exclusion row strip to split into blocks.
+        shape : tuple
+            Full exclusions shape (rows, cols).
+        chunks : tuple
+            Chunk shape of the coordinate datasets.
+        max_points : int
+            Maximum number of exclusion points in a block. Blocks are at least
+            one chunk in size.
+
+        Returns
+        -------
+        blocks : list
+            List of (row_slice, col_slice) tuples. Blocks span full exclusion
+            rows unless a single band of chunk rows is larger than max_points.
+        """
+
+        n_cols = shape[1]
+        band_rows = int(np.min((chunks[0], row_slice.stop - row_slice.start)))
+        if band_rows * n_cols <= max_points:
+            step_rows = int(np.max((1, max_points // (band_rows * n_cols))))
+            step_rows *= band_rows
+            step_cols = n_cols
+        else:
+            step_rows = band_rows
+            step_cols = max_points // (band_rows * chunks[1])
+            step_cols = int(np.max((1, step_cols))) * chunks[1]
+
+        blocks = []
+        for r0 in range(row_slice.start, row_slice.stop, step_rows):
+            r1 = int(np.min((r0 + step_rows, row_slice.stop)))
+            for c0 in range(0, n_cols, step_cols):
+                c1 = int(np.min((c0 + step_cols, n_cols)))
+                blocks.append((slice(r0, r1), slice(c0, c1)))
+
+        return blocks
+
+    @staticmethod
+    def _unpack_coords(excl, row_slice, col_slice, buffers,
                        coord_labels=('latitude', 'longitude')):
-        """Unpack the exclusion layer coordinates for TechMapping.
+        """Unpack the exclusion layer coordinates for TechMapping into
+        pre-allocated contiguous float32 buffers.
 
         Parameters
         ----------
-        gids : np.ndarray
-            Supply curve gids with tech exclusion points to map to the
-            resource meta points.
-        sc : SupplyCurveExtent
-            reV supply curve extent object
-        excl_fpath : str
-            .h5 filepath to save exclusions tech mapping results to, or to
-            read from (if exists).
+        excl : h5py.File
+            Open exclusions .h5 file with the coordinate datasets.
+        row_slice : slice
+            Exclusion row slice to unpack coordinates for.
+        col_slice : slice
+            Exclusion column slice to unpack coordinates for.
+        buffers : tuple
+            Pre-allocated (coords, scratch) float32 buffers with shapes
+            (max_points, 2) and (max_points, ). max_points must be at least
+            the number of points in the (row_slice, col_slice) block.
         coord_labels : tuple
             Labels for the coordinate datasets.
 
         Returns
         -------
-        coords_out : list
-            List of arrays of the un-projected latitude, longitude array of
-            tech exclusion points. List entries correspond to input gids.
-        lat_range : tuple
-            Latitude (min, max) values associated with the un-projected
-            coordinates of the input gids.
-        lon_range : tuple
-            Longitude (min, max) values associated with the un-projected
-            coordinates of the input gids.
+        coords : np.ndarray
+            (N, 2) float32 view of the coords buffer with the un-projected
+            latitude, longitude of the tech exclusion points in the
+            (row_slice, col_slice) block in row-major order.
         """
 
-        coords_out = []
-        lat_range = None
-        lon_range = None
-
-        with h5py.File(excl_fpath, 'r') as f:
-            for gid in gids:
-                row_slice, col_slice = sc.get_excl_slices(gid)
-                try:
-                    lats = f[coord_labels[0]][row_slice, col_slice]
-                    lons = f[coord_labels[1]][row_slice, col_slice]
-                    emeta = np.vstack((lats.flatten(), lons.flatten())).T
-                except Exception as e:
-                    m = ('Could not unpack coordinates for gid {} with '
-                         'row/col slice {}/{}. Received the following '
-                         'error:\n{}'.format(gid, row_slice, col_slice, e))
-                    logger.error(m)
-                    raise e
-
-                coords_out.append(emeta)
-
-                if lat_range is None:
-                    lat_range = [np.min(emeta[:, 0]), np.max(emeta[:, 0])]
-                    lon_range = [np.min(emeta[:, 1]), np.max(emeta[:, 1])]
-                else:
-                    lat_range[0] = np.min((lat_range[0], np.min(emeta[:, 0])))
-                    lat_range[1] = np.max((lat_range[1], np.max(emeta[:, 0])))
-                    lon_range[0] = np.min((lon_range[0], np.min(emeta[:, 1])))
-                    lon_range[1] = np.max((lon_range[1], np.max(emeta[:, 1])))
-
-        return coords_out, lat_range, lon_range
-
-    def _parallel_resource_map(self):
+        shape = (row_slice.stop - row_slice.start,
+                 col_slice.stop - col_slice.start)
+        n = shape[0] * shape[1]
+        coords = buffers[0][:n]
+        scratch = buffers[1][:n].reshape(shape)
+        try:
+            for i, label in enumerate(coord_labels):
+                excl[label].read_direct(scratch, (row_slice, col_slice))
+                coords[:, i] = scratch.ravel()
+        except Exception as e:
+            m = ('Could not unpack coordinates for row/col slice {}/{}. '
+                 'Received the following error:\n{}'
+                 .format(row_slice, col_slice, e))
+            logger.error(m)
+            raise e
+
+        return coords
+
+    def _parallel_resource_map(self, row_strips=None, init=None):
         """Map all resource gids to exclusion gids in parallel.
 
+        The resource KD-tree is built once and shared with the workers as a
+        serialized tree. Workers each map a large strip of exclusion rows and
+        write their results directly into the shared output arrays.
+
+        Parameters
+        ----------
+        row_strips : list | None
+            Row slices to map. None will map all exclusion rows.
+        init : tuple | None
+            Initial (lats, lons, ind) 2D arrays with the exclusions shape.
+            Rows outside of row_strips keep these values. None will
+            initialize lats/lons with 0's and ind with -1's.
+
         Returns
         -------
         lats : np.ndarray
@@ -223,127 +412,252 @@ class TechMapping:
             2D integer array with shape equal to the exclusions extent shape.
         """
 
-        gids = np.array(list(range(self._n_sc)), dtype=np.uint32)
-        gid_chunks = np.array_split(gids, int(np.ceil(len(gids) / 2)))
+        res_tree = self._build_res_tree()
+        if row_strips is None:
+            row_strips = self._get_row_strips()
 
-        # init full output arrays
-        ind_all, coords_all = self._init_out_arrays()
+        if init is None:
+            init = (0, 0, -1)
 
-        n_finished = 0
-        futures = {}
-        loggers = [__name__, 'reV']
-        with SpawnProcessPool(max_workers=self._max_workers,
-                              loggers=loggers) as exe:
-
-            # iterate through split executions, submitting each to worker
-            for i, gid_set in enumerate(gid_chunks):
-                # submit executions and append to futures list
-                futures[exe.submit(self.map_resource_gids,
-                                   gid_set,
-                                   self._excl_fpath,
-                                   self._res_fpath,
-                                   self.distance_upper_bound,
-                                   self._map_chunk)] = i
+        logger.info('Running TechMapping on {} row strips'
+                    .format(len(row_strips)))
 
-            for future in as_completed(futures):
-                n_finished += 1
-                logger.info('Parallel TechMapping futures collected: '
-                            '{} out of {}'
-                            .format(n_finished, len(futures)))
+        dtypes = (np.float32, np.float32, np.int32)
+        if self._max_workers == 1:
+            lats, lons, ind_all = [np.empty(self._excl_shape, dtype=dtype)
+                                   for dtype in dtypes]
+            for arr, fill_value in zip((lats, lons, ind_all), init):
+                arr[...] = fill_value
 
-                i = futures[future]
-                result = future.result()
+            for i, row_slice in enumerate(row_strips):
+                self.map_row_strip(row_slice, self._excl_fpath, res_tree,
+                                   (lats, lons, ind_all),
+                                   self.distance_upper_bound,
+                                   self._max_points)
+                logger.info('Serial TechMapping row strips completed: '
+                            '{} out of {}'.format(i + 1, len(row_strips)))
 
-                res = self._map_chunk
-                with SupplyCurveExtent(self._excl_fpath, resolution=res) as sc:
-                    for j, gid in enumerate(gid_chunks[i]):
-                        i_out_arr = sc.get_flat_excl_ind(gid)
-                        ind_all[i_out_arr] = result[0][j]
-                        coords_all[i_out_arr, :] = result[1][j]
+            return lats, lons, ind_all
 
-        ind_all = ind_all.reshape(self._excl_shape)
-        lats = coords_all[:, 0].reshape(self._excl_shape)
-        lons = coords_all[:, 1].reshape(self._excl_shape)
+        loggers = [__name__, 'reV']
+        with SharedArrays() as shared:
+            res_tree = shared.share_object(res_tree)
+            out = tuple(shared.empty(self._excl_shape, dtype,
+                                     fill_value=fill_value)
+                        for dtype, fill_value in zip(dtypes, init))
+
+            with SpawnProcessPool(max_workers=self._max_workers,
+                                  loggers=loggers) as exe:
+                futures = [exe.submit(self.map_row_strip, row_slice,
+                                      self._excl_fpath, res_tree, out,
+                                      self.distance_upper_bound,
+                                      self._max_points)
+                           for row_slice in row_strips]
+
+                for i, future in enumerate(as_completed(futures)):
+                    future.result()
+                    logger.info('Parallel TechMapping futures collected: '
+                                '{} out of {}'.format(i + 1, len(futures)))
+
+            lats, lons, ind_all = [np.array(arr.attach()) for arr in out]
 
         return lats, lons, ind_all
 
-    @staticmethod
-    def map_resource_gids(gids, excl_fpath, res_fpath, distance_upper_bound,
-                          map_chunk, margin=0.1):
-        """Map exclusion gids to the resource meta.
+    def _get_cached_map(self, fpath):
+        """Get a pre-existing tech map that is valid for the resource file.
 
         Parameters
         ----------
-        gids : np.ndarray
-            Supply curve gids with tech exclusion points to map to the
-            resource meta points.
-        excl_fpath : str
-            Filepath to exclusions h5 (tech layer). dset will be
-            created in excl_fpath.
-        res_fpath : str
-            Filepath to .h5 resource file that we're mapping to.
-        distance_upper_bound : float | None
-            Upper boundary distance for KNN lookup between exclusion points and
-            resource points.
-        map_chunk : int
-            Calculation chunk used for the tech mapping calc.
-        margin : float
-            Margin when reducing the resource lat/lon.
+        fpath : str | None
+            Exclusions .h5 filepath to look for the tech map dataset in.
 
         Returns
         -------
-        ind : list
-            List of arrays of index values from the NN. List entries correspond
-            to input gids.
-        coords : np.ndarray
-            List of arrays of the un-projected latitude, longitude array of
-            tech exclusion points. List entries correspond to input gids.
+        cached : tuple | None
+            Cached (ind, coord_fingerprints) arrays if fpath has a tech map
+            dataset with the same shape, resource fingerprint, and
+            fingerprint rows, otherwise None.
         """
 
-        logger.debug('Getting tech layer coordinates for chunks {} through {}'
-                     .format(gids[0], gids[-1]))
+        if fpath is None or not os.path.exists(fpath):
+            return None
 
-        ind_out = []
-        coord_labels = ['latitude', 'longitude']
+        with h5py.File(fpath, 'r') as f:
+            if self._dset not in f:
+                return None
 
-        with SupplyCurveExtent(excl_fpath, resolution=map_chunk) as sc:
-            coords_out, lat_range, lon_range = TechMapping._unpack_coords(
-                gids, sc, excl_fpath, coord_labels=coord_labels)
+            dset = f[self._dset]
+            res_fingerprint = dset.attrs.get('res_fingerprint', None)
+            if isinstance(res_fingerprint, bytes):
+                res_fingerprint = res_fingerprint.decode()
 
-        with Resource(res_fpath, str_decode=False) as res:
-            res_meta = np.vstack((res.get_meta_arr(coord_labels[0]),
-                                  res.get_meta_arr(coord_labels[1]))).T
+            fingerprint_rows = dset.attrs.get('fingerprint_rows', None)
+            match = (tuple(dset.shape) == tuple(self._excl_shape)
+                     and res_fingerprint == self.res_fingerprint
+                     and fingerprint_rows == self._fingerprint_rows
+                     and 'coord_fingerprints' in dset.attrs)
+            if not match:
+                logger.debug('Tech map "{}" in {} does not match the '
+                             'resource data in {}'
+                             .format(self._dset, fpath, self._res_fpath))
+                return None
 
-        mask = ((res_meta[:, 0] > lat_range[0] - margin)
-                & (res_meta[:, 0] < lat_range[1] + margin)
-                & (res_meta[:, 1] > lon_range[0] - margin)
-                & (res_meta[:, 1] < lon_range[1] + margin))
+            cached = (dset[...].astype(np.int32),
+                      np.array(dset.attrs['coord_fingerprints'],
+                               dtype=np.uint64))
 
-        # pylint: disable-msg=C0121
-        mask_ind = np.where(mask == True)[0]  # noqa: E712
+        return cached
 
-        if np.sum(mask) > 0:
-            # pylint: disable=not-callable
-            res_tree = cKDTree(res_meta[mask, :])
+    def map_resources(self, src_fpath=None, overwrite=False):
+        """Map the exclusion points to the resource points, reusing a
+        pre-existing tech map where possible.
 
-            logger.debug('Running tech mapping for chunks {} through {}'
-                         .format(gids[0], gids[-1]))
-            for i, _ in enumerate(gids):
-                dist, ind = res_tree.query(coords_out[i])
-                ind = mask_ind[ind]
-                ind[(dist > distance_upper_bound)] = -1
-                ind_out.append(ind)
-        else:
-            logger.debug('No close res points for chunks {} through {}'
-                         .format(gids[0], gids[-1]))
-            for _ in gids:
-                ind_out.append(-1)
+        A pre-existing tech map is reused if its resource fingerprint matches
+        the resource coordinates and distance upper bound. Only the row
+        strips whose exclusion coordinates changed are remapped.
 
-        return ind_out, coords_out
+        Parameters
+        ----------
+        src_fpath : str | None
+            Optional exclusions .h5 filepath on the same grid to copy a
+            matching tech map dataset from if excl_fpath does not already
+            have one.
+        overwrite : bool
+            Flag to ignore pre-existing tech maps and run the full mapping.
+
+        Returns
+        -------
+        lats : np.ndarray
+            2D un-projected latitude array of tech exclusion points.
+            0's if no res point found. Shape is equal to exclusions shape.
+        lons : np.ndarray
+            2D un-projected longitude array of tech exclusion points.
+            0's if no res point found. Shape is equal to exclusions shape.
+        ind_all : np.ndarray
+            Index values of the NN resource point. -1 if no res point found.
+            2D integer array with shape equal to the exclusions extent shape.
+        attrs : dict
+            Fingerprint attributes to save with the tech map.
+        updated : bool
+            Flag for whether the tech map differs from the tech map saved in
+            excl_fpath and needs to be saved.
+        """
+
+        coord_fingerprints = self._get_coord_fingerprints()
+        attrs = {'res_fingerprint': self.res_fingerprint,
+                 'coord_fingerprints': coord_fingerprints,
+                 'fingerprint_rows': self._fingerprint_rows}
+
+        cached = None
+        fpaths = [] if overwrite else [self._excl_fpath, src_fpath]
+        for fpath in fpaths:
+            cached = self._get_cached_map(fpath)
+            if cached is not None:
+                break
+
+        if cached is None:
+            lats, lons, ind_all = self._parallel_resource_map()
+
+            return lats, lons, ind_all, attrs, True
+
+        ind_all, cached_fingerprints = cached
+        with h5py.File(self._excl_fpath, 'r') as f:
+            lats = f['latitude'][...].astype(np.float32, copy=False)
+            lons = f['longitude'][...].astype(np.float32, copy=False)
+
+        changed = np.where(cached_fingerprints != coord_fingerprints)[0]
+        updated = fpath != self._excl_fpath or len(changed) > 0
+        logger.info('Found matching tech map "{}" in {} with {} out of {} '
+                    'row strips with changed exclusion coordinates.'
+                    .format(self._dset, fpath, len(changed),
+                            len(coord_fingerprints)))
+
+        if len(changed):
+            rows = self._fingerprint_rows
+            row_strips = [slice(i * rows,
+                                int(np.min(((i + 1) * rows,
+                                            self._excl_shape[0]))))
+                          for i in changed]
+            lats, lons, ind_all = self._parallel_resource_map(
+                row_strips=row_strips, init=(lats, lons, ind_all))
+
+        return lats, lons, ind_all, attrs, updated
+
+    @staticmethod
+    def map_row_strip(row_slice, excl_fpath, res_tree, out,
+                      distance_upper_bound, max_points):
+        """Map a strip of exclusion rows to the resource meta.
+
+        Parameters
+        ----------
+        row_slice : slice
+            Exclusion row slice to map. The strip spans all exclusion columns.
+        excl_fpath : str
+            Filepath to exclusions h5 (tech layer) with latitude and
+            longitude datasets.
+        res_tree : cKDTree | SharedObject
+            KD-tree of the full resource meta coordinates or a shared
+            reference to the serialized tree.
+        out : tuple
+            Output (lats, lons, ind) 2D arrays with the full exclusion shape
+            (or shared references to them). The results for the row strip
+            are written directly into these arrays.
+        distance_upper_bound : float
+            Upper boundary distance for KNN lookup between exclusion points and
+            resource points.
+        max_points : int
+            Maximum number of exclusion points to read and map at once. This
+            bounds the peak memory of the mapping calc.
+        """
+
+        res_tree, (lats, lons, ind_all) = SharedArrays.attach((res_tree, out))
+        query_bound = np.nextafter(distance_upper_bound, np.inf)
+        res_min = res_tree.mins - distance_upper_bound
+        res_max = res_tree.maxes + distance_upper_bound
+
+        logger.debug('Running tech mapping for exclusion rows {} through {}'
+                     .format(row_slice.start, row_slice.stop - 1))
+
+        with h5py.File(excl_fpath, 'r') as f:
+            chunks = f['latitude'].chunks or (1, ind_all.shape[1])
+            blocks = TechMapping._get_coord_blocks(row_slice, ind_all.shape,
+                                                   chunks, max_points)
+            n_max = np.max([(r.stop - r.start) * (c.stop - c.start)
+                            for r, c in blocks])
+            buffers = (np.empty((n_max, 2), dtype=np.float32),
+                       np.empty((n_max, ), dtype=np.float32))
+
+            for block_rows, block_cols in blocks:
+                coords = TechMapping._unpack_coords(f, block_rows, block_cols,
+                                                    buffers)
+                shape = (block_rows.stop - block_rows.start,
+                         block_cols.stop - block_cols.start)
+
+                # only query points within the resource extent
+                inside = ((coords >= res_min)
+                          & (coords <= res_max)).all(axis=1)
+                ind = np.full(len(coords), -1, dtype=np.int32)
+                if inside.all():
+                    dist, ind[:] = res_tree.query(
+                        coords, distance_upper_bound=query_bound)
+                    ind[(dist > distance_upper_bound)] = -1
+                elif inside.any():
+                    dist, ind_in = res_tree.query(
+                        coords[inside], distance_upper_bound=query_bound)
+                    ind_in[(dist > distance_upper_bound)] = -1
+                    ind[inside] = ind_in
+
+                lats[block_rows, block_cols] = coords[:, 0].reshape(shape)
+                lons[block_rows, block_cols] = coords[:, 1].reshape(shape)
+                ind_all[block_rows, block_cols] = ind.reshape(shape)
+
+        for arr in (lats, lons, ind_all):
+            if isinstance(arr, np.memmap):
+                arr.flush()
 
     @staticmethod
     def save_tech_map(lats, lons, ind, fpath_out, res_fpath, dset,
-                      distance_upper_bound, chunks=(128, 128)):
+                      distance_upper_bound, chunks=(128, 128), attrs=None):
         """Save tech mapping indices and coordinates to an h5 output file.
 
         Parameters
@@ -367,6 +681,9 @@ class TechMapping:
             Distance upper bound to save as attr.
         chunks : tuple
             Chunk shape of the 2D output datasets.
+        attrs : dict | None
+            Additional attributes to save with the tech map dataset, e.g.
+            the resource and coordinate fingerprints.
         """
 
         if not fpath_out.endswith('.h5'):
@@ -403,15 +720,24 @@ class TechMapping:
 
             f[dset].attrs['fpath'] = res_fpath
             f[dset].attrs['distance_upper_bound'] = distance_upper_bound
+            if attrs is not None:
+                for k, v in attrs.items():
+                    f[dset].attrs[k] = v
 
         logger.info('Successfully saved tech map "{}" to {}'
                     .format(dset, fpath_out))
 
     @classmethod
     def run(cls, excl_fpath, res_fpath, dset, save_flag=True,
-            distance_upper_bound=0.03, map_chunk=2560, max_workers=None):
+            distance_upper_bound=0.03, map_chunk=None, max_workers=None,
+            src_fpath=None, overwrite=False, max_worker_mem=1.0):
         """Run parallel mapping and save to h5 file.
 
+        The tech map is saved with a fingerprint of the resource coordinates
+        and distance upper bound. A pre-existing tech map in excl_fpath (or
+        src_fpath) with a matching fingerprint is reused and only the row
+        strips with changed exclusion coordinates are remapped.
+
         Parameters
         ----------
         excl_fpath : str
@@ -423,8 +749,24 @@ class TechMapping:
             Dataset name in excl_fpath to save mapping results to.
         save_flag : bool
             Flag to write techmap to excl_fpath.
-        kwargs : dict
-            Keyword args to initialize the TechMapping object.
+        distance_upper_bound : float | None
+            Upper boundary distance for KNN lookup between exclusion points and
+            resource points. None will calculate a good distance based on the
+            resource meta data coordinates.
+        map_chunk : None
+            Deprecated and ignored, exclusion coordinates are read in row
+            strips bounded by max_worker_mem.
+        max_workers : int | None
+            Number of cores to run mapping on. None uses all available cpus.
+        src_fpath : str | None
+            Optional exclusions .h5 filepath on the same grid to copy a
+            matching tech map dataset from if excl_fpath does not already
+            have one.
+        overwrite : bool
+            Flag to ignore pre-existing tech maps and run the full mapping.
+        max_worker_mem : float
+            Approximate peak memory in GB that each worker can use to read
+            and map exclusion coordinates.
 
         Returns
         -------
@@ -439,13 +781,18 @@ class TechMapping:
             2D integer array with shape equal to the exclusions extent shape.
         """
         kwargs = {"distance_upper_bound": distance_upper_bound,
-                  "map_chunk": map_chunk, "max_workers": max_workers}
+                  "map_chunk": map_chunk, "max_workers": max_workers,
+                  "max_worker_mem": max_worker_mem}
         with cls(excl_fpath, res_fpath, dset, **kwargs) as mapper:
-            lats, lons, ind = mapper._parallel_resource_map()
+            lats, lons, ind, attrs, updated = mapper.map_resources(
+                src_fpath=src_fpath, overwrite=overwrite)
             distance_upper_bound = mapper._distance_upper_bound
 
-        if save_flag:
+        if save_flag and updated:
             mapper.save_tech_map(lats, lons, ind, excl_fpath, res_fpath,
-                                 dset, distance_upper_bound)
+                                 dset, distance_upper_bound, attrs=attrs)
+        elif save_flag:
+            logger.info('Tech map "{}" in {} is up to date with {}, not '
+                        'saving.'.format(dset, excl_fpath, res_fpath))
 
         return lats, lons, ind
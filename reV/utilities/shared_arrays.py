@@ -0,0 +1,387 @@
+# -*- coding: utf-8 -*-
+"""Shared arrays for parallel workers.
+
+Large input arrays are written once by the parent process to .npy files in a
+temporary directory. Workers receive small picklable references and attach to
+the data as read-only memory maps, so the OS page cache is shared between all
+workers instead of every worker re-reading and holding its own copy. Writable
+output arrays can also be allocated so that workers write their results
+directly into disjoint slabs of a common output array.
+"""
+import logging
+import numpy as np
+import os
+import pandas as pd
+import pickle
+import shutil
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+
+class SharedArray:
+    """Picklable reference to a numpy array saved to disk."""
+
+    def __init__(self, fpath, shape, dtype, writeable=False):
+        """
+        Parameters
+        ----------
+        fpath : str
+            Filepath to .npy file containing the array data.
+        shape : tuple
+            Shape of the shared array.
+        dtype : np.dtype
+            Data type of the shared array.
+        writeable : bool
+            Flag to attach to the array data as a writeable memory map.
+        """
+        self._fpath = fpath
+        self._shape = shape
+        self._dtype = dtype
+        self._writeable = writeable
+
+    def __repr__(self):
+        msg = ('{} with shape {} and dtype {} at {}'
+               .format(self.__class__.__name__, self._shape, self._dtype,
+                       self._fpath))
+
+        return msg
+
+    @property
+    def fpath(self):
+        """Get the filepath to the .npy file backing this array.
+
+        Returns
+        -------
+        str
+        """
+        return self._fpath
+
+    @property
+    def shape(self):
+        """Get the shape of the shared array.
+
+        Returns
+        -------
+        tuple
+        """
+        return self._shape
+
+    @property
+    def dtype(self):
+        """Get the data type of the shared array.
+
+        Returns
+        -------
+        np.dtype
+        """
+        return self._dtype
+
+    @property
+    def writeable(self):
+        """Get the flag for whether workers can write to the shared array.
+
+        Returns
+        -------
+        bool
+        """
+        return self._writeable
+
+    def attach(self):
+        """Attach to the shared array data as a memory map.
+
+        Returns
+        -------
+        arr : np.memmap
+            Memory mapped array. Read-only unless the shared array was
+            allocated as a writeable output array.
+        """
+        mode = 'r+' if self._writeable else 'r'
+
+        return np.load(self._fpath, mmap_mode=mode)
+
+
+class SharedObject:
+    """Picklable reference to a python object pickled to disk."""
+
+    def __init__(self, fpath):
+        """
+        Parameters
+        ----------
+        fpath : str
+            Filepath to .pkl file containing the pickled object.
+        """
+        self._fpath = fpath
+
+    def __repr__(self):
+        msg = '{} at {}'.format(self.__class__.__name__, self._fpath)
+
+        return msg
+
+    @property
+    def fpath(self):
+        """Get the filepath to the .pkl file backing this object.
+
+        Returns
+        -------
+        str
+        """
+        return self._fpath
+
+    def attach(self):
+        """Load the shared object.
+
+        Returns
+        -------
+        obj : object
+            Unpickled copy of the shared object.
+        """
+        with open(self._fpath, 'rb') as f:
+            obj = pickle.load(f)
+
+        return obj
+
+
+class SharedFrame:
+    """Picklable reference to a DataFrame saved to disk."""
+
+    def __init__(self, index, columns, index_name=None):
+        """
+        Parameters
+        ----------
+        index : SharedArray | SharedObject
+            Shared DataFrame index values.
+        columns : dict
+            Shared DataFrame columns keyed by column name with SharedArray
+            values for numeric columns and SharedObject values for object
+            columns, e.g. strings.
+        index_name : str | None
+            Name of the DataFrame index.
+        """
+        self._index = index
+        self._columns = columns
+        self._index_name = index_name
+
+    def __repr__(self):
+        msg = ('{} with columns {}'
+               .format(self.__class__.__name__, list(self._columns)))
+
+        return msg
+
+    def attach(self):
+        """Attach to the shared frame data.
+
+        Returns
+        -------
+        df : pd.DataFrame
+            DataFrame rebuilt from the shared index and column arrays.
+        """
+        index = pd.Index(self._index.attach(), name=self._index_name)
+        data = {k: v.attach() for k, v in self._columns.items()}
+
+        return pd.DataFrame(data, index=index)
+
+
+class SharedArrays:
+    """Context manager that owns a temporary directory of shared arrays."""
+
+    def __init__(self, cache_dir=None):
+        """
+        Parameters
+        ----------
+        cache_dir : str | None
+            Directory to create the temporary shared array directory in.
+            None will use the system default temporary directory.
+        """
+        self._dir = tempfile.mkdtemp(prefix='reV_shared_', dir=cache_dir)
+        self._n = 0
+        logger.debug('Initialized shared array directory: {}'
+                     .format(self._dir))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+
+        if type is not None:
+            raise
+
+    def close(self):
+        """Remove the temporary shared array directory."""
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+    def _get_fpath(self, ext):
+        """Get a new unique filepath in the shared directory.
+
+        Parameters
+        ----------
+        ext : str
+            File extension without the leading period.
+
+        Returns
+        -------
+        fpath : str
+            Unique filepath in the shared directory.
+        """
+        fpath = os.path.join(self._dir, 'arr_{}.{}'.format(self._n, ext))
+        self._n += 1
+
+        return fpath
+
+    def share(self, data):
+        """Save a single array or DataFrame to disk for sharing. Numeric
+        DataFrame columns are shared as memory maps and object columns are
+        pickled.
+
+        Parameters
+        ----------
+        data : np.ndarray | pd.DataFrame
+            Array or DataFrame to share.
+
+        Returns
+        -------
+        shared : SharedArray | SharedFrame
+            Picklable reference to the shared data.
+        """
+
+        if isinstance(data, pd.DataFrame):
+            index = self._share_column(data.index.values)
+            columns = {c: self._share_column(data[c].values)
+                       for c in data.columns}
+            shared = SharedFrame(index, columns, index_name=data.index.name)
+
+        else:
+            data = np.asarray(data)
+            if data.dtype == np.dtype(object):
+                msg = ('Cannot share object arrays as read-only memory maps, '
+                       'received array with shape {}'.format(data.shape))
+                logger.error(msg)
+                raise TypeError(msg)
+
+            fpath = self._get_fpath('npy')
+            np.save(fpath, data)
+            shared = SharedArray(fpath, data.shape, data.dtype)
+
+        return shared
+
+    def _share_column(self, values):
+        """Share a single DataFrame column or index.
+
+        Parameters
+        ----------
+        values : np.ndarray | pd.api.extensions.ExtensionArray
+            DataFrame column or index values.
+
+        Returns
+        -------
+        shared : SharedArray | SharedObject
+            Memory mapped reference for numeric arrays, pickled reference
+            for object or extension arrays.
+        """
+        if (isinstance(values, np.ndarray)
+                and values.dtype != np.dtype(object)):
+            shared = self.share(values)
+        else:
+            shared = self.share_object(values)
+
+        return shared
+
+    def share_object(self, obj):
+        """Pickle a python object to disk for sharing, e.g. a cKDTree that
+        is expensive to build but cheap to unpickle.
+
+        Parameters
+        ----------
+        obj : object
+            Picklable python object to share.
+
+        Returns
+        -------
+        shared : SharedObject
+            Picklable reference to the shared object.
+        """
+        fpath = self._get_fpath('pkl')
+        with open(fpath, 'wb') as f:
+            pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        return SharedObject(fpath)
+
+    def empty(self, shape, dtype, fill_value=None):
+        """Allocate a writeable output array that workers can write to.
+
+        Parameters
+        ----------
+        shape : tuple
+            Shape of the output array.
+        dtype : np.dtype
+            Data type of the output array.
+        fill_value : int | float | None
+            Optional value to initialize the output array with.
+
+        Returns
+        -------
+        shared : SharedArray
+            Picklable reference to the writeable output array. Workers should
+            only write to disjoint slabs of the array.
+        """
+        fpath = self._get_fpath('npy')
+        arr = np.lib.format.open_memmap(fpath, mode='w+', dtype=dtype,
+                                        shape=shape)
+        if fill_value is not None:
+            arr[...] = fill_value
+
+        arr.flush()
+        del arr
+
+        return SharedArray(fpath, shape, np.dtype(dtype), writeable=True)
+
+    def share_all(self, obj):
+        """Recursively share all numpy arrays in a nested data structure.
+
+        Parameters
+        ----------
+        obj : object
+            Array, DataFrame, or (nested) dict, list, or tuple containing
+            arrays. All other objects are passed through unchanged.
+
+        Returns
+        -------
+        obj : object
+            Same structure as the input with arrays and DataFrames replaced
+            by SharedArray and SharedFrame references.
+        """
+
+        if isinstance(obj, (np.ndarray, pd.DataFrame)):
+            obj = self.share(obj)
+        elif isinstance(obj, dict):
+            obj = {k: self.share_all(v) for k, v in obj.items()}
+        elif isinstance(obj, (list, tuple)):
+            obj = type(obj)(self.share_all(v) for v in obj)
+
+        return obj
+
+    @classmethod
+    def attach(cls, obj):
+        """Recursively attach to all shared references in a data structure.
+
+        Parameters
+        ----------
+        obj : object
+            Output from SharedArrays.share_all() or any other object.
+
+        Returns
+        -------
+        obj : object
+            Same structure as the input with SharedArray, SharedFrame, and
+            SharedObject references replaced by the shared data.
+        """
+
+        if isinstance(obj, (SharedArray, SharedFrame, SharedObject)):
+            obj = obj.attach()
+        elif isinstance(obj, dict):
+            obj = {k: cls.attach(v) for k, v in obj.items()}
+        elif isinstance(obj, (list, tuple)):
+            obj = type(obj)(cls.attach(v) for v in obj)
+
+        return obj
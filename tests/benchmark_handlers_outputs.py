@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark the Outputs chunking and compression policies. Run as a script
+from the tests directory, this is not collected by pytest.
+"""
+import os
+import tempfile
+import time
+
+from reV.handlers.outputs import Outputs
+
+from test_handlers_outputs import make_profiles
+
+
+def read_benchmark(h5_file, dset, shape):
+    """Time the site, time and full access patterns of a profiles dset"""
+    times = {}
+    with Outputs(h5_file, mode='r') as f:
+        t0 = time.time()
+        for i in range(0, shape[1], 10):
+            f[dset, :, i]
+        times['site'] = time.time() - t0
+
+        t0 = time.time()
+        for i in range(0, shape[0], 24 * 30):
+            f[dset, i:i + 24]
+        times['time'] = time.time() - t0
+
+        t0 = time.time()
+        f[dset]
+        times['full'] = time.time() - t0
+
+    return times
+
+
+def benchmark_policy(chunks, compression, shape=(8760, 500)):
+    """
+    Benchmark write and read throughput and file size of a chunking and
+    compression policy on a year of hourly profiles
+
+    Parameters
+    ----------
+    chunks : tuple | str
+        Chunk shape or Outputs access pattern
+    compression : str | None
+        Outputs compression filter name
+    shape : tuple
+        (n_time, n_sites) shape of the synthetic profiles
+    """
+    profiles, meta, time_index = make_profiles(shape)
+    attrs = {'scale_factor': 1000, 'units': 'unitless'}
+    with tempfile.TemporaryDirectory() as td:
+        h5_file = os.path.join(td, 'policy_benchmark.h5')
+
+        t0 = time.time()
+        Outputs.write_profiles(h5_file, meta, time_index, 'cf_profile',
+                               profiles, attrs, 'uint16', chunks=chunks,
+                               mode='w', compression=compression)
+        t_write = time.time() - t0
+
+        times = read_benchmark(h5_file, 'cf_profile', shape)
+        size = os.path.getsize(h5_file) / 1e6
+
+    print('chunks={}, compression={}: {:.2f} MB, write {:.3f}s, site reads '
+          '{:.3f}s, time reads {:.3f}s, full read {:.3f}s'
+          .format(chunks, compression, size, t_write, times['site'],
+                  times['time'], times['full']))
+
+
+if __name__ == '__main__':
+    for chunks in [(None, 100), 'site', 'time', 'full']:
+        for compression in [None, 'lzf', 'gzip']:
+            benchmark_policy(chunks, compression)
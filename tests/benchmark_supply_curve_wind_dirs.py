@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark the competitive wind farms neighbor exclusion. Run as a script
+from the tests directory, this is not collected by pytest.
+"""
+import time
+
+from reV.supply_curve.supply_curve import CompetitiveWindFarms
+
+from test_supply_curve_wind_dirs import legacy_exclusion, make_wind_dirs
+
+
+def benchmark_competitive_wind_farms(shape=(300, 450), downwind=False):
+    """
+    Benchmark the array based neighbor exclusion against the dictionary
+    based sequential exclusion. The default shape has the number of points
+    of a CONUS 64x aggregation.
+
+    Parameters
+    ----------
+    shape : tuple
+        (rows, cols) shape of the synthetic supply curve grid
+    downwind : bool
+        Flag to also exclude downwind neighbors
+    """
+    wind_dirs, sc_points = make_wind_dirs(shape)
+
+    t0 = time.time()
+    out = CompetitiveWindFarms.run(wind_dirs, sc_points, n_dirs=2,
+                                   sort_on='mean_lcoe', downwind=downwind)
+    t_array = time.time() - t0
+
+    t0 = time.time()
+    truth = legacy_exclusion(wind_dirs, sc_points, downwind=downwind)
+    t_legacy = time.time() - t0
+
+    assert sorted(out['sc_point_gid'].tolist()) == sorted(truth)
+    print('Competitive wind farms (downwind={}) for {} sc points took '
+          '{:.2f}s with arrays and {:.2f}s with dictionaries'
+          .format(downwind, len(sc_points), t_array, t_legacy))
+
+
+if __name__ == '__main__':
+    for downwind in (False, True):
+        benchmark_competitive_wind_farms(downwind=downwind)
@@ -6,8 +6,9 @@ import h5py
 import numpy as np
 import os
 import pytest
+import tempfile
 
-from reV.handlers.collection import Collector
+from reV.handlers.collection import Collector, DatasetCollector
 from reV import TESTDATADIR
 
 from rex.utilities.loggers import init_logger
@@ -145,6 +146,85 @@ def test_low_mem_collect():
         os.remove(h5_file)
 
 
+@pytest.mark.parametrize(('max_workers', 'mem_util_lim'),
+                         [(1, 0.7), (2, 0.7), (2, 0.00002)])
+def test_parallel_collect(max_workers, mem_util_lim):
+    """Test single pass collection of multiple datasets with parallel
+    readers against collecting each dataset separately"""
+    init_logger('reV.handlers.collection')
+    dsets = ['cf_profile', 'cf_mean', 'lcoe_fcr']
+    with tempfile.TemporaryDirectory() as td:
+        truth_file = os.path.join(td, 'cf_truth.h5')
+        h5_file = os.path.join(td, 'cf_parallel.h5')
+        Collector.collect(truth_file, H5_DIR, POINTS_PATH, dsets[0],
+                          file_prefix='peregrine_2012')
+        for dset in dsets[1:]:
+            Collector.add_dataset(truth_file, H5_DIR, dset,
+                                  file_prefix='peregrine_2012')
+
+        Collector.collect(h5_file, H5_DIR, POINTS_PATH, dsets,
+                          file_prefix='peregrine_2012',
+                          mem_util_lim=mem_util_lim, max_workers=max_workers)
+
+        with h5py.File(truth_file, 'r') as f_truth:
+            with h5py.File(h5_file, 'r') as f:
+                for dset in dsets + ['meta', 'time_index']:
+                    assert np.array_equal(f[dset][...], f_truth[dset][...])
+                    assert dict(f[dset].attrs) == dict(f_truth[dset].attrs)
+
+
+def test_virtual_collect():
+    """Test virtual dataset collection and materialization against the
+    manually collected source data"""
+    init_logger('reV.handlers.collection')
+    dsets = ['cf_profile', 'cf_mean']
+    truth = {dset: manual_collect(H5_DIR, 'peregrine_2012', dset)
+             for dset in dsets}
+    h5_file = os.path.join(TEMP_DIR, 'cf_virtual.h5')
+    Collector.collect(h5_file, H5_DIR, POINTS_PATH, dsets,
+                      file_prefix='peregrine_2012', virtual=True)
+
+    assert sorted(Collector.get_virtual_dsets(h5_file)) == sorted(dsets)
+    with h5py.File(h5_file, 'r') as f:
+        for dset in dsets:
+            assert np.array_equal(f[dset][...], truth[dset])
+
+    Collector.materialize(h5_file, mem_util_lim=0.00002)
+
+    assert not any(Collector.get_virtual_dsets(h5_file))
+    with h5py.File(h5_file, 'r') as f:
+        for dset in dsets:
+            assert np.array_equal(f[dset][...], truth[dset])
+
+    if PURGE_OUT:
+        os.remove(h5_file)
+
+
+def test_out_locs():
+    """Test the output site positions of source gids"""
+    gids_out = [5, 2, 9, 7]
+    source_gids = [7, 8, 2, 9, 1]
+    out_locs = DatasetCollector._get_out_locs(gids_out, source_gids)
+
+    assert np.array_equal(out_locs, [3, -1, 1, 2, -1])
+
+    out_locs = DatasetCollector._get_out_locs([], source_gids)
+    assert np.array_equal(out_locs, [-1] * len(source_gids))
+
+
+def test_virtual_runs():
+    """Test the contiguous site runs used to map virtual datasets"""
+    gids_out = np.array([0, 1, 2, 3, 5, 6, 8, 9])
+    source_gids = np.array([1, 2, 3, 4, 5, 6, 9])
+    out_locs = DatasetCollector._get_out_locs(gids_out, source_gids)
+    runs = DatasetCollector._get_virtual_runs(out_locs)
+    truth = [(slice(0, 3), slice(1, 4)),
+             (slice(4, 6), slice(4, 6)),
+             (slice(6, 7), slice(7, 8))]
+
+    assert runs == truth
+
+
 def test_means_lcoe():
     """
     Test adding means to pre-collected profiles
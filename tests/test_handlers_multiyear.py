@@ -2,10 +2,13 @@
 """
 pytests for MultiYear collection and computation
 """
+import h5py
 import numpy as np
 import os
 import pytest
+import tempfile
 
+from reV.handlers.collection import Collector
 from reV.handlers.outputs import Outputs
 from reV.handlers.multi_year import MultiYear
 from reV import TESTDATADIR
@@ -14,6 +17,7 @@ from rex.utilities.loggers import init_logger
 
 TEMP_DIR = os.path.join(TESTDATADIR, 'ri_gen_collect')
 H5_DIR = os.path.join(TESTDATADIR, 'gen_out')
+POINTS_PATH = os.path.join(TESTDATADIR, 'config', 'project_points_100.csv')
 YEARS = [2012, 2013]
 H5_FILES = [os.path.join(H5_DIR, 'gen_ri_pv_{}_x000.h5'.format(year))
             for year in YEARS]
@@ -238,6 +242,119 @@ def test_my_stdev(dset, group):
         os.remove(my_out)
 
 
+@pytest.mark.parametrize(('dset', 'block_size'), [
+    ('cf_mean', None),
+    ('cf_mean', 1e3),
+    ('cf_profile', 1e6)])
+def test_my_stats(dset, block_size):
+    """
+    Test one pass computation of multi-year statistics for means and
+    profiles against numpy
+
+    Parameters
+    ----------
+    dset : str
+        dset to compute statistics for
+    block_size : float | None
+        Block size in bytes to force multiple site blocks, None for default
+    """
+    arr = []
+    for file in H5_FILES:
+        with Outputs(file, mode='r') as f:
+            arr.append(f[dset])
+
+    arr = np.array(arr)
+    truth = {'means': np.mean(arr, axis=0),
+             'stdev': np.std(arr, axis=0),
+             'min': np.min(arr, axis=0),
+             'max': np.max(arr, axis=0),
+             'p50': np.percentile(arr, 50, axis=0),
+             'p90': np.percentile(arr, 10, axis=0)}
+
+    my_out = os.path.join(TEMP_DIR, "{}-MY.h5".format(dset))
+    with MultiYear(my_out, mode='w') as my:
+        if block_size is not None:
+            my.STATS_BLOCK_SIZE = block_size
+
+        my.collect(H5_FILES, dset, profiles=arr.ndim == 3)
+        my.compute_stats(dset, stats=list(truth))
+
+    with MultiYear(my_out, mode='r') as my:
+        for stat, my_arr in truth.items():
+            compare_arrays(my_arr, my['{}-{}'.format(dset, stat)],
+                           "Computed {}".format(stat))
+
+    if PURGE_OUT:
+        os.remove(my_out)
+
+
+@pytest.mark.parametrize('block_size', [None, 1e3])
+def test_my_raw_copy(block_size):
+    """
+    Test that collected profiles are copied without unscaling, both with the
+    native HDF5 copy and with the chunked block copy
+
+    Parameters
+    ----------
+    block_size : float | None
+        Block size in bytes to force the chunked block copy, None for the
+        native HDF5 copy
+    """
+    dset = 'cf_profile'
+    my_out = os.path.join(TEMP_DIR, "{}-MY.h5".format(dset))
+    with MultiYear(my_out, mode='w') as my:
+        if block_size is None:
+            my.collect(H5_FILES, dset, profiles=True)
+        else:
+            my.COPY_BLOCK_SIZE = block_size
+            for year_h5 in H5_FILES:
+                with h5py.File(year_h5, mode='r') as f_in:
+                    my._copy_dset_blocks(f_in[dset],
+                                         my._create_dset_name(year_h5, dset))
+
+    with h5py.File(my_out, mode='r') as f_out:
+        for year, year_h5 in zip(YEARS, H5_FILES):
+            ds_out = f_out['{}-{}'.format(dset, year)]
+            with h5py.File(year_h5, mode='r') as f_in:
+                assert ds_out.dtype == f_in[dset].dtype
+                assert dict(ds_out.attrs) == dict(f_in[dset].attrs)
+                assert np.array_equal(ds_out[...], f_in[dset][...])
+
+    if PURGE_OUT:
+        os.remove(my_out)
+
+
+def test_my_virtual_copy(monkeypatch):
+    """
+    Test that virtual datasets from a virtual collection are copied into
+    bounded, chunked site blocks
+    """
+    monkeypatch.setattr(MultiYear, 'CHUNK_SIZE', 1e5)
+    dsets = ['cf_profile', 'cf_mean']
+    with tempfile.TemporaryDirectory() as td:
+        vds_file = os.path.join(td, 'peregrine_2012_virtual.h5')
+        Collector.collect(vds_file, H5_DIR, POINTS_PATH, dsets,
+                          file_prefix='peregrine_2012', virtual=True)
+        my_out = os.path.join(td, 'virtual-MY.h5')
+        with MultiYear(my_out, mode='w') as my:
+            my.COPY_BLOCK_SIZE = 1e3
+            for dset in dsets:
+                my.collect([vds_file], dset, profiles=dset == 'cf_profile')
+
+        with h5py.File(vds_file, mode='r') as f_in:
+            with h5py.File(my_out, mode='r') as f_out:
+                for dset in dsets:
+                    ds_in = f_in[dset]
+                    ds_out = f_out['{}-2012'.format(dset)]
+                    assert ds_in.is_virtual
+                    assert not ds_out.is_virtual
+                    assert ds_out.chunks == MultiYear.get_chunks(
+                        ds_in.shape, ds_in.dtype, access='site')
+                    assert ds_out.dtype == ds_in.dtype
+                    assert dict(ds_out.attrs) == dict(ds_in.attrs)
+                    assert np.array_equal(ds_out[...], ds_in[...])
+
+
 def execute_pytest(capture='all', flags='-rapP'):
     """Execute module as pytest with detailed summary report.
 
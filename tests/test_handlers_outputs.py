@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""
+pytests for Outputs chunking and compression policies
+"""
+import h5py
+import numpy as np
+import os
+import pandas as pd
+import pytest
+
+from reV.handlers.outputs import Outputs
+from reV.utilities.exceptions import HandlerValueError
+from reV import TESTDATADIR
+
+TEMP_DIR = os.path.join(TESTDATADIR, 'ri_gen_collect')
+PURGE_OUT = True
+
+if not os.path.exists(TEMP_DIR):
+    os.makedirs(TEMP_DIR)
+
+
+@pytest.mark.parametrize(('shape', 'dtype', 'access', 'truth'), [
+    ((8760, 1000), 'uint16', 'site', (8760, 114)),
+    ((8760, 1000), 'float32', 'site', (8760, 57)),
+    ((8760, 1000), 'uint16', 'time', (1000, 1000)),
+    ((8760, 1000), 'uint16', 'full', (1000, 1000)),
+    ((8760, 10), 'uint16', 'site', (8760, 10)),
+    ((105120, 100), 'float32', 'site', (105120, 4)),
+    ((1000, ), 'float32', 'full', (1000, )),
+    ((1000000, ), 'float32', 'site', (500000, ))])
+def test_get_chunks(shape, dtype, access, truth):
+    """Test auto-tuned chunk shapes for each access pattern"""
+    chunks = Outputs.get_chunks(shape, dtype, access=access)
+    assert chunks == truth
+
+    chunk_bytes = np.prod(chunks) * np.dtype(dtype).itemsize
+    assert chunk_bytes <= Outputs.CHUNK_SIZE
+
+
+def test_bad_policy():
+    """Test errors for unknown access patterns and compression filters"""
+    with pytest.raises(HandlerValueError):
+        Outputs.get_chunks((8760, 100), 'uint16', access='bad')
+
+    with pytest.raises(HandlerValueError):
+        Outputs.get_filters('bad')
+
+
+def make_profiles(shape, seed=42):
+    """Make a synthetic smooth capacity factor profile array with meta and
+    time_index"""
+    rng = np.random.RandomState(seed)
+    hours = np.arange(shape[0]) % 24
+    diurnal = np.clip(np.sin((hours - 6) * np.pi / 12), 0, None)
+    profiles = diurnal[:, np.newaxis] * rng.uniform(0.5, 1, shape[1])
+    meta = pd.DataFrame({'gid': np.arange(shape[1]),
+                         'latitude': rng.uniform(30, 45, shape[1]),
+                         'longitude': rng.uniform(-120, -80, shape[1])})
+    time_index = pd.date_range('20120101', periods=shape[0], freq='1h')
+
+    return profiles, meta, time_index
+
+
+@pytest.mark.parametrize('compression', [None, 'lzf', 'gzip'])
+@pytest.mark.parametrize('chunks', [(None, 100), 'site', 'time', 'full'])
+def test_write_profiles_policy(chunks, compression):
+    """
+    Test that write_profiles applies each chunking and compression policy
+    and that the profiles round trip
+    """
+    shape = (8760, 20)
+    profiles, meta, time_index = make_profiles(shape)
+    attrs = {'scale_factor': 1000, 'units': 'unitless'}
+    h5_file = os.path.join(TEMP_DIR, 'write_profiles_policy.h5')
+    Outputs.write_profiles(h5_file, meta, time_index, 'cf_profile',
+                           profiles, attrs, 'uint16', chunks=chunks,
+                           mode='w', compression=compression)
+
+    with h5py.File(h5_file, 'r') as f:
+        ds = f['cf_profile']
+        assert ds.compression == Outputs.get_filters(
+            compression).get('compression')
+        if isinstance(chunks, str):
+            assert ds.chunks == Outputs.get_chunks(shape, 'uint16',
+                                                   access=chunks)
+
+    with Outputs(h5_file, mode='r') as f:
+        assert np.allclose(f['cf_profile'], profiles, atol=1e-3)
+
+    if PURGE_OUT:
+        os.remove(h5_file)
+
+
+def test_init_h5_policy():
+    """Test chunk access patterns and compression in init_h5 including
+    compressed 1D datasets without explicit chunks"""
+    shape = (8760, 50)
+    profiles, meta, time_index = make_profiles(shape)
+    h5_file = os.path.join(TEMP_DIR, 'policy_init.h5')
+    dsets = ['cf_profile', 'cf_mean']
+    shapes = {'cf_profile': shape, 'cf_mean': (shape[1], )}
+    attrs = {dset: {'scale_factor': 1000} for dset in dsets}
+    chunks = {'cf_profile': 'site', 'cf_mean': None}
+    dtypes = {dset: 'uint16' for dset in dsets}
+    Outputs.init_h5(h5_file, dsets, shapes, attrs, chunks, dtypes, meta,
+                    time_index=time_index, compression='gzip')
+
+    with Outputs(h5_file, mode='a') as f:
+        f['cf_profile'] = profiles
+        f['cf_mean'] = profiles.mean(axis=0)
+
+    with h5py.File(h5_file, 'r') as f:
+        assert f['cf_profile'].chunks == (8760, 50)
+        assert f['cf_mean'].chunks == (50, )
+        for dset in dsets:
+            assert f[dset].compression == 'gzip'
+            assert f[dset].shuffle
+
+    with Outputs(h5_file, mode='r') as f:
+        assert np.allclose(f['cf_profile'], profiles, atol=1e-3)
+        assert np.allclose(f['cf_mean'], profiles.mean(axis=0), atol=1e-3)
+
+    if PURGE_OUT:
+        os.remove(h5_file)
+
+
+@pytest.mark.parametrize('inplace', [False, True])
+def test_scaled_write_buffer(inplace):
+    """Test scaling into a pre-allocated buffer against a plain
+    scale, round and cast"""
+    data = np.random.RandomState(0).uniform(0, 1, (100, 20))
+    truth = np.round(data * 1000).astype(np.uint16)
+    data = data.astype(np.float32)
+    out = np.empty(data.shape, dtype=np.uint16)
+    arr = Outputs._check_data_dtype(data, np.uint16, scale_factor=1000,
+                                    out=out, inplace=inplace)
+
+    assert arr is out
+    assert np.array_equal(arr, truth)
+
+    scalar = Outputs._check_data_dtype(np.array(0.5), np.uint16,
+                                       scale_factor=1000)
+    assert scalar == 500
+
+
+@pytest.mark.parametrize('out', [False, True])
+def test_scaled_write_int(out):
+    """Test scaling integer data into a different integer dtype"""
+    data = np.arange(100, dtype=np.int16).reshape((10, 10))
+    truth = (data * 10).astype(np.int32)
+    out = np.empty(data.shape, dtype=np.int32) if out else None
+    arr = Outputs._check_data_dtype(data.copy(), np.int32, scale_factor=10,
+                                    out=out, inplace=True)
+
+    assert arr.dtype == np.int32
+    assert np.array_equal(arr, truth)
+
+
+def test_set_ds_array():
+    """Test direct slab writes, fancy index writes and buffer reuse and
+    release of scaled writes"""
+    shape = (8760, 50)
+    profiles, meta, time_index = make_profiles(shape)
+    h5_file = os.path.join(TEMP_DIR, 'set_ds_array.h5')
+    attrs = {'cf_profile': {'scale_factor': 1000}}
+    Outputs.init_h5(h5_file, ['cf_profile'], {'cf_profile': shape}, attrs,
+                    {'cf_profile': 'site'}, {'cf_profile': 'uint16'}, meta,
+                    time_index=time_index)
+
+    assert Outputs._is_direct_slice((slice(None), slice(0, 20)), shape,
+                                    (8760, 20))
+    assert not Outputs._is_direct_slice((slice(None), slice(0, 20)), shape,
+                                        (8760, 10))
+    assert not Outputs._is_direct_slice((slice(None), [0, 2]), shape,
+                                        (8760, 2))
+
+    with Outputs(h5_file, mode='a') as f:
+        f._set_ds_array('cf_profile', profiles[:, :20].copy(),
+                        (slice(None), slice(0, 20)), inplace=True)
+        buffer = f._write_buffers[np.dtype('uint16')]
+        f['cf_profile', :, 20:40] = profiles[:, 20:40]
+        assert f._write_buffers[np.dtype('uint16')] is buffer
+
+        mask = np.zeros(shape[1], dtype=bool)
+        mask[40:] = True
+        f['cf_profile', :, mask] = profiles[:, 40:]
+
+    assert not f._write_buffers
+
+    with Outputs(h5_file, mode='r') as f:
+        assert np.allclose(f['cf_profile'], profiles, atol=1e-3)
+
+    if PURGE_OUT:
+        os.remove(h5_file)
+
+
+def execute_pytest(capture='all', flags='-rapP'):
+    """Execute module as pytest with detailed summary report.
+
+    Parameters
+    ----------
+    capture : str
+        Log or stdout/stderr capture option. ex: log (only logger),
+        all (includes stdout/stderr)
+    flags : str
+        Which tests to show logs and results for.
+    """
+
+    fname = os.path.basename(__file__)
+    pytest.main(['-q', '--show-capture={}'.format(capture), fname, flags])
+
+
+if __name__ == '__main__':
+    execute_pytest()
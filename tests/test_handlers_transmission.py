@@ -2,12 +2,15 @@
 """
 Transmission Feature Tests
 """
+import json
+import numpy as np
 import os
 import pandas as pd
 import pytest
 
 from reV import TESTDATADIR
 from reV.handlers.transmission import TransmissionFeatures as TF
+from reV.utilities.exceptions import HandlerKeyError
 
 TRANS_COSTS_1 = {'line_tie_in_cost': 200, 'line_cost': 1000,
                  'station_tie_in_cost': 50, 'center_tie_in_cost': 10,
@@ -127,6 +130,48 @@ def test_substation_load_spreading(i, trans_costs, trans_table):
         assert LINE_CAPS[i][line_id] == tf[line_id]['avail_cap'], msg
 
 
+@pytest.mark.parametrize('dense_ratio', [1000, 0])
+def test_feature_arrays(dense_ratio, trans_table, monkeypatch):
+    """
+    Test the array backed features against the transmission table with a
+    dense gid lookup and with a binary search of sparse gids
+    """
+    monkeypatch.setattr(TF, 'DENSE_INDEX_RATIO', dense_ratio)
+    tf = TF(trans_table)
+    assert (tf._index is None) == (dense_ratio == 0)
+    features = trans_table.groupby('trans_line_gid').first()
+    assert len(tf) == len(features)
+
+    for gid, row in features.sample(50, random_state=0).iterrows():
+        assert tf[gid]['type'] == row['category'].lower()
+        if tf[gid]['type'] == 'substation':
+            assert tf[gid]['lines'] == json.loads(row['trans_gids'])
+        elif tf[gid]['type'] in ('transline', 'loadcen'):
+            assert np.isclose(tf[gid]['avail_cap'], row['ac_cap'] * 0.1)
+
+    feature_cap = TF.feature_capacity(trans_table)
+    feature_cap = feature_cap.set_index('trans_line_gid')['avail_cap']
+    for gid in feature_cap.index[:200]:
+        truth = tf.available_capacity(gid)
+        if truth is None:
+            assert np.isnan(feature_cap[gid])
+        else:
+            assert feature_cap[gid] == truth
+
+    with pytest.raises(HandlerKeyError):
+        tf[-1]  # pylint: disable=pointless-statement
+
+    with pytest.raises(HandlerKeyError):
+        tf[features.index.max() + 1]  # pylint: disable=pointless-statement
+
+    gid = features.index[features['category'] == 'TransLine'][0]
+    avail_cap = tf[gid]['avail_cap']
+    tf[gid]['avail_cap'] = 0
+    assert tf[gid]['avail_cap'] == avail_cap
+    assert tf.connect(gid, avail_cap / 2)
+    assert tf[gid]['avail_cap'] == avail_cap / 2
+
+
 def execute_pytest(capture='all', flags='-rapP'):
     """Execute module as pytest with detailed summary report.
 
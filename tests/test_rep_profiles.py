@@ -9,7 +9,9 @@ import json
 
 from reV.rep_profiles.rep_profiles import (RegionRepProfile, RepProfiles,
                                            RepresentativeMethods,
-                                           AggregatedRepProfiles)
+                                           AggregatedRepProfiles, RegionIndex,
+                                           RegionProfileStream)
+from reV.utilities.exceptions import reVDeprecationWarning
 from reV import TESTDATADIR
 
 from rex.resource import Resource
@@ -55,6 +57,59 @@ def test_rep_methods():
     assert r.i_reps[0] == 13
 
 
+def test_nsmallest():
+    """Test the partial top-N selection against the full argsort nargmin"""
+    arr = np.random.rand(1000)
+    arr[[10, 500, 900]] = -1
+    arr[50] = np.nan
+    order = RepresentativeMethods.nsmallest(arr, 5)
+    assert order[:3].tolist() == [10, 500, 900]
+    for n in range(5):
+        i = RepresentativeMethods.nargmin(arr, n)
+        assert arr[order[n]] == arr[i]
+
+    assert len(RepresentativeMethods.nsmallest(arr[:3], 5)) == 3
+    assert RepresentativeMethods.nsmallest(arr, len(arr))[-1] == 50
+
+
+@pytest.mark.parametrize('err_method', ['mbe', 'mae', 'rmse'])
+def test_rep_method_ties(err_method):
+    """Test that the single profile error methods select the Nth profile with
+    the same tie ordering as nsmallest"""
+    baseline = np.linspace(0, 1, 24)
+    profiles = np.stack([baseline + 0.5, baseline, baseline + 0.1,
+                         baseline, baseline + 0.5], axis=1)
+    method = getattr(RepresentativeMethods, err_method)
+    i_reps = [method(profiles, baseline[:, np.newaxis], i_profile=i)[1]
+              for i in range(profiles.shape[1])]
+
+    assert i_reps == [1, 3, 2, 0, 4]
+
+
+@pytest.mark.parametrize('err_method', ['mbe', 'mae', 'rmse'])
+def test_chunked_errors(err_method):
+    """Test float32 site chunked error metrics against the full calculation
+    and the automatic switch to the chunked path with max_mem"""
+    with Resource(GEN_FPATH) as res:
+        profiles = res['cf_profile', :, slice(0, 100)]
+
+    baseline = RepresentativeMethods.meanoid(profiles)
+    truth = RepresentativeMethods.errors(profiles, baseline, err_method)
+    test = RepresentativeMethods.errors(profiles, baseline, err_method,
+                                        chunk_size=7)
+    assert np.allclose(truth, test, rtol=1e-4, atol=1e-6)
+
+    max_mem = profiles.shape[0] * 10 * 4 / 1e9
+    assert RepresentativeMethods._get_chunk_size(profiles.shape,
+                                                 max_mem) == 10
+    p1, i1 = RepresentativeMethods.run(profiles, err_method=err_method,
+                                       n_profiles=3)
+    p2, i2 = RepresentativeMethods.run(profiles, err_method=err_method,
+                                       n_profiles=3, max_mem=max_mem)
+    assert i1 == i2
+    assert np.array_equal(p1, p2)
+
+
 def test_meanoid():
     """Test the simple meanoid method"""
     sites = np.arange(100)
@@ -120,6 +175,64 @@ def test_integrated():
     assert m1.loc[2, 'rep_res_gid'] == 60
 
 
+@pytest.mark.parametrize(('rep_method', 'err_method', 'weight'),
+                         [('meanoid', 'rmse', 'weight'),
+                          ('meanoid', 'mbe', None),
+                          ('median', 'mae', None)])
+@pytest.mark.parametrize('max_workers', [1, 2])
+def test_streaming(rep_method, err_method, weight, max_workers):
+    """Test the streamed multi-region rep profiles with small time blocks and
+    site slabs against the per-region serial calculation."""
+    rng = np.random.RandomState(0)
+    sites = np.arange(100)
+    regions = (['r0'] * 7) + (['r1'] * 33) + (['r2'] * 60)
+    rev_summary = pd.DataFrame({'gen_gids': sites,
+                                'res_gids': sites,
+                                'weight': rng.uniform(1, 2, 100),
+                                'region': rng.permutation(regions),
+                                'timezone': np.zeros(100)})
+    kwargs = {'rep_method': rep_method, 'err_method': err_method,
+              'weight': weight, 'n_profiles': 2}
+
+    serial = RepProfiles(GEN_FPATH, rev_summary, 'region', **kwargs)
+    serial._run_serial()
+    stream = RepProfiles(GEN_FPATH, rev_summary, 'region', **kwargs)
+    stream._run_parallel(max_workers=max_workers, time_chunk=1000,
+                         site_chunk=17)
+
+    assert serial.meta.equals(stream.meta)
+    for n in range(2):
+        assert np.allclose(serial.profiles[n], stream.profiles[n])
+
+
+@pytest.mark.parametrize('max_workers', [1, 2])
+def test_streaming_max_mem(max_workers):
+    """Test that max_region_mem bounds the streamed time blocks and site
+    chunks of the multi-region rep profiles and that the deprecated
+    pool_size input is ignored."""
+    rng = np.random.RandomState(0)
+    sites = np.arange(100)
+    regions = (['r0'] * 7) + (['r1'] * 33) + (['r2'] * 60)
+    rev_summary = pd.DataFrame({'gen_gids': sites,
+                                'res_gids': sites,
+                                'region': rng.permutation(regions),
+                                'timezone': np.zeros(100)})
+
+    stream = RegionProfileStream(GEN_FPATH, sites, [0, 100], max_mem=1e-5)
+    assert stream._time_chunk == 12
+    assert stream._site_chunk == 52
+
+    serial = RepProfiles(GEN_FPATH, rev_summary, 'region', weight=None)
+    serial._run_serial()
+    stream = RepProfiles(GEN_FPATH, rev_summary, 'region', weight=None,
+                         max_region_mem=1e-5)
+    with pytest.warns(reVDeprecationWarning):
+        stream._run_parallel(max_workers=max_workers, pool_size=72)
+
+    assert serial.meta.equals(stream.meta)
+    assert np.allclose(serial.profiles[0], stream.profiles[0])
+
+
 def test_sc_points():
     """Test rep profiles for each SC point."""
     sites = np.arange(10)
@@ -264,6 +377,42 @@ def test_file_options():
         os.remove(fout)
 
 
+def test_region_attr_parsing():
+    """Test the unpacking of jsonified lists and arrays from the rev
+    summary columns."""
+    gids = [[1, 2], [3], [4, 5, 6]]
+    truth = [1, 2, 3, 4, 5, 6]
+    for col in (gids, [json.dumps(g) for g in gids],
+                [np.array(g) for g in gids]):
+        rev_summary = pd.DataFrame({'gen_gids': col})
+        test = RegionRepProfile._get_region_attr(rev_summary, 'gen_gids')
+        assert test == truth
+
+
+def test_region_index():
+    """Test the region row index and flattened gid store against masking and
+    parsing the rev summary for each region."""
+    gids = [[1, 2], [3], [4, 5, 6], [7], [8, 9]]
+    rev_summary = pd.DataFrame({'gen_gids': [json.dumps(g) for g in gids],
+                                'gid_counts': [[1] * len(g) for g in gids],
+                                'r1': ['b', 'a', 'b', None, 'a'],
+                                'r2': [0, 1, 0, 1, 0]})
+    index = RegionIndex(rev_summary, ['r1', 'r2'], ['gen_gids', 'gid_counts'])
+    regions = rev_summary.groupby(['r1', 'r2']).size().index
+    assert len(index) == len(regions) == 3
+
+    all_gids, ptr = index.members('gen_gids')
+    for i, (r1, r2) in enumerate(regions):
+        mask = (rev_summary['r1'] == r1) & (rev_summary['r2'] == r2)
+        assert np.array_equal(index.rows(i), np.where(mask)[0])
+
+        truth = RegionRepProfile._get_region_attr(rev_summary[mask],
+                                                  'gen_gids')
+        assert all_gids[ptr[i]:ptr[i + 1]].tolist() == truth
+        assert index.members('gen_gids', [i])[0].tolist() == truth
+        assert index.members('gid_counts', [i])[0].tolist() == [1] * len(truth)
+
+
 def execute_pytest(capture='all', flags='-rapP'):
     """Execute module as pytest with detailed summary report.
 
@@ -2,15 +2,19 @@
 """
 Supply Curve computation integrated tests
 """
+import h5py
 import os
 import pandas as pd
 from pandas.testing import assert_frame_equal
 import pytest
+import tempfile
 import warnings
 import numpy as np
 
 from reV import TESTDATADIR
+from reV.handlers.transmission import TransmissionCosts as TC
 from reV.supply_curve.supply_curve import SupplyCurve
+from reV.utilities.exceptions import SupplyCurveInputError
 
 TRANS_COSTS_1 = {'line_tie_in_cost': 200, 'line_cost': 1000,
                  'station_tie_in_cost': 50, 'center_tie_in_cost': 10,
@@ -181,6 +185,137 @@ def test_parallel(sc_points, trans_table, multipliers):
     assert_frame_equal(sc_full_parallel, sc_full_serial)
 
 
+@pytest.mark.parametrize('connectable', [True, False])
+def test_lcot_row_blocks(sc_points, trans_table, multipliers, connectable):
+    """Test that LCOT computed in parallel row blocks matches the per-row
+    TransmissionCosts.cost() results."""
+
+    sc = SupplyCurve(sc_points, trans_table, 0.1, sc_features=multipliers,
+                     transmission_costs=TRANS_COSTS_1, max_workers=1)
+    table = sc._trans_table.drop(columns=['trans_cap_cost', 'lcot'])
+
+    lcot, cost = SupplyCurve._compute_lcot(table, 0.1,
+                                           trans_costs=TRANS_COSTS_1,
+                                           connectable=connectable,
+                                           max_workers=2, block_size=5000)
+
+    feature = TC(table, **TRANS_COSTS_1)
+    truth = []
+    for _, row in table.iterrows():
+        capacity = row['capacity'] if connectable else None
+        truth.append(feature.cost(row['trans_line_gid'], row['dist_mi'],
+                                  capacity=capacity,
+                                  transmission_multiplier=row[
+                                      'transmission_multiplier']))
+
+    truth = np.array(truth, dtype='float32')
+    assert np.array_equal(cost, truth, equal_nan=True)
+    assert np.isnan(cost).any() == connectable
+    assert np.array_equal(lcot, cost * 0.1 / (table['mean_cf'] * 8760),
+                          equal_nan=True)
+
+
+def test_group_candidates():
+    """Test the grouping of sorted transmission rows into per-point cursors"""
+    trans_sc_gids = np.array([3, 0, 3, 1, 0, 3, 0])
+    order, ptr = SupplyCurve._group_candidates(trans_sc_gids, 5)
+
+    assert np.array_equal(ptr, [0, 3, 4, 4, 7, 7])
+    for gid in range(5):
+        rows = order[ptr[gid]:ptr[gid + 1]]
+        assert np.array_equal(rows, np.where(trans_sc_gids == gid)[0])
+
+
+@pytest.mark.parametrize('max_workers', [1, 2])
+def test_scenarios(sc_points, trans_table, multipliers, max_workers):
+    """Test a batch of supply curve scenarios against single runs"""
+    scenarios = {'full_1': {'fcr': 0.1, 'transmission_costs': TRANS_COSTS_1},
+                 'full_2': {'fcr': 0.1, 'transmission_costs': TRANS_COSTS_2},
+                 'simple_1': {'fcr': 0.2, 'simple': True,
+                              'transmission_costs': TRANS_COSTS_1,
+                              'sort_on': 'lcot'}}
+
+    with tempfile.TemporaryDirectory() as td:
+        out = SupplyCurve.scenarios(sc_points, trans_table, scenarios,
+                                    sc_features=multipliers,
+                                    max_workers=max_workers, out_dir=td)
+        assert list(out) == list(scenarios)
+        out = {k: pd.read_csv(v) for k, v in out.items()}
+
+    for i, tcosts in ((1, TRANS_COSTS_1), (2, TRANS_COSTS_2)):
+        sc_full = SupplyCurve.full(sc_points, trans_table, fcr=0.1,
+                                   sc_features=multipliers,
+                                   transmission_costs=tcosts)
+        assert_frame_equal(out['full_{}'.format(i)], sc_full,
+                           check_dtype=False)
+
+    sc_simple = SupplyCurve.simple(sc_points, trans_table, fcr=0.2,
+                                   sc_features=multipliers,
+                                   transmission_costs=TRANS_COSTS_1,
+                                   sort_on='lcot')
+    assert_frame_equal(out['simple_1'], sc_simple, check_dtype=False)
+
+    with pytest.raises(SupplyCurveInputError):
+        SupplyCurve.scenarios(sc_points, trans_table, {'bad': {'lcot': 1}})
+
+
+def test_h5_trans_table(sc_points, trans_table, multipliers):
+    """Test a columnar .h5 trans table and the chunked integer key merge"""
+    sc_full = SupplyCurve.full(sc_points, trans_table, fcr=0.1,
+                               sc_features=multipliers,
+                               transmission_costs=TRANS_COSTS_1)
+
+    with tempfile.TemporaryDirectory() as td:
+        fpath = os.path.join(td, 'trans_table.h5')
+        with h5py.File(fpath, 'w') as f:
+            for c in trans_table:
+                values = trans_table[c].values
+                if values.dtype == np.dtype(object):
+                    values = trans_table[c].fillna('').values.astype('S')
+
+                f.create_dataset(c, data=values)
+
+        parsed = SupplyCurve._parse_trans_table(fpath)
+        assert 'cap_left' not in parsed
+        assert 'trans_gids' in parsed
+        csv_parsed = SupplyCurve._parse_trans_table(trans_table)
+        assert sorted(csv_parsed) == sorted(parsed)
+
+        sc_h5 = SupplyCurve.full(sc_points, fpath, fcr=0.1,
+                                 sc_features=multipliers,
+                                 transmission_costs=TRANS_COSTS_1)
+
+    assert_frame_equal(sc_full, sc_h5)
+
+    merge_cols = ['sc_point_row_id', 'sc_point_col_id']
+    sc_cols = sc_points.rename(columns={'sc_row_ind': merge_cols[0],
+                                        'sc_col_ind': merge_cols[1]})
+    sc_cols = sc_cols[['sc_gid', 'capacity'] + merge_cols]
+    trans_table = trans_table.drop(columns=['sc_point_gid'])
+    truth = trans_table.merge(sc_cols, on=merge_cols, how='inner')
+    test = SupplyCurve._merge_on_keys(trans_table, sc_cols, merge_cols,
+                                      chunk_size=1000)
+    assert_frame_equal(truth, test)
+
+
+def test_segment_argmin():
+    """Test the per sc_gid argmin used by the simple sort"""
+    rng = np.random.RandomState(0)
+    df = pd.DataFrame({'sc_gid': rng.randint(0, 50, 1000),
+                       'lcot': rng.uniform(0, 1, 1000)})
+    df.loc[df['sc_gid'] == 3, 'lcot'] = np.nan
+    df.loc[::5, 'lcot'] = np.nan
+
+    rows = SupplyCurve._segment_argmin(df['sc_gid'].values,
+                                       df['lcot'].values)
+    truth = df.sort_values('lcot').groupby('sc_gid').first()
+
+    assert np.array_equal(df['sc_gid'].values[rows], truth.index.values)
+    assert np.allclose(df['lcot'].values[rows], truth['lcot'].values,
+                       equal_nan=True)
+    assert (df['sc_gid'].values[rows] == 3).sum() == 1
+
+
 def execute_pytest(capture='all', flags='-rapP'):
     """Execute module as pytest with detailed summary report.
 
@@ -189,6 +189,27 @@ def plot_single_gen_sc_point(gid=2, resolution=64):
     plt.show()
 
 
+def test_ordered_unique_gids():
+    """Test the vectorized unique gids and gid counts against a simple
+    ordered loop."""
+    rng = np.random.RandomState(0)
+    gids = rng.choice([-1, 5, 100, 7, 42], size=4096).astype(np.int32)
+    weights = rng.choice([0.5, 1.0], size=4096).astype(np.float32)
+
+    ugids, first_ind, counts = \
+        GenerationSupplyCurvePoint._ordered_unique(gids, weights=weights)
+
+    truth = []
+    for gid in gids:
+        if gid != -1 and gid not in truth:
+            truth.append(gid)
+
+    assert ugids.tolist() == truth
+    assert np.array_equal(gids[first_ind], ugids)
+    assert counts.dtype == np.float32
+    assert np.allclose(counts, [weights[gids == g].sum() for g in truth])
+
+
 def execute_pytest(capture='all', flags='-rapP'):
     """Execute module as pytest with detailed summary report.
 
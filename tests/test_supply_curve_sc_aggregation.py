@@ -10,8 +10,12 @@ import numpy as np
 import pandas as pd
 from pandas.testing import assert_frame_equal
 import pytest
+import tempfile
 
+from reV.supply_curve.aggregation import Aggregation
+from reV.supply_curve.point_summary import SupplyCurvePointSummary
 from reV.supply_curve.sc_aggregation import SupplyCurveAggregation
+from reV.utilities.exceptions import EmptySupplyCurvePointError
 from reV import TESTDATADIR
 
 EXCL = os.path.join(TESTDATADIR, 'ri_exclusions/ri_exclusions.h5')
@@ -237,6 +241,106 @@ def test_data_layer_methods():
             assert slope_min <= slope_mean <= slope_max
 
 
+def test_res_class_single_pass():
+    """Test that the single-pass summary of all resource classes matches
+    summarizing each resource class separately."""
+    res_class_bins = SupplyCurveAggregation._convert_bins([0, 4, 4.1, 100])
+    gen_index = Aggregation._parse_gen_index(GEN)
+
+    data_layers = {k: dict(fpath=EXCL, **v) for k, v in DATA_LAYERS.items()}
+    kwargs = {'excl_dict': EXCL_DICT, 'res_class_dset': RES_CLASS_DSET,
+              'data_layers': data_layers, 'power_density': 36,
+              'resolution': 64}
+
+    for gid in range(20):
+        summaries = SupplyCurvePointSummary.summarize_res_classes(
+            gid, EXCL, GEN, TM_DSET, gen_index,
+            res_class_bins=res_class_bins, **kwargs)
+
+        for ri, res_bin in enumerate(res_class_bins):
+            try:
+                truth = SupplyCurvePointSummary.summarize(
+                    gid, EXCL, GEN, TM_DSET, gen_index, res_class_bin=res_bin,
+                    **kwargs)
+            except EmptySupplyCurvePointError:
+                assert ri not in summaries
+            else:
+                test = summaries[ri]
+                assert list(test) == list(truth)
+                for k, v in truth.items():
+                    if isinstance(v, (float, np.floating)):
+                        assert np.allclose(test[k], v, rtol=RTOL)
+                    else:
+                        assert test[k] == v
+
+
+def test_data_layer_bincount_methods():
+    """Test the bincount mode and category data layer methods against a
+    simple unique/mask implementation."""
+    rng = np.random.RandomState(0)
+    excl_mult = rng.choice([0.5, 1.0], size=1000).astype(np.float32)
+    agg = SupplyCurvePointSummary._agg_data_layer_method
+    for data in (rng.randint(10, 20, 1000).astype(np.float32),
+                 rng.randint(0, 5, 1000).astype(np.uint8),
+                 rng.choice([0.1, 2.5, 1e9], size=1000)):
+        values, counts = np.unique(data, return_counts=True)
+        assert agg(data, excl_mult, 'mode') == values[np.argmax(counts)]
+
+        truth = {float(v): float(excl_mult[data == v].sum()) for v in values}
+        test = json.loads(agg(data, excl_mult, 'category'))
+        test = {float(k): v for k, v in test.items()}
+        assert test.keys() == truth.keys()
+        assert np.allclose(list(test.values()), list(truth.values()))
+
+        categories = [values[-1], -1, values[0]]
+        test = agg(data, excl_mult, 'category', categories=categories)
+        assert isinstance(test, np.ndarray)
+        assert np.allclose(test, [truth[float(values[-1])], 0,
+                                  truth[float(values[0])]])
+
+
+def test_data_layer_nan_codes():
+    """Test that NaN data values are ignored by the mode and category data
+    layer methods."""
+    excl_mult = np.ones(6, dtype=np.float32)
+    data = np.array([np.nan, 3, 3, 5, np.nan, np.nan], dtype=np.float32)
+    agg = SupplyCurvePointSummary._agg_data_layer_method
+    assert agg(data, excl_mult, 'mode') == 3
+    assert json.loads(agg(data, excl_mult, 'category')) == {'3.0': 2.0,
+                                                            '5.0': 1.0}
+
+    data = np.full(6, np.nan, dtype=np.float32)
+    assert np.isnan(agg(data, excl_mult, 'mode'))
+    assert json.loads(agg(data, excl_mult, 'category')) == {}
+
+
+def test_category_summary_csv():
+    """Test that compact category arrays are expanded into one column per
+    category and round trip through a summary csv."""
+    categories = [1, 2, 3]
+    data_layers = {'land_use': {'dset': 'ri_land_use', 'method': 'category',
+                                'categories': categories}}
+    rng = np.random.RandomState(0)
+    counts = rng.uniform(0, 100, (3, 3)).astype(np.float32)
+    summary = [{'sc_point_gid': 2, 'land_use': counts[2]},
+               {'sc_point_gid': 0, 'land_use': counts[0]},
+               {'sc_point_gid': 1, 'land_use': None}]
+    summary = SupplyCurveAggregation._summary_to_df(summary,
+                                                    data_layers=data_layers)
+
+    columns = ['land_use_{}'.format(c) for c in categories]
+    assert list(summary.columns) == ['sc_point_gid'] + columns
+    assert np.allclose(summary.loc[0, columns].values, counts[0])
+    assert summary.loc[1, columns].isnull().all()
+
+    with tempfile.TemporaryDirectory() as td:
+        fpath = os.path.join(td, 'summary.csv')
+        summary.to_csv(fpath)
+        test = pd.read_csv(fpath, index_col=0)
+
+    assert_frame_equal(test, summary, check_dtype=False)
+
+
 def execute_pytest(capture='all', flags='-rapP'):
     """Execute module as pytest with detailed summary report.
 
@@ -9,11 +9,14 @@ import numpy as np
 import pandas as pd
 import pytest
 import os
+import shutil
+import tempfile
 
 from reV import TESTDATADIR
 from reV.handlers.outputs import Outputs
 from reV.supply_curve.tech_mapping import TechMapping
 from reV.handlers.exclusions import ExclusionLayers
+from reV.utilities.exceptions import reVDeprecationWarning
 
 EXCL = os.path.join(TESTDATADIR, 'ri_exclusions/ri_exclusions.h5')
 RES = os.path.join(TESTDATADIR, 'nsrdb/ri_100_nsrdb_2012.h5')
@@ -21,10 +24,12 @@ GEN = os.path.join(TESTDATADIR, 'gen_out/gen_ri_pv_2012_x000.h5')
 TM_DSET = 'techmap_nsrdb_ri_truth'
 
 
-def test_resource_tech_mapping():
+@pytest.mark.parametrize('max_workers', [1, 2])
+def test_resource_tech_mapping(max_workers):
     """Run the supply curve technology mapping and compare to baseline file"""
 
-    lats, lons, ind = TechMapping.run(EXCL, RES, TM_DSET, max_workers=2,
+    lats, lons, ind = TechMapping.run(EXCL, RES, TM_DSET,
+                                      max_workers=max_workers,
                                       save_flag=False)
 
     with ExclusionLayers(EXCL) as ex:
@@ -41,6 +46,112 @@ def test_resource_tech_mapping():
     assert len(set(ind.flatten())) == 101, msg
 
 
+def test_tech_mapping_reuse():
+    """Test that tech maps are reused based on their fingerprints and that
+    only changed exclusion coordinates are remapped"""
+
+    with tempfile.TemporaryDirectory() as td:
+        src = os.path.join(td, 'src.h5')
+        excl = os.path.join(td, 'excl.h5')
+        shutil.copy(EXCL, src)
+        shutil.copy(EXCL, excl)
+
+        ind_truth = TechMapping.run(src, RES, 'tm', max_workers=1)[2]
+        with h5py.File(src, 'a') as f:
+            assert 'res_fingerprint' in f['tm'].attrs
+            f['tm'][0, 0] = 10000
+
+        # matching map is used as-is without remapping
+        ind = TechMapping.run(src, RES, 'tm', max_workers=1)[2]
+        assert ind[0, 0] == 10000
+        assert np.array_equal(ind[1:], ind_truth[1:])
+
+        # different distance upper bound invalidates the map
+        ind = TechMapping.run(src, RES, 'tm', max_workers=1,
+                              distance_upper_bound=0.01, save_flag=False)[2]
+        assert ind[0, 0] != 10000
+
+        with h5py.File(excl, 'a') as f:
+            f['longitude'][-10:] += 0.5
+
+        # map is copied from src and only the changed rows are remapped
+        ind = TechMapping.run(excl, RES, 'tm', max_workers=2, src_fpath=src)[2]
+        ind_full = TechMapping.run(excl, RES, 'tm', max_workers=1,
+                                   overwrite=True, save_flag=False)[2]
+        assert ind[0, 0] == 10000
+        assert np.array_equal(ind[1:], ind_full[1:])
+        assert not np.array_equal(ind[-10:], ind_truth[-10:])
+
+        with h5py.File(excl, 'r') as f:
+            assert np.array_equal(f['tm'][...], ind)
+
+
+@pytest.mark.parametrize('max_points', [1, 500, 5000, 10 ** 6])
+def test_coord_blocks(max_points):
+    """Test that the chunk-aligned coordinate blocks tile the row strip and
+    respect the memory bound"""
+    shape = (300, 250)
+    chunks = (16, 32)
+    row_slice = slice(32, 200)
+    blocks = TechMapping._get_coord_blocks(row_slice, shape, chunks,
+                                           max_points)
+
+    count = np.zeros(shape, dtype=np.int32)
+    for rows, cols in blocks:
+        count[rows, cols] += 1
+        n = (rows.stop - rows.start) * (cols.stop - cols.start)
+        assert n <= max(max_points, chunks[0] * chunks[1])
+        assert rows.start % chunks[0] == 0
+        assert cols.start % chunks[1] == 0
+
+    assert (count[row_slice] == 1).all()
+    assert count.sum() == (row_slice.stop - row_slice.start) * shape[1]
+
+
+@pytest.mark.parametrize('max_worker_mem', [1e-7, 1e-5, 2])
+def test_coord_fingerprints(max_worker_mem):
+    """Test that the exclusion coordinate fingerprints read in bounded blocks
+    match the fingerprints of the full coordinate arrays"""
+    shape = (300, 70)
+    lats, lons = np.meshgrid(np.linspace(41, 42, shape[0]),
+                             np.linspace(-72, -71, shape[1]), indexing='ij')
+
+    with tempfile.TemporaryDirectory() as td:
+        excl = os.path.join(td, 'excl.h5')
+        with h5py.File(excl, 'w') as f:
+            f.create_dataset('latitude', data=lats.astype(np.float32),
+                             chunks=(16, 16))
+            f.create_dataset('longitude', data=lons.astype(np.float32),
+                             chunks=(16, 16))
+
+            truth = TechMapping.get_coord_fingerprints(
+                f['latitude'][...], f['longitude'][...], 128)
+
+        tm = TechMapping(excl, RES, 'tm', max_workers=1,
+                         fingerprint_rows=128, max_worker_mem=max_worker_mem)
+        fingerprints = tm._get_coord_fingerprints()
+
+    assert len(fingerprints) == 3
+    assert np.array_equal(fingerprints, truth)
+
+
+def test_map_chunk_deprecation():
+    """Test that the deprecated map_chunk input warns and that the
+    exclusion shape is read from the coordinates"""
+    shape = (30, 20)
+    with tempfile.TemporaryDirectory() as td:
+        excl = os.path.join(td, 'excl.h5')
+        with h5py.File(excl, 'w') as f:
+            f.create_dataset('latitude', data=np.zeros(shape, np.float32))
+            f.create_dataset('longitude', data=np.zeros(shape, np.float32))
+
+        with pytest.warns(reVDeprecationWarning):
+            tm = TechMapping(excl, RES, 'tm', map_chunk=2560, max_workers=1)
+
+    assert tm._excl_shape == shape
+    assert tm._n_excl == 600
+
+
 def plot_tech_mapping():
     """Run the supply curve technology mapping and plot the resulting mapped
     points."""
@@ -8,8 +8,11 @@ import pandas as pd
 import numpy as np
 import pytest
 import os
+import tempfile
 
-from reV.supply_curve.sc_aggregation import SupplyCurveAggregation
+from reV.supply_curve.aggregation import Aggregation
+from reV.supply_curve.sc_aggregation import (SupplyCurveAggregation,
+                                             SupplyCurveAggFileHandler)
 from reV import TESTDATADIR
 from reV.utilities.exceptions import FileInputError
 
@@ -106,6 +109,45 @@ def test_vpd_incomplete():
         raise Exception('Test with incomplete VPD input did not throw error!')
 
 
+def test_vpd_array():
+    """Test the conversion of variable power density to a gid-indexed
+    array"""
+    vpd = pd.read_csv(FVPD, index_col=0)
+    arr = SupplyCurveAggFileHandler._parse_power_density(FVPD)
+
+    assert isinstance(arr, np.ndarray)
+    assert len(arr) == vpd.index.max() + 1
+    assert np.allclose(arr[vpd.index.values], vpd['power_density'].values)
+    mask = np.ones(len(arr), dtype=bool)
+    mask[vpd.index.values] = False
+    assert np.isnan(arr[mask]).all()
+
+
+def test_vpd_missing_high_gids():
+    """Test that run_serial raises a FileInputError for resource gids past
+    the largest gid in the variable power density input"""
+    vpd = pd.read_csv(FVPD, index_col=0)
+    gen_index = Aggregation._parse_gen_index(GEN)
+    with tempfile.TemporaryDirectory() as td:
+        fpath = os.path.join(td, 'vpd_low_gids.csv')
+        vpd = vpd.sort_index()
+        vpd.iloc[:len(vpd) // 2].to_csv(fpath)
+
+        with pytest.raises(FileInputError) as e:
+            SupplyCurveAggregation.run_serial(EXCL, GEN, TM_DSET, gen_index,
+                                              excl_dict=EXCL_DICT,
+                                              power_density=fpath)
+
+    assert 'missing the following resource GIDs' in str(e.value)
+
+
+def test_vpd_negative_gids():
+    """Test that negative variable power density gids are rejected"""
+    vpd = pd.DataFrame({'power_density': [1.0, 2.0]}, index=[-1, 3])
+    with pytest.raises(FileInputError):
+        SupplyCurveAggFileHandler._parse_power_density(vpd)
+
+
 def execute_pytest(capture='all', flags='-rapP'):
     """Execute module as pytest with detailed summary report.
 
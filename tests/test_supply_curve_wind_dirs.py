@@ -2,6 +2,7 @@
 """
 Supply Curve computation integrated tests
 """
+import numpy as np
 import os
 import pandas as pd
 from pandas.testing import assert_frame_equal
@@ -125,6 +126,67 @@ def test_upwind_downwind_exclusion():
             assert gid not in sc_point_gids, msg
 
 
+def make_wind_dirs(shape, seed=42):
+    """Make a synthetic wind_dirs and sc_points table on a regular grid of
+    supply curve points with a random power rose and random LCOE."""
+    rng = np.random.RandomState(seed)
+    rows, cols = np.meshgrid(np.arange(shape[0]), np.arange(shape[1]),
+                             indexing='ij')
+    rows = rows.ravel()
+    cols = cols.ravel()
+    wind_dirs = pd.DataFrame({'sc_point_gid': np.arange(rows.size)})
+    offsets = {'N': (-1, 0), 'NE': (-1, 1), 'E': (0, 1), 'SE': (1, 1),
+               'S': (1, 0), 'SW': (1, -1), 'W': (0, -1), 'NW': (-1, -1)}
+    for d, (dr, dc) in offsets.items():
+        r = np.clip(rows + dr, 0, shape[0] - 1)
+        c = np.clip(cols + dc, 0, shape[1] - 1)
+        wind_dirs['{}_gid'.format(d)] = r * shape[1] + c
+
+    for d in offsets:
+        wind_dirs['{}_pr'.format(d)] = rng.uniform(500, 700, rows.size)
+
+    sc_points = pd.DataFrame({'sc_gid': np.arange(rows.size),
+                              'sc_point_gid': np.arange(rows.size),
+                              'mean_lcoe': rng.uniform(30, 90, rows.size)})
+
+    return wind_dirs, sc_points
+
+
+def legacy_exclusion(wind_dirs, sc_points, n_dirs=2, downwind=False):
+    """Dictionary based sequential neighbor exclusion"""
+    wind_dirs = wind_dirs.set_index('sc_point_gid')
+    upwind, downwind_gids = CompetitiveWindFarms._get_neighbors(wind_dirs,
+                                                                n_dirs=n_dirs)
+    neighbors = {}
+    for i, gid in enumerate(wind_dirs.index.values):
+        neighbors[gid] = upwind[i].tolist()
+        if downwind:
+            neighbors[gid] += downwind_gids[i].tolist()
+
+    mask = {gid: True for gid in sc_points['sc_point_gid'].values}
+    for gid in sc_points.sort_values('mean_lcoe')['sc_point_gid'].values:
+        if mask[gid]:
+            for n in neighbors[gid]:
+                if n in mask:
+                    mask[n] = False
+
+    return [gid for gid, keep in mask.items() if keep]
+
+
+@pytest.mark.parametrize('downwind', [False, True])
+def test_competitive_wind_farms_legacy(downwind):
+    """
+    Test the array based neighbor exclusion against a dictionary based
+    sequential exclusion on a synthetic supply curve grid
+    """
+    wind_dirs, sc_points = make_wind_dirs((30, 45))
+    out = CompetitiveWindFarms.run(wind_dirs, sc_points, n_dirs=2,
+                                   sort_on='mean_lcoe', downwind=downwind)
+    truth = legacy_exclusion(wind_dirs, sc_points, downwind=downwind)
+
+    assert sorted(out['sc_point_gid'].tolist()) == sorted(truth)
+
+
 def execute_pytest(capture='all', flags='-rapP'):
     """Execute module as pytest with detailed summary report.
 
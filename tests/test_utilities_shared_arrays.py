@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+pytests for shared arrays used by parallel workers
+"""
+import numpy as np
+import os
+import pandas as pd
+import pickle
+import pytest
+
+from scipy.spatial import cKDTree
+
+from reV.utilities.shared_arrays import (SharedArray, SharedFrame,
+                                         SharedObject, SharedArrays)
+
+
+def test_shared_roundtrip():
+    """Test that nested data shared with workers is attached unchanged."""
+    arr = np.arange(100, dtype=np.float32)
+    df = pd.DataFrame({'power_density': np.arange(5, dtype=np.float32)},
+                      index=pd.Index(np.arange(5) * 10, name='gid'))
+    data = (arr, [[0, 1], [1, 2]], None, {'a': arr * 2}, df, 3.5)
+
+    with SharedArrays() as shared:
+        refs = shared.share_all(data)
+        refs = pickle.loads(pickle.dumps(refs))
+
+        assert isinstance(refs[0], SharedArray)
+        assert isinstance(refs[3]['a'], SharedArray)
+        assert isinstance(refs[4], SharedFrame)
+        assert refs[1] == [[0, 1], [1, 2]]
+        assert refs[2] is None
+
+        out = SharedArrays.attach(refs)
+        assert np.array_equal(out[0], arr)
+        assert not out[0].flags.writeable
+        assert np.array_equal(out[3]['a'], arr * 2)
+        assert out[4].index.name == 'gid'
+        assert np.array_equal(out[4].index.values, df.index.values)
+        assert np.array_equal(out[4]['power_density'].values,
+                              df['power_density'].values)
+        assert out[5] == 3.5
+
+        fpath = refs[0].fpath
+        assert os.path.exists(fpath)
+
+    assert not os.path.exists(fpath)
+
+
+def test_shared_object_array():
+    """Test that object arrays cannot be shared as memory maps."""
+    with SharedArrays() as shared:
+        with pytest.raises(TypeError):
+            shared.share(np.array(['a', None], dtype=object))
+
+
+def test_shared_output_and_object():
+    """Test writeable output arrays and pickled objects shared with workers"""
+    pts = np.random.rand(100, 2)
+    with SharedArrays() as shared:
+        out = shared.empty((10, 4), np.int32, fill_value=-1)
+        tree = shared.share_object(cKDTree(pts))
+        refs = pickle.loads(pickle.dumps((out, tree)))
+        assert isinstance(refs[1], SharedObject)
+        assert refs[0].writeable
+
+        arr, tree = SharedArrays.attach(refs)
+        assert (arr == -1).all()
+        arr[2:5] = tree.query(pts[:12])[1].reshape((3, 4))
+        arr.flush()
+
+        truth = np.full((10, 4), -1, dtype=np.int32)
+        truth[2:5] = np.arange(12).reshape((3, 4))
+        assert np.array_equal(out.attach(), truth)
+
+
+def execute_pytest(capture='all', flags='-rapP'):
+    """Execute module as pytest with detailed summary report.
+
+    Parameters
+    ----------
+    capture : str
+        Log or stdout/stderr capture option. ex: log (only logger),
+        all (includes stdout/stderr)
+    flags : str
+        Which tests to show logs and results for.
+    """
+
+    fname = os.path.basename(__file__)
+    pytest.main(['-q', '--show-capture={}'.format(capture), fname, flags])
+
+
+if __name__ == '__main__':
+    execute_pytest()